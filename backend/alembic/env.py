@@ -0,0 +1,64 @@
+"""Alembic 运行环境
+
+数据库地址取自 settings.DATABASE_URL，与应用使用同一个异步驱动。
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401  注册全部模型
+from app.core.config import settings
+from app.db.base import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """FULLTEXT 索引只在 MySQL 上存在，其他数据库比较结构时忽略"""
+    if type_ == "index" and not settings.DATABASE_URL.startswith("mysql"):
+        return obj.dialect_options["mysql"].get("prefix") != "FULLTEXT"
+    return True
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_object=include_object,
+        # SQLite 不支持大部分 ALTER TABLE，改为重建表
+        render_as_batch=settings.DATABASE_URL.startswith("sqlite"),
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """只输出 SQL（alembic upgrade head --sql）"""
+    _configure(url=settings.DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_migrations(connection) -> None:
+    _configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
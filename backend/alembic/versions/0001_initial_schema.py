@@ -0,0 +1,321 @@
+"""初始表结构
+
+与引入迁移之前由模型直接建出的表一致。这样建出的已有数据库先执行
+`alembic stamp 0001`，再 `alembic upgrade head`。
+
+Revision ID: 0001
+Revises:
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "competition",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("competition_type", sa.String(length=50), nullable=True),
+        sa.Column("season", sa.String(length=20), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("rules", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_competition_id"), "competition", ["id"], unique=False)
+    op.create_index(op.f("ix_competition_name"), "competition", ["name"], unique=True)
+    op.create_table(
+        "permission",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("resource", sa.String(length=50), nullable=True),
+        sa.Column("action", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_permission_id"), "permission", ["id"], unique=False)
+    op.create_index(op.f("ix_permission_name"), "permission", ["name"], unique=True)
+    op.create_table(
+        "role",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("is_system", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_role_id"), "role", ["id"], unique=False)
+    op.create_index(op.f("ix_role_name"), "role", ["name"], unique=True)
+    op.create_table(
+        "team",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("logo", sa.String(length=255), nullable=True),
+        sa.Column("home_ground", sa.String(length=100), nullable=True),
+        sa.Column("founded_year", sa.Integer(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("phone", sa.String(length=20), nullable=True),
+        sa.Column("email", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_team_id"), "team", ["id"], unique=False)
+    op.create_index(op.f("ix_team_name"), "team", ["name"], unique=True)
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=True),
+        sa.Column("email", sa.String(length=100), nullable=True),
+        sa.Column("password", sa.String(length=255), nullable=True),
+        sa.Column("full_name", sa.String(length=100), nullable=True),
+        sa.Column("phone", sa.String(length=20), nullable=True),
+        sa.Column("avatar", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_user_email"), "user", ["email"], unique=True)
+    op.create_index(op.f("ix_user_id"), "user", ["id"], unique=False)
+    op.create_index(op.f("ix_user_username"), "user", ["username"], unique=True)
+    op.create_table(
+        "honor",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(length=100), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("image", sa.String(length=255), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_honor_id"), "honor", ["id"], unique=False)
+    op.create_table(
+        "player",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("jersey_number", sa.Integer(), nullable=True),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("position", sa.String(length=50), nullable=True),
+        sa.Column("height", sa.Float(), nullable=True),
+        sa.Column("weight", sa.Float(), nullable=True),
+        sa.Column("birth_date", sa.Date(), nullable=True),
+        sa.Column("nationality", sa.String(length=50), nullable=True),
+        sa.Column("photo", sa.String(length=255), nullable=True),
+        sa.Column("biography", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_player_id"), "player", ["id"], unique=False)
+    op.create_index(op.f("ix_player_name"), "player", ["name"], unique=False)
+    op.create_table(
+        "role_permission",
+        sa.Column("role_id", sa.Integer(), nullable=True),
+        sa.Column("permission_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["permission_id"], ["permission.id"]),
+        sa.ForeignKeyConstraint(["role_id"], ["role.id"]),
+    )
+    op.create_table(
+        "schedule",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("competition_id", sa.Integer(), nullable=True),
+        sa.Column("round_number", sa.Integer(), nullable=True),
+        sa.Column("match_date", sa.Date(), nullable=True),
+        sa.Column("match_time", sa.Time(), nullable=True),
+        sa.Column("home_team_id", sa.Integer(), nullable=True),
+        sa.Column("away_team_id", sa.Integer(), nullable=True),
+        sa.Column("venue", sa.String(length=100), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["away_team_id"], ["team.id"]),
+        sa.ForeignKeyConstraint(["competition_id"], ["competition.id"]),
+        sa.ForeignKeyConstraint(["home_team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_schedule_id"), "schedule", ["id"], unique=False)
+    op.create_table(
+        "standing",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("competition_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("rank", sa.Integer(), nullable=True),
+        sa.Column("played", sa.Integer(), nullable=True),
+        sa.Column("won", sa.Integer(), nullable=True),
+        sa.Column("drawn", sa.Integer(), nullable=True),
+        sa.Column("lost", sa.Integer(), nullable=True),
+        sa.Column("goals_for", sa.Integer(), nullable=True),
+        sa.Column("goals_against", sa.Integer(), nullable=True),
+        sa.Column("goal_difference", sa.Integer(), nullable=True),
+        sa.Column("points", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["competition_id"], ["competition.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_standing_id"), "standing", ["id"], unique=False)
+    op.create_table(
+        "training_plan",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("coach_id", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(length=100), nullable=True),
+        sa.Column("topic", sa.String(length=100), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("scheduled_date", sa.Date(), nullable=True),
+        sa.Column("scheduled_time", sa.Time(), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("location", sa.String(length=100), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["coach_id"], ["user.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_training_plan_id"), "training_plan", ["id"], unique=False)
+    op.create_table(
+        "training_resource",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("resource_type", sa.String(length=50), nullable=True),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("file_path", sa.String(length=255), nullable=True),
+        sa.Column("file_url", sa.String(length=255), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_training_resource_id"), "training_resource", ["id"], unique=False)
+    op.create_table(
+        "user_role",
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("role_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["role_id"], ["role.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+    )
+    op.create_table(
+        "health_record",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("player_id", sa.Integer(), nullable=True),
+        sa.Column("record_type", sa.String(length=50), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["player_id"], ["player.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_health_record_id"), "health_record", ["id"], unique=False)
+    op.create_table(
+        "match_record",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("schedule_id", sa.Integer(), nullable=True),
+        sa.Column("home_team_id", sa.Integer(), nullable=True),
+        sa.Column("away_team_id", sa.Integer(), nullable=True),
+        sa.Column("home_goals", sa.Integer(), nullable=True),
+        sa.Column("away_goals", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("event_details", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["away_team_id"], ["team.id"]),
+        sa.ForeignKeyConstraint(["home_team_id"], ["team.id"]),
+        sa.ForeignKeyConstraint(["schedule_id"], ["schedule.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_match_record_id"), "match_record", ["id"], unique=False)
+    op.create_table(
+        "player_statistics",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("player_id", sa.Integer(), nullable=True),
+        sa.Column("season", sa.String(length=20), nullable=True),
+        sa.Column("appearance", sa.Integer(), nullable=True),
+        sa.Column("goals", sa.Integer(), nullable=True),
+        sa.Column("assists", sa.Integer(), nullable=True),
+        sa.Column("yellow_cards", sa.Integer(), nullable=True),
+        sa.Column("red_cards", sa.Integer(), nullable=True),
+        sa.Column("minutes_played", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["player_id"], ["player.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_player_statistics_id"), "player_statistics", ["id"], unique=False)
+    op.create_table(
+        "training_record",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("training_plan_id", sa.Integer(), nullable=True),
+        sa.Column("player_id", sa.Integer(), nullable=True),
+        sa.Column("attendance", sa.String(length=50), nullable=True),
+        sa.Column("completion_rate", sa.Integer(), nullable=True),
+        sa.Column("performance_score", sa.Integer(), nullable=True),
+        sa.Column("coach_comment", sa.Text(), nullable=True),
+        sa.Column("recorded_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["player_id"], ["player.id"]),
+        sa.ForeignKeyConstraint(["training_plan_id"], ["training_plan.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_training_record_id"), "training_record", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_training_record_id"), table_name="training_record")
+    op.drop_table("training_record")
+    op.drop_index(op.f("ix_player_statistics_id"), table_name="player_statistics")
+    op.drop_table("player_statistics")
+    op.drop_index(op.f("ix_match_record_id"), table_name="match_record")
+    op.drop_table("match_record")
+    op.drop_index(op.f("ix_health_record_id"), table_name="health_record")
+    op.drop_table("health_record")
+    op.drop_table("user_role")
+    op.drop_index(op.f("ix_training_resource_id"), table_name="training_resource")
+    op.drop_table("training_resource")
+    op.drop_index(op.f("ix_training_plan_id"), table_name="training_plan")
+    op.drop_table("training_plan")
+    op.drop_index(op.f("ix_standing_id"), table_name="standing")
+    op.drop_table("standing")
+    op.drop_index(op.f("ix_schedule_id"), table_name="schedule")
+    op.drop_table("schedule")
+    op.drop_table("role_permission")
+    op.drop_index(op.f("ix_player_name"), table_name="player")
+    op.drop_index(op.f("ix_player_id"), table_name="player")
+    op.drop_table("player")
+    op.drop_index(op.f("ix_honor_id"), table_name="honor")
+    op.drop_table("honor")
+    op.drop_index(op.f("ix_user_username"), table_name="user")
+    op.drop_index(op.f("ix_user_id"), table_name="user")
+    op.drop_index(op.f("ix_user_email"), table_name="user")
+    op.drop_table("user")
+    op.drop_index(op.f("ix_team_name"), table_name="team")
+    op.drop_index(op.f("ix_team_id"), table_name="team")
+    op.drop_table("team")
+    op.drop_index(op.f("ix_role_name"), table_name="role")
+    op.drop_index(op.f("ix_role_id"), table_name="role")
+    op.drop_table("role")
+    op.drop_index(op.f("ix_permission_name"), table_name="permission")
+    op.drop_index(op.f("ix_permission_id"), table_name="permission")
+    op.drop_table("permission")
+    op.drop_index(op.f("ix_competition_name"), table_name="competition")
+    op.drop_index(op.f("ix_competition_id"), table_name="competition")
+    op.drop_table("competition")
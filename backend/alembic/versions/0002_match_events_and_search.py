@@ -0,0 +1,76 @@
+"""比赛事件表、全文检索索引和 updated_at 列
+
+Revision ID: 0002
+Revises: 0001
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# ngram 全文索引只在 MySQL 上创建
+FULLTEXT_INDEXES = (
+    ("ft_player_name", "player", ["name"]),
+    ("ft_player_search", "player", ["name", "nationality", "biography"]),
+    ("ft_team_name", "team", ["name"]),
+    ("ft_team_search", "team", ["name", "description"]),
+)
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name == "mysql"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "match_event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("match_id", sa.Integer(), nullable=False),
+        sa.Column("minute", sa.Integer(), nullable=True),
+        sa.Column("event_type", sa.String(length=30), nullable=False),
+        sa.Column("player_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=True),
+        sa.Column("related_player_id", sa.Integer(), nullable=True),
+        sa.Column("minutes", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["match_id"], ["match_record.id"]),
+        sa.ForeignKeyConstraint(["player_id"], ["player.id"]),
+        sa.ForeignKeyConstraint(["related_player_id"], ["player.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_match_event_id"), "match_event", ["id"], unique=False)
+    op.create_index("idx_match_event_match_minute", "match_event", ["match_id", "minute"])
+    op.create_index("idx_match_event_player_type", "match_event", ["player_id", "event_type"])
+    op.create_index("idx_match_event_team_type", "match_event", ["team_id", "event_type"])
+    op.create_index("idx_match_event_type_match", "match_event", ["event_type", "match_id"])
+
+    for table in ("honor", "player_statistics", "health_record"):
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+    if _is_mysql():
+        for name, table, columns in FULLTEXT_INDEXES:
+            op.create_index(
+                name, table, columns, mysql_prefix="FULLTEXT", mysql_with_parser="ngram"
+            )
+
+
+def downgrade() -> None:
+    if _is_mysql():
+        for name, table, _ in reversed(FULLTEXT_INDEXES):
+            op.drop_index(name, table_name=table)
+
+    for table in ("health_record", "player_statistics", "honor"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("updated_at")
+
+    op.drop_index("idx_match_event_type_match", table_name="match_event")
+    op.drop_index("idx_match_event_team_type", table_name="match_event")
+    op.drop_index("idx_match_event_player_type", table_name="match_event")
+    op.drop_index("idx_match_event_match_minute", table_name="match_event")
+    op.drop_index(op.f("ix_match_event_id"), table_name="match_event")
+    op.drop_table("match_event")
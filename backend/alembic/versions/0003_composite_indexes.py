@@ -0,0 +1,91 @@
+"""按实际查询路径建立复合索引，补充唯一约束
+
+Revision ID: 0003
+Revises: 0002
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (索引名, 表, 列)
+INDEXES = (
+    ("idx_player_team_position", "player", ["team_id", "position"]),
+    ("idx_schedule_competition_round", "schedule", ["competition_id", "round_number"]),
+    ("idx_standing_competition_rank", "standing", ["competition_id", "rank"]),
+    ("idx_health_record_player_status", "health_record", ["player_id", "status"]),
+)
+
+# (约束名, 表, 列)；唯一索引同时覆盖按前缀列的查询，
+# 如 player_statistics(player_id, season)、training_record(training_plan_id, player_id)
+UNIQUE_CONSTRAINTS = (
+    ("uq_player_statistics_player_season", "player_statistics", ["player_id", "season"]),
+    ("uq_training_record_plan_player", "training_record", ["training_plan_id", "player_id"]),
+    ("uq_standing_competition_team", "standing", ["competition_id", "team_id"]),
+    ("uq_match_record_schedule", "match_record", ["schedule_id"]),
+    (
+        "uq_schedule_fixture",
+        "schedule",
+        ["competition_id", "home_team_id", "away_team_id", "match_date"],
+    ),
+    ("uq_user_role", "user_role", ["user_id", "role_id"]),
+    ("uq_role_permission", "role_permission", ["role_id", "permission_id"]),
+)
+
+
+def _check_duplicates() -> None:
+    """已有重复数据时中止迁移，并列出需要先清理的表"""
+    bind = op.get_bind()
+    problems = []
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        cols = [sa.column(column) for column in columns]
+        duplicates = (
+            sa.select(*cols)
+            .select_from(sa.table(table, *cols))
+            .where(*(col.isnot(None) for col in cols))
+            .group_by(*cols)
+            .having(sa.func.count() > 1)
+            .subquery()
+        )
+        count = bind.execute(sa.select(sa.func.count()).select_from(duplicates)).scalar()
+        if count:
+            problems.append(f"{table}({', '.join(columns)}): {count} duplicated keys")
+    if problems:
+        raise RuntimeError(
+            "cannot add unique constraints, remove duplicated rows first "
+            "(standing / player_statistics can be rebuilt from match records):\n  "
+            + "\n  ".join(problems)
+        )
+
+
+def upgrade() -> None:
+    _check_duplicates()
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(name, columns)
+
+
+def downgrade() -> None:
+    # MySQL 在建立以外键列开头的索引后会删除外键自动创建的索引，
+    # 删除这些索引前先为外键列补回单列索引
+    is_mysql = op.get_bind().dialect.name == "mysql"
+    restored = set()
+
+    def restore_fk_index(table: str, column: str) -> None:
+        if is_mysql and (table, column) not in restored:
+            op.create_index(column, table, [column])
+            restored.add((table, column))
+
+    for name, table, columns in reversed(UNIQUE_CONSTRAINTS):
+        restore_fk_index(table, columns[0])
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(name, type_="unique")
+    for name, table, columns in reversed(INDEXES):
+        restore_fk_index(table, columns[0])
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,85 @@
+"""球队赛果时间线 team_result，并由已完成的比赛回填
+
+Revision ID: 0004
+Revises: 0003
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+MATCH_STATUS_FINISHED = "已完成"
+
+# 每场已完成的比赛分别以主队、客队视角各写一行
+BACKFILL = """
+INSERT INTO team_result (
+    match_id, competition_id, match_date, team_id, opponent_id,
+    is_home, goals_for, goals_against, outcome, created_at
+)
+SELECT
+    m.id, s.competition_id, s.match_date, m.{team}_team_id, m.{opponent}_team_id,
+    {is_home}, COALESCE(m.{team}_goals, 0), COALESCE(m.{opponent}_goals, 0),
+    CASE
+        WHEN COALESCE(m.{team}_goals, 0) > COALESCE(m.{opponent}_goals, 0) THEN 'W'
+        WHEN COALESCE(m.{team}_goals, 0) = COALESCE(m.{opponent}_goals, 0) THEN 'D'
+        ELSE 'L'
+    END,
+    CURRENT_TIMESTAMP
+FROM match_record m
+JOIN schedule s ON s.id = m.schedule_id
+WHERE m.status = :status
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "team_result",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("match_id", sa.Integer(), nullable=False),
+        sa.Column("competition_id", sa.Integer(), nullable=True),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("opponent_id", sa.Integer(), nullable=False),
+        sa.Column("match_date", sa.Date(), nullable=True),
+        sa.Column("is_home", sa.Boolean(), nullable=False),
+        sa.Column("goals_for", sa.Integer(), nullable=True),
+        sa.Column("goals_against", sa.Integer(), nullable=True),
+        sa.Column("outcome", sa.String(length=1), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["competition_id"], ["competition.id"]),
+        sa.ForeignKeyConstraint(["match_id"], ["match_record.id"]),
+        sa.ForeignKeyConstraint(["opponent_id"], ["team.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("match_id", "team_id", name="uq_team_result_match_team"),
+    )
+    op.create_index(op.f("ix_team_result_id"), "team_result", ["id"], unique=False)
+    op.create_index(
+        "idx_team_result_team_date", "team_result", ["team_id", "match_date", "match_id"]
+    )
+    op.create_index(
+        "idx_team_result_team_opponent", "team_result", ["team_id", "opponent_id", "match_date"]
+    )
+    op.create_index(
+        "idx_team_result_competition_team",
+        "team_result",
+        ["competition_id", "team_id", "match_date"],
+    )
+
+    for team, opponent, is_home in (("home", "away", 1), ("away", "home", 0)):
+        op.execute(
+            sa.text(BACKFILL.format(team=team, opponent=opponent, is_home=is_home)).bindparams(
+                status=MATCH_STATUS_FINISHED
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_team_result_competition_team", table_name="team_result")
+    op.drop_index("idx_team_result_team_opponent", table_name="team_result")
+    op.drop_index("idx_team_result_team_date", table_name="team_result")
+    op.drop_index(op.f("ix_team_result_id"), table_name="team_result")
+    op.drop_table("team_result")
@@ -0,0 +1,81 @@
+"""训练每日汇总 training_daily_summary，并由已有训练记录回填
+
+Revision ID: 0006
+Revises: 0005
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# 与 app.services.training.rebuild_summary 的聚合一致，出勤包含迟到
+BACKFILL = """
+INSERT INTO training_daily_summary (
+    team_id, summary_date, player_id, sessions, attended, late, absent,
+    completion_total, completion_count, score_total, score_count, updated_at
+)
+SELECT
+    p.team_id, p.scheduled_date, r.player_id, COUNT(r.id),
+    SUM(CASE WHEN r.attendance IN ('出席', '迟到') THEN 1 ELSE 0 END),
+    SUM(CASE WHEN r.attendance = '迟到' THEN 1 ELSE 0 END),
+    SUM(CASE WHEN r.attendance = '缺席' THEN 1 ELSE 0 END),
+    COALESCE(SUM(r.completion_rate), 0), COUNT(r.completion_rate),
+    COALESCE(SUM(r.performance_score), 0), COUNT(r.performance_score),
+    CURRENT_TIMESTAMP
+FROM training_record r
+JOIN training_plan p ON p.id = r.training_plan_id
+WHERE p.team_id IS NOT NULL AND p.scheduled_date IS NOT NULL AND r.player_id IS NOT NULL
+GROUP BY p.team_id, p.scheduled_date, r.player_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "training_daily_summary",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("team_id", sa.Integer(), nullable=False),
+        sa.Column("player_id", sa.Integer(), nullable=False),
+        sa.Column("summary_date", sa.Date(), nullable=False),
+        sa.Column("sessions", sa.Integer(), nullable=True),
+        sa.Column("attended", sa.Integer(), nullable=True),
+        sa.Column("late", sa.Integer(), nullable=True),
+        sa.Column("absent", sa.Integer(), nullable=True),
+        sa.Column("completion_total", sa.Integer(), nullable=True),
+        sa.Column("completion_count", sa.Integer(), nullable=True),
+        sa.Column("score_total", sa.Integer(), nullable=True),
+        sa.Column("score_count", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["player_id"], ["player.id"]),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "team_id",
+            "summary_date",
+            "player_id",
+            name="uq_training_daily_summary_team_date_player",
+        ),
+    )
+    op.create_index(
+        op.f("ix_training_daily_summary_id"), "training_daily_summary", ["id"], unique=False
+    )
+    op.create_index(
+        "idx_training_daily_summary_player_date",
+        "training_daily_summary",
+        ["player_id", "summary_date"],
+    )
+    op.create_index(
+        "idx_training_plan_team_date", "training_plan", ["team_id", "scheduled_date"]
+    )
+
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_training_plan_team_date", table_name="training_plan")
+    op.drop_index("idx_training_daily_summary_player_date", table_name="training_daily_summary")
+    op.drop_index(op.f("ix_training_daily_summary_id"), table_name="training_daily_summary")
+    op.drop_table("training_daily_summary")
@@ -0,0 +1,269 @@
+"""响应压缩
+
+按请求的 Accept-Encoding 选择 br（已安装 brotli 时）或 gzip。小于
+COMPRESSION_MIN_SIZE 字节的响应体压缩收益很小，类型不在 COMPRESSION_CONTENT_TYPES
+中的响应（图片、XLSX 等）本身已压缩，这两类都原样返回。
+
+缓存接口（json_response）的响应体对同一份缓存数据总是相同的，压缩结果按
+（响应体摘要, 编码）保存在进程内 LRU 中，缓存命中时直接发送已压缩的字节，并使用
+较高的压缩质量。Redis 缓存客户端按文本解码，不适合存放压缩后的二进制数据，
+因此压缩结果只在进程内复用。其余响应（model_response、流式导出、文件下载）由
+CompressionMiddleware 实时压缩，多段响应体使用流式压缩。
+"""
+import gzip
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core import metrics
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 为可选依赖，未安装时只使用 gzip
+    brotli = None
+
+BROTLI = "br"
+GZIP = "gzip"
+
+# 客户端对两者的权重相同时优先 br
+SUPPORTED_ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+# 没有响应体或为部分内容的状态码
+_SKIP_STATUS = {204, 206, 304}
+
+_CONTENT_TYPES = frozenset(settings.COMPRESSION_CONTENT_TYPES)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """按 Accept-Encoding 中的 q 值选择编码，都不接受时返回 None"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = weights.get(coding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def request_encoding(scope) -> Optional[str]:
+    return choose_encoding(Headers(scope=scope).get("accept-encoding"))
+
+
+def compressible(status_code: int, headers: Headers) -> bool:
+    """响应状态、类型和已有响应头是否允许压缩（不考虑大小）"""
+    if status_code < 200 or status_code in _SKIP_STATUS:
+        return False
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", "").lower():
+        return False
+    media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return media_type in _CONTENT_TYPES
+
+
+def add_vary(headers: MutableHeaders) -> None:
+    """响应内容随 Accept-Encoding 变化，提示共享缓存按该请求头区分"""
+    vary = headers.get("vary")
+    if vary is None:
+        headers["vary"] = "Accept-Encoding"
+        return
+    tokens = {token.strip().lower() for token in vary.split(",")}
+    if "*" not in tokens and "accept-encoding" not in tokens:
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    """一次性压缩完整的响应体；cached 为 True 时使用缓存数据的压缩质量"""
+    if encoding == BROTLI:
+        quality = (
+            settings.COMPRESSION_CACHED_BROTLI_QUALITY
+            if cached
+            else settings.COMPRESSION_BROTLI_QUALITY
+        )
+        return brotli.compress(body, quality=quality)
+    # mtime 固定为 0，相同内容的压缩结果逐字节一致
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """多段响应体的流式压缩"""
+
+    def __init__(self, encoding: str):
+        if encoding == BROTLI:
+            compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self.compress = compressor.process
+            self.finish = compressor.finish
+        else:
+            compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16
+            )
+            self.compress = compressor.compress
+            self.finish = compressor.flush
+
+
+class CompressedBodyCache:
+    """按（响应体摘要, 编码）保存压缩结果的进程内 LRU，按总字节数限制容量"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            metrics.COMPRESSED_BODY_CACHE.labels("hit").inc()
+            return compressed
+
+        metrics.COMPRESSED_BODY_CACHE.labels("miss").inc()
+        compressed = compress(body, encoding, cached=True)
+        if len(compressed) <= self.max_bytes:
+            self._entries[key] = compressed
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return compressed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+def precompress(response, scope) -> None:
+    """把响应体替换为缓存中的压缩结果，供缓存接口的响应在发送前调用
+
+    设置 Content-Encoding 后 CompressionMiddleware 不会再处理该响应。
+    """
+    if not settings.COMPRESSION_ENABLED:
+        return
+    body = response.body
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return
+    headers = response.headers
+    if not compressible(response.status_code, headers):
+        return
+    add_vary(headers)
+    encoding = request_encoding(scope)
+    if encoding is None:
+        return
+    compressed = compressed_bodies.get_or_compress(body, encoding)
+    if len(compressed) >= len(body):
+        return
+    response.body = compressed
+    headers["content-encoding"] = encoding
+    headers["content-length"] = str(len(compressed))
+
+
+class CompressionMiddleware:
+    """实时压缩没有预先压缩的响应"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(request_encoding(scope), send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """暂存响应头直到收到第一段响应体，再决定是否压缩以及一次性或流式压缩"""
+
+    def __init__(self, encoding: Optional[str], send):
+        self.encoding = encoding
+        self._send = send
+        self._start = None
+        self._compressor: Optional[_StreamCompressor] = None
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            if compressible(message["status"], Headers(raw=message.get("headers", []))):
+                self._start = message
+                return
+            await self._send(message)
+            return
+        if message_type != "http.response.body" or (
+            self._start is None and self._compressor is None
+        ):
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._compressor is not None:
+            await self._send_compressed(body, more_body)
+            return
+
+        start, self._start = self._start, None
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        start["headers"] = headers.raw
+        if more_body:
+            length = headers.get("content-length")
+            size = int(length) if length and length.isdigit() else None
+        else:
+            size = len(body)
+        if size is not None and size < settings.COMPRESSION_MIN_SIZE:
+            await self._send(start)
+            await self._send(message)
+            return
+
+        add_vary(headers)
+        if self.encoding is None:
+            await self._send(start)
+            await self._send(message)
+            return
+
+        if not more_body:
+            compressed = compress(body, self.encoding)
+            if len(compressed) < len(body):
+                headers["content-encoding"] = self.encoding
+                headers["content-length"] = str(len(compressed))
+                body = compressed
+            await self._send(start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        headers["content-encoding"] = self.encoding
+        del headers["content-length"]
+        self._compressor = _StreamCompressor(self.encoding)
+        await self._send(start)
+        await self._send_compressed(body, more_body)
+
+    async def _send_compressed(self, body: bytes, more_body: bool) -> None:
+        data = self._compressor.compress(body) if body else b""
+        if more_body:
+            if data:
+                await self._send(
+                    {"type": "http.response.body", "body": data, "more_body": True}
+                )
+            return
+        await self._send({"type": "http.response.body", "body": data + self._compressor.finish()})
@@ -0,0 +1,138 @@
+"""条件请求（ETag / Last-Modified）
+
+在加载和序列化响应体之前，用一条聚合查询取得本次要返回的行的数据版本：
+对与接口相同的过滤、排序和分页条件（只选 updated_at）求 max(updated_at) 与行数，
+展开的关联数据按这些行的 ID 对关联表做同样的聚合。带缓存的接口再加上缓存资源
+（及 scope）的版本，覆盖没有刷新 updated_at 的批量写入。由此生成弱 ETag 和
+Last-Modified；客户端携带 If-None-Match 或 If-Modified-Since 且数据未变化时直接
+返回 304，不读缓存、不加载行、也不序列化。
+
+聚合只作用于当前页的行（主键或过滤列上的索引范围），不会扫描整张表。行数用于
+发现删除；Last-Modified 无法反映关联行的删除，客户端同时携带 If-None-Match 时
+以 ETag 为准。
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, List, Optional, Tuple, Type
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.api import compression
+from app.core.config import settings
+
+Version = Tuple[Optional[datetime], int]
+
+
+def row_sources(model: Type, page: Select, relations: Iterable[str] = ()) -> List[Select]:
+    """本次返回的行及其展开关联行的版本来源
+
+    page 为带过滤、排序和分页条件的 select(model)，不带加载选项。
+    """
+    rows = page.with_only_columns(model.id, model.updated_at).subquery()
+    sources = [select(rows.c.updated_at)]
+    relationships = inspect(model).relationships
+    for name in sorted(relations):
+        relationship = relationships[name]
+        (local, remote), = relationship.local_remote_pairs
+        # IN 子查询外再包一层派生表，MySQL 不支持 IN 子查询中直接使用 LIMIT
+        sources.append(
+            select(relationship.mapper.class_.updated_at).where(
+                remote.in_(select(rows.c[local.key]))
+            )
+        )
+    return sources
+
+
+async def data_versions(db: AsyncSession, sources: Iterable[Select]) -> List[Version]:
+    """在一次查询中取得每个来源的 (max(updated_at), 行数)"""
+    columns = []
+    for source in sources:
+        subquery = source.subquery()
+        columns.append(select(func.max(subquery.c.updated_at)).scalar_subquery())
+        columns.append(select(func.count()).select_from(subquery).scalar_subquery())
+    row = (await db.execute(select(*columns))).one()
+    return [(row[i], row[i + 1]) for i in range(0, len(row), 2)]
+
+
+def _utc(value: datetime) -> datetime:
+    # updated_at 以 UTC 朴素时间存储
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def make_etag(request: Request, versions: List[Version], cache_version: str = "") -> str:
+    """由请求路径、查询参数、数据版本和缓存版本生成弱 ETag"""
+    parts = [request.url.path, *sorted(request.query_params.multi_items()), cache_version]
+    parts += [
+        (updated_at.isoformat() if updated_at else None, count)
+        for updated_at, count in versions
+    ]
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match 使用弱比较
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """按 RFC 7232：有 If-None-Match 时忽略 If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _utc(last_modified) <= since
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    sources: Iterable[Select],
+    cache_version: str = "",
+) -> Optional[Response]:
+    """写入 ETag / Last-Modified 响应头；客户端缓存仍有效时返回 304 响应"""
+    versions = await data_versions(db, sources)
+    etag = make_etag(request, versions, cache_version)
+    last_modified = max(
+        (updated_at for updated_at, _ in versions if updated_at is not None), default=None
+    )
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if not is_not_modified(request, etag, last_modified):
+        return None
+    not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if settings.COMPRESSION_ENABLED:
+        # 与完整响应一致，共享缓存按 Accept-Encoding 区分同一 ETag 的不同编码
+        compression.add_vary(not_modified.headers)
+    return not_modified
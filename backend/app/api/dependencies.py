@@ -1,11 +1,13 @@
 """依赖注入"""
 from typing import Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core import verify_token
+from app.core.principals import Principal, principal_cache
 from app.db import get_db
 from app.models import User
 
@@ -13,10 +15,13 @@ security = HTTPBearer()
 
 
 async def get_current_user(
-    credentials: HTTPAuthCredentials = Depends(security),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-) -> User:
-    """获取当前用户"""
+) -> Principal:
+    """获取当前用户
+
+    优先使用令牌中的声明，其次使用认证用户缓存，都没有时才查询数据库。
+    """
     token = credentials.credentials
     payload = verify_token(token)
 
@@ -33,24 +38,34 @@ async def get_current_user(
             detail="Invalid token",
         )
 
-    # 从数据库获取用户
-    from sqlalchemy import select
+    principal = Principal.from_claims(payload)
+    if principal is None:
+        principal = await principal_cache.get(int(user_id))
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    if principal is None:
+        # 从数据库获取用户
+        from sqlalchemy import select
 
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+        result = await db.execute(
+            select(User).where(User.id == user_id).options(selectinload(User.roles))
         )
+        user = result.scalar_one_or_none()
+
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+
+        principal = Principal.from_user(user)
+        await principal_cache.set(principal)
 
-    return user
+    return principal
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """获取当前超级管理员"""
     if not current_user.is_superuser:
         raise HTTPException(
@@ -0,0 +1,53 @@
+"""请求体大小限制
+
+上传文件在进入接口之前就已被解析并写入临时文件，在接口里检查 UploadFile.size
+为时已晚。BodySizeLimitMiddleware 在读取请求体之前按 Content-Length 拒绝超过
+MAX_UPLOAD_SIZE 的请求；没有 Content-Length（分块传输）时边读边计数，超出后
+中止解析，统一返回 413。
+"""
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+
+TOO_LARGE_DETAIL = "File too large"
+
+
+class BodySizeLimitMiddleware:
+    """拒绝超过 MAX_UPLOAD_SIZE 的请求体"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_UPLOAD_SIZE
+        length = Headers(scope=scope).get("content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            response = FastJSONResponse(
+                {"detail": TOO_LARGE_DETAIL},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # 接口解析请求体时抛出，由应用的异常处理转换为 413 响应
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=TOO_LARGE_DETAIL,
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
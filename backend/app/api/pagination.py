@@ -0,0 +1,120 @@
+"""游标（keyset）分页
+
+列表接口默认仍使用 skip/limit。传入 cursor 参数（首页传空字符串）即切换为游标
+模式：按 (排序列, id) 排序，用上一页最后一行的键作为下一页的起点，深翻页与首页
+代价相同。下一页游标通过 X-Next-Cursor 响应头返回，没有下一页时不返回该头。
+
+排序列可以为 NULL（如 name）。MySQL 和 SQLite 升序排序时 NULL 排在最前，
+游标条件与之对应：上一页停在 NULL 行时，先取剩余的 NULL 行（按 id），再取全部
+非 NULL 行；否则 NULL 行都已取过，只比较非 NULL 值。
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """将排序列名和键值编码为不透明游标"""
+    raw = json.dumps([sort, list(values)], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _valid_values(values: Any, sort: str) -> bool:
+    """键值须为 [id]（按 id 排序）或 [排序列值, id]，排序列值只能是标量"""
+    if not isinstance(values, list) or len(values) != (1 if sort == "id" else 2):
+        return False
+    last_id = values[-1]
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        return False
+    return len(values) == 1 or values[0] is None or isinstance(values[0], (str, int, float))
+
+
+def decode_cursor(cursor: str, sort: str) -> Optional[List[Any]]:
+    """解码游标，空游标表示第一页"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if not isinstance(cursor_sort, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if cursor_sort != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match sort",
+        )
+    if not _valid_values(values, sort):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
+
+
+def resolve_sort(model, sort: Optional[str], allowed: Sequence[str]) -> str:
+    """校验排序列，默认按 id 排序"""
+    sort = sort or "id"
+    if sort != "id" and sort not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported sort field: {sort}",
+        )
+    return sort
+
+
+def keyset_query(query: Select, model, sort: str, cursor: str, limit: int) -> Select:
+    """为查询附加 keyset 条件、排序和 limit（多取一行用于判断是否还有下一页）"""
+    id_column = model.id
+    values = decode_cursor(cursor, sort)
+
+    if sort == "id":
+        if values is not None:
+            query = query.where(id_column > values[0])
+        return query.order_by(id_column).limit(limit + 1)
+
+    sort_column = getattr(model, sort)
+    if values is not None:
+        last_value, last_id = values
+        if last_value is None:
+            condition = or_(
+                and_(sort_column.is_(None), id_column > last_id),
+                sort_column.is_not(None),
+            )
+        else:
+            condition = or_(
+                sort_column > last_value,
+                and_(sort_column == last_value, id_column > last_id),
+            )
+        query = query.where(condition)
+    return query.order_by(sort_column, id_column).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], sort: str, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """截取当前页并生成下一页游标"""
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    if sort == "id":
+        return items, encode_cursor(sort, [last.id])
+    return items, encode_cursor(sort, [getattr(last, sort), last.id])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
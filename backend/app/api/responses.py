@@ -0,0 +1,85 @@
+"""JSON 响应序列化
+
+应用默认使用 FastJSONResponse，以 orjson 编码（未安装时退回标准库 json）。
+
+声明了 response_model 的接口返回 ORM 对象或模型时，FastAPI 会先转成字典、按
+response_model 重新校验，再经 jsonable_encoder 遍历一遍才编码。数据已经校验过时
+可改用 model_response / json_response 直接返回 Response 跳过这些步骤，
+response_model 仍用于生成接口文档。
+
+json_response 用于缓存接口，返回的 CachedJSONResponse 在发送前复用已缓存的压缩
+结果（见 app.api.compression）。
+"""
+from functools import lru_cache
+from typing import Any, Optional, Set, get_origin
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api import compression
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson 编码的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class CachedJSONResponse(FastJSONResponse):
+    """缓存数据的 JSON 响应，相同响应体的压缩结果在进程内复用"""
+
+    async def __call__(self, scope, receive, send) -> None:
+        compression.precompress(self, scope)
+        await super().__call__(scope, receive, send)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _headers(response: Optional[Response]) -> Optional[dict]:
+    # 依赖注入的 Response 上已设置的响应头（X-Next-Cursor、ETag 等）
+    return dict(response.headers) if response is not None else None
+
+
+def model_response(
+    schema: Any,
+    content: Any,
+    response: Optional[Response] = None,
+    status_code: int = 200,
+    exclude: Optional[Set[str]] = None,
+) -> Response:
+    """按 schema 校验一次 ORM 对象，由 pydantic 直接编码为 JSON
+
+    schema 可以是模型类或 List[模型类]；已经是该模型实例的数据不会重复校验。
+    exclude 为不输出的字段名，List[模型类] 时作用于每个元素。
+    """
+    adapter = type_adapter(schema)
+    if exclude and get_origin(schema) is list:
+        exclude = {"__all__": exclude}
+    body = adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True), exclude=exclude or None
+    )
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=_headers(response),
+    )
+
+
+def json_response(
+    content: Any, response: Optional[Response] = None, status_code: int = 200
+) -> CachedJSONResponse:
+    """直接编码已是 JSON 兼容结构的数据（如缓存中的 model_dump 结果），不再校验"""
+    return CachedJSONResponse(content, status_code=status_code, headers=_headers(response))
@@ -1,6 +1,17 @@
 """API v1 模块"""
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, teams, players, competitions
+from app.api.v1.endpoints import (
+    auth,
+    teams,
+    players,
+    competitions,
+    matches,
+    exports,
+    search,
+    analytics,
+    jobs,
+    training,
+)
 
 router = APIRouter(prefix="/api/v1")
 
@@ -9,5 +20,11 @@ router.include_router(auth.router)
 router.include_router(teams.router)
 router.include_router(players.router)
 router.include_router(competitions.router)
+router.include_router(matches.router)
+router.include_router(exports.router)
+router.include_router(search.router)
+router.include_router(analytics.router)
+router.include_router(jobs.router)
+router.include_router(training.router)
 
 __all__ = ["router"]
@@ -1,4 +1,26 @@
 """API端点模块"""
-from app.api.v1.endpoints import auth, teams, players, competitions
+from app.api.v1.endpoints import (
+    auth,
+    teams,
+    players,
+    competitions,
+    matches,
+    exports,
+    search,
+    analytics,
+    jobs,
+    training,
+)
 
-__all__ = ["auth", "teams", "players", "competitions"]
+__all__ = [
+    "auth",
+    "teams",
+    "players",
+    "competitions",
+    "matches",
+    "exports",
+    "search",
+    "analytics",
+    "jobs",
+    "training",
+]
@@ -0,0 +1,166 @@
+"""统计分析接口：球队近况、交锋记录、连续纪录和赛前数据"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.api.responses import json_response
+from app.api.v1.endpoints.jobs import submit_job
+from app.core.cache import Cache, get_cache
+from app.core.principals import Principal
+from app.db import get_db, get_read_db
+from app.models import Schedule
+from app.schemas import HeadToHead, Job as JobSchema, MatchPreview, TeamForm, TeamStreaks
+from app.schemas.job import TimelineRebuildParams
+from app.services import analytics as analytics_service
+from app.services.analytics import CACHE_RESOURCE, cache_scope
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+async def _cached_team_stats(
+    cache: Cache,
+    db: AsyncSession,
+    team_id: int,
+    competition_id: Optional[int],
+    key: str,
+    load,
+):
+    """球队统计走缓存；球队不存在时缓存 None 并返回 404"""
+
+    async def loader():
+        if not await analytics_service.team_exists(db, team_id):
+            return None
+        return await load()
+
+    data = await cache.get_or_set(CACHE_RESOURCE, key, loader, scope=cache_scope(competition_id))
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found",
+        )
+    return data
+
+
+@router.get("/teams/{team_id}/form", response_model=TeamForm)
+async def get_team_form(
+    team_id: int,
+    competition_id: Optional[int] = None,
+    last: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """球队近况：最近 N 场、总战绩、主客场战绩和连续纪录，可限定赛事"""
+
+    async def load():
+        return await analytics_service.team_form(db, team_id, competition_id, last)
+
+    data = await _cached_team_stats(
+        cache, db, team_id, competition_id, f"form:{team_id}:{last}", load
+    )
+    return json_response(data)
+
+
+@router.get("/teams/{team_id}/streaks", response_model=TeamStreaks)
+async def get_team_streaks(
+    team_id: int,
+    competition_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """球队当前和历史最长的连胜、不败、连败纪录"""
+
+    async def load():
+        return await analytics_service.team_streaks(db, team_id, competition_id)
+
+    data = await _cached_team_stats(
+        cache, db, team_id, competition_id, f"streaks:{team_id}", load
+    )
+    return json_response(data)
+
+
+@router.get("/head-to-head", response_model=HeadToHead)
+async def get_head_to_head(
+    team_id: int,
+    opponent_id: int,
+    competition_id: Optional[int] = None,
+    last: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """两队交锋记录，胜负以 team_id 一方的视角统计"""
+    if team_id == opponent_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="team_id and opponent_id must differ",
+        )
+
+    async def load():
+        return await analytics_service.head_to_head(
+            db, team_id, opponent_id, competition_id, last
+        )
+
+    data = await cache.get_or_set(
+        CACHE_RESOURCE,
+        f"h2h:{team_id}:{opponent_id}:{last}",
+        load,
+        scope=cache_scope(competition_id),
+    )
+    return json_response(data)
+
+
+@router.get("/schedules/{schedule_id}/preview", response_model=MatchPreview)
+async def get_match_preview(
+    schedule_id: int,
+    competition_only: bool = False,
+    last: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """赛前数据：两队近况、主客场战绩、连续纪录和交锋记录，一次返回
+
+    competition_only 为 true 时只统计本赛事的比赛。缓存命中时不查询赛程；赛事在
+    查出赛程前未知，结果放在不限赛事的 scope 下，任一赛事的比赛变化都会使其失效。
+    赛程不存在时缓存 None 并返回 404。
+    """
+
+    async def load():
+        result = await db.execute(select(Schedule).where(Schedule.id == schedule_id))
+        schedule = result.scalar_one_or_none()
+        if schedule is None:
+            return None
+        return await analytics_service.match_preview(db, schedule, competition_only, last)
+
+    data = await cache.get_or_set(
+        CACHE_RESOURCE,
+        f"preview:{schedule_id}:{int(competition_only)}:{last}",
+        load,
+        scope=cache_scope(None),
+    )
+    if data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found",
+        )
+    return json_response(data)
+
+
+@router.post(
+    "/timeline/rebuild", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED
+)
+async def rebuild_timeline(
+    request: Request,
+    competition_id: Optional[int] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """以后台任务根据比赛记录重建球队赛果时间线，用于数据修复"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    params = TimelineRebuildParams(competition_id=competition_id)
+    return await submit_job(request, db, "analytics.rebuild", params, current_user)
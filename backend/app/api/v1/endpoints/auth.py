@@ -3,8 +3,12 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.core import hash_password, verify_password, create_access_token, create_refresh_token
+from app.core import create_access_token, create_refresh_token
+from app.core.config import settings
+from app.core.hashing import HasherSaturated, password_hasher
+from app.core.principals import Principal
 from app.db import get_db
 from app.models import User
 from app.schemas import UserCreate, UserLogin, Token
@@ -12,6 +16,36 @@ from app.schemas import UserCreate, UserLogin, Token
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherSaturated:
+        raise _busy()
+
+
+async def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HasherSaturated:
+        raise _busy()
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _access_claims(principal: Principal) -> dict:
+    """访问令牌声明，开启 TOKEN_EMBED_CLAIMS 时附带权限信息"""
+    data = {"sub": principal.id}
+    if settings.TOKEN_EMBED_CLAIMS:
+        data.update(principal.to_claims())
+    return data
+
+
 @router.post("/register", response_model=Token)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """用户注册"""
@@ -24,6 +58,8 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
+    # 结束只读事务、归还连接，哈希期间不占用连接池
+    await db.commit()
 
     # 创建新用户
     user = User(
@@ -31,14 +67,20 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         email=user_data.email,
         full_name=user_data.full_name,
         phone=user_data.phone,
-        password=hash_password(user_data.password),
+        password=await _hash_password(user_data.password),
     )
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser),
+    )
 
     # 生成令牌
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data=_access_claims(principal))
     refresh_token = create_refresh_token(data={"sub": user.id})
 
     return {
@@ -52,11 +94,16 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """用户登录"""
     result = await db.execute(
-        select(User).where(User.username == credentials.username)
+        select(User)
+        .where(User.username == credentials.username)
+        .options(selectinload(User.roles))
     )
     user = result.scalar_one_or_none()
+    # 结束只读事务、归还连接：排队等待密码校验的登录请求不占用连接池，
+    # 否则登录高峰会让其他接口等待数据库连接
+    await db.commit()
 
-    if not user or not verify_password(credentials.password, user.password):
+    if not user or not await _verify_password(credentials.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -68,7 +115,7 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="User is inactive",
         )
 
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data=_access_claims(Principal.from_user(user)))
     refresh_token = create_refresh_token(data={"sub": user.id})
 
     return {
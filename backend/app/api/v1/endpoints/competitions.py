@@ -1,72 +1,138 @@
 """赛事管理接口"""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified, row_sources
 from app.api.dependencies import get_current_user
-from app.db import get_db
-from app.models import Competition, User
+from app.api.pagination import keyset_query, resolve_sort, set_next_cursor, split_page
+from app.api.responses import json_response, model_response
+from app.api.v1.endpoints.jobs import submit_job
+from app.core.cache import Cache, get_cache
+from app.core.principals import Principal
+from app.db import get_db, get_read_db
+from app.models import Competition, Schedule, Standing
+from app.schemas import (
+    Competition as CompetitionSchema,
+    CompetitionCreate,
+    Job as JobSchema,
+    CompetitionSummary,
+    Schedule as ScheduleSchema,
+    ScheduleGenerate,
+    ScheduleGenerateResult,
+    Standing as StandingSchema,
+)
+from app.schemas.job import StandingsRebuildParams
+from app.services import fixtures as fixtures_service
+from app.services import standings as standings_service
 
 router = APIRouter(prefix="/competitions", tags=["competitions"])
 
+# 游标分页允许的排序列
+SORT_FIELDS = ("name",)
 
-@router.get("", response_model=List[dict])
+
+def _summary(c: Competition) -> dict:
+    return CompetitionSummary.model_validate(c).model_dump(mode="json")
+
+
+@router.get("", response_model=List[CompetitionSummary])
 async def list_competitions(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
 ):
-    """获取赛事列表"""
-    result = await db.execute(
-        select(Competition).offset(skip).limit(limit)
+    """获取赛事列表，传入 cursor 时使用游标分页，下一页游标见 X-Next-Cursor 响应头"""
+    if cursor is not None:
+        sort = resolve_sort(Competition, sort, SORT_FIELDS)
+        query = keyset_query(select(Competition), Competition, sort, cursor, limit)
+    else:
+        query = select(Competition).offset(skip).limit(limit)
+
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(Competition, query),
+        await cache.version("competitions"),
     )
-    competitions = result.scalars().all()
-    return [
-        {
-            "id": c.id,
-            "name": c.name,
-            "competition_type": c.competition_type,
-            "season": c.season,
-            "start_date": c.start_date,
-            "end_date": c.end_date,
-        }
-        for c in competitions
-    ]
-
-
-@router.get("/{competition_id}", response_model=dict)
+    if not_modified is not None:
+        return not_modified
+
+    if cursor is not None:
+
+        async def load_page():
+            result = await db.execute(query)
+            competitions, next_cursor = split_page(result.scalars().all(), sort, limit)
+            return {
+                "items": [_summary(c) for c in competitions],
+                "next_cursor": next_cursor,
+            }
+
+        page = await cache.get_or_set(
+            "competitions", f"cursor:{sort}:{cursor}:{limit}", load_page
+        )
+        set_next_cursor(response, page["next_cursor"])
+        return json_response(page["items"], response)
+
+    async def load():
+        result = await db.execute(query)
+        competitions = result.scalars().all()
+        return [_summary(c) for c in competitions]
+
+    competitions = await cache.get_or_set("competitions", f"list:{skip}:{limit}", load)
+    return json_response(competitions, response)
+
+
+@router.get("/{competition_id}", response_model=CompetitionSchema)
 async def get_competition(
     competition_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
 ):
     """获取赛事详情"""
-    result = await db.execute(
-        select(Competition).where(Competition.id == competition_id)
+    query = select(Competition).where(Competition.id == competition_id)
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(Competition, query),
+        await cache.version("competitions"),
     )
-    competition = result.scalar_one_or_none()
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        result = await db.execute(query)
+        competition = result.scalar_one_or_none()
+        if not competition:
+            return None
+        return CompetitionSchema.model_validate(competition).model_dump(mode="json")
+
+    competition = await cache.get_or_set("competitions", f"detail:{competition_id}", load)
     if not competition:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Competition not found",
         )
-    return {
-        "id": competition.id,
-        "name": competition.name,
-        "competition_type": competition.competition_type,
-        "season": competition.season,
-        "description": competition.description,
-        "start_date": competition.start_date,
-        "end_date": competition.end_date,
-        "rules": competition.rules,
-    }
-
-
-@router.post("", response_model=dict)
+    return json_response(competition, response)
+
+
+@router.post("", response_model=CompetitionSchema)
 async def create_competition(
-    data: dict,
-    current_user: User = Depends(get_current_user),
+    data: CompetitionCreate,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
 ):
     """创建赛事"""
     if not current_user.is_superuser:
@@ -75,14 +141,138 @@ async def create_competition(
             detail="Not enough permissions",
         )
 
-    competition = Competition(**data)
+    competition = Competition(**data.dict())
     db.add(competition)
     await db.commit()
     await db.refresh(competition)
-    
-    return {
-        "id": competition.id,
-        "name": competition.name,
-        "competition_type": competition.competition_type,
-        "season": competition.season,
-    }
+    await cache.invalidate("competitions")
+    return model_response(CompetitionSchema, competition)
+
+
+@router.get("/{competition_id}/standings", response_model=List[StandingSchema])
+async def get_standings(
+    competition_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """获取积分榜"""
+    scope = standings_service.cache_scope(competition_id)
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(Standing, select(Standing).where(Standing.competition_id == competition_id)),
+        await cache.version(standings_service.CACHE_RESOURCE, scope),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        standings = await standings_service.list_standings(db, competition_id)
+        return [StandingSchema.model_validate(s).model_dump(mode="json") for s in standings]
+
+    standings = await cache.get_or_set(
+        standings_service.CACHE_RESOURCE,
+        "list",
+        load,
+        scope=scope,
+    )
+    return json_response(standings, response)
+
+
+@router.post(
+    "/{competition_id}/standings/rebuild",
+    response_model=JobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rebuild_standings(
+    competition_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """以后台任务根据全部比赛记录重建积分榜，进度通过 GET /jobs/{id} 查询"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    params = StandingsRebuildParams(competition_id=competition_id)
+    return await submit_job(request, db, "standings.rebuild", params, current_user)
+
+
+@router.get("/{competition_id}/schedules", response_model=List[ScheduleSchema])
+async def list_schedules(
+    competition_id: int,
+    round_number: int = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取赛程"""
+    query = select(Schedule).where(Schedule.competition_id == competition_id)
+    if round_number:
+        query = query.where(Schedule.round_number == round_number)
+    result = await db.execute(query.order_by(Schedule.round_number, Schedule.id))
+    return model_response(List[ScheduleSchema], result.scalars().all())
+
+
+@router.post("/{competition_id}/schedules/generate", response_model=ScheduleGenerateResult)
+async def generate_schedules(
+    competition_id: int,
+    data: ScheduleGenerate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """按循环赛制生成赛程"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    result = await db.execute(
+        select(Competition).where(Competition.id == competition_id)
+    )
+    competition = result.scalar_one_or_none()
+    if not competition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Competition not found",
+        )
+
+    try:
+        rounds, fixtures = await fixtures_service.generate_schedule(
+            db,
+            competition,
+            data.team_ids,
+            data.start_date,
+            double_round=data.double_round,
+            interval_days=data.interval_days,
+            excluded_dates=data.excluded_dates,
+            match_time=data.match_time,
+            replace_existing=data.replace_existing,
+        )
+        await db.commit()
+    except fixtures_service.ScheduleExistsError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        )
+    except fixtures_service.FixtureError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except IntegrityError:
+        # 并发生成时另一个请求先写入了赛程
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Competition already has a schedule",
+        )
+
+    return {"competition_id": competition_id, "rounds": rounds, "fixtures": fixtures}
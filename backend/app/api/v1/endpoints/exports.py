@@ -0,0 +1,58 @@
+"""报表导出接口"""
+from typing import Literal
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.core.principals import Principal
+from app.db import get_read_db
+from app.services import exports as exports_service
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+ExportFormat = Literal["csv", "ndjson", "xlsx"]
+
+
+def _response(db: AsyncSession, query, fmt: str, name: str) -> StreamingResponse:
+    media_type, extension = exports_service.FORMATS[fmt]
+    return StreamingResponse(
+        exports_service.stream(db, query, fmt, name),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.get("/players")
+async def export_players(
+    format: ExportFormat = "csv",
+    team_id: int = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """导出球员名单"""
+    return _response(db, exports_service.players_query(team_id), format, "players")
+
+
+@router.get("/statistics")
+async def export_statistics(
+    format: ExportFormat = "csv",
+    season: str = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """导出球员赛季统计"""
+    return _response(db, exports_service.statistics_query(season), format, "statistics")
+
+
+@router.get("/competitions/{competition_id}/standings")
+async def export_standings(
+    competition_id: int,
+    format: ExportFormat = "csv",
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """导出赛事积分榜"""
+    return _response(
+        db, exports_service.standings_query(competition_id), format, "standings"
+    )
@@ -0,0 +1,118 @@
+"""后台任务接口：提交任务、查询状态和进度、下载文件结果"""
+import os
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.api.responses import model_response
+from app.core.principals import Principal
+from app.db import get_db, get_read_db
+from app.schemas import Job as JobSchema, JobCreate
+from app.services import jobs as jobs_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+async def submit_job(
+    request: Request, db: AsyncSession, name: str, params, current_user: Principal
+):
+    """提交任务并返回 202，Location 指向任务状态"""
+    try:
+        job = await jobs_service.submit(db, name, params, current_user.id)
+    except jobs_service.JobQueueError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue unavailable",
+        )
+    response = model_response(JobSchema, job, status_code=status.HTTP_202_ACCEPTED)
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job.id))
+    return response
+
+
+async def _visible_job(db: AsyncSession, job_id: str, current_user: Principal):
+    # 非本人提交的任务对普通用户按不存在处理
+    job = await jobs_service.get_job(db, job_id)
+    if not job or (job.created_by != current_user.id and not current_user.is_superuser):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.post("", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job_in: JobCreate,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """提交后台任务，立即返回；通过 GET /jobs/{id} 查询进度和结果"""
+    definition = jobs_service.JOB_TYPES.get(job_in.name)
+    if definition is None or not definition.public:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown job type",
+        )
+    if definition.superuser_only and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    try:
+        params = jobs_service.validate_params(job_in.name, job_in.params)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.errors(include_url=False, include_context=False),
+        )
+    return await submit_job(request, db, job_in.name, params, current_user)
+
+
+@router.get("", response_model=List[JobSchema])
+async def list_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """当前用户提交的任务，按提交时间倒序"""
+    jobs = await jobs_service.list_jobs(db, current_user.id, skip, limit)
+    return model_response(List[JobSchema], jobs)
+
+
+@router.get("/{job_id}", response_model=JobSchema)
+async def get_job(
+    job_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """任务状态、进度和结果（读主库，避免从库延迟导致状态回退）"""
+    job = await _visible_job(db, job_id, current_user)
+    return model_response(JobSchema, job)
+
+
+@router.get("/{job_id}/download")
+async def download_job_result(
+    job_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """下载任务生成的文件（如报表）"""
+    job = await _visible_job(db, job_id, current_user)
+    path = jobs_service.result_path(job)
+    if job.status != jobs_service.JOB_SUCCEEDED or not path or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job result not available",
+        )
+    return FileResponse(
+        path,
+        media_type=job.result.get("media_type"),
+        filename=job.result.get("download_name") or os.path.basename(path),
+    )
@@ -0,0 +1,299 @@
+"""比赛记录接口"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import check_not_modified, row_sources
+from app.api.dependencies import get_current_user
+from app.api.responses import model_response
+from app.core.cache import Cache, get_cache
+from app.core.config import settings
+from app.core.principals import Principal
+from app.db import get_db, get_read_db
+from app.models import MatchRecord, Schedule
+from app.schemas import (
+    MatchEvent as MatchEventSchema,
+    MatchEventCreate,
+    MatchRecord as MatchRecordSchema,
+    MatchRecordCreate,
+    MatchRecordUpdate,
+)
+from app.services import analytics as analytics_service
+from app.services import match_events as match_events_service
+from app.services import player_stats as player_stats_service
+from app.services import standings as standings_service
+from app.services.live import live_hub, match_payload
+from app.services.standings import MatchSnapshot
+
+router = APIRouter(prefix="/matches", tags=["matches"])
+
+
+async def _check_references(db: AsyncSession, events: List[dict]) -> None:
+    """事件引用的球员和球队必须存在，否则写入事件和统计时触发外键错误"""
+    missing = await player_stats_service.unknown_players(db, events)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Players not found: {missing}",
+        )
+    missing = await match_events_service.unknown_teams(db, events)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Teams not found: {missing}",
+        )
+
+
+@router.get("/events", response_model=List[MatchEventSchema])
+async def search_events(
+    event_type: str = None,
+    player_id: int = None,
+    team_id: int = None,
+    competition_id: int = None,
+    round_number: int = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """按事件类型、球员、球队、赛事或轮次查询比赛事件"""
+    events = await match_events_service.query_events(
+        db,
+        event_type=event_type,
+        player_id=player_id,
+        team_id=team_id,
+        competition_id=competition_id,
+        round_number=round_number,
+        skip=skip,
+        limit=limit,
+    )
+    return model_response(List[MatchEventSchema], events)
+
+
+@router.get("/{match_id}", response_model=MatchRecordSchema)
+async def get_match(
+    match_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取比赛记录"""
+    query = select(MatchRecord).where(MatchRecord.id == match_id)
+    not_modified = await check_not_modified(
+        request, response, db, row_sources(MatchRecord, query)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    result = await db.execute(query)
+    match = result.scalar_one_or_none()
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found",
+        )
+    return model_response(MatchRecordSchema, match, response)
+
+
+@router.post("", response_model=MatchRecordSchema)
+async def create_match(
+    match_data: MatchRecordCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """创建比赛记录，并同步更新积分榜、球员统计和球队赛果时间线"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    result = await db.execute(select(Schedule).where(Schedule.id == match_data.schedule_id))
+    schedule = result.scalar_one_or_none()
+    if schedule is None or schedule.competition_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Schedule not found",
+        )
+    # 积分榜增量按比赛记录中的球队计入，必须与赛程一致
+    if (match_data.home_team_id, match_data.away_team_id) != (
+        schedule.home_team_id,
+        schedule.away_team_id,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Match teams do not match the schedule",
+        )
+    competition_id = schedule.competition_id
+
+    # 每个赛程只有一条比赛记录（match_record.schedule_id 唯一）
+    result = await db.execute(
+        select(MatchRecord.id).where(MatchRecord.schedule_id == match_data.schedule_id)
+    )
+    if result.scalar_one_or_none() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Match record already exists for this schedule",
+        )
+
+    events = player_stats_service.parse_events(match_data.event_details)
+    await _check_references(db, events)
+
+    match = MatchRecord(**match_data.dict())
+    db.add(match)
+    await db.flush()
+    await standings_service.apply_match_change(
+        db, competition_id, None, MatchSnapshot.of(match)
+    )
+    timeline_changed = await analytics_service.sync_match(db, match, competition_id, None)
+    await match_events_service.replace_events(db, match, events)
+    season = await player_stats_service.get_season(db, match.schedule_id)
+    if season is not None:
+        await player_stats_service.apply_match_events(
+            db, season, [], None, events, match.status
+        )
+    await db.commit()
+    await db.refresh(match)
+    if competition_id is not None:
+        await standings_service.invalidate(cache, competition_id)
+    if timeline_changed:
+        await analytics_service.invalidate(cache, competition_id)
+    await live_hub.publish(match.id, match_payload(match))
+    return model_response(MatchRecordSchema, match)
+
+
+@router.put("/{match_id}", response_model=MatchRecordSchema)
+async def update_match(
+    match_id: int,
+    match_data: MatchRecordUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """更新比分、事件或比赛状态（含完赛），并同步更新积分榜、球员统计和球队赛果时间线"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    result = await db.execute(
+        select(MatchRecord).where(MatchRecord.id == match_id)
+    )
+    match = result.scalar_one_or_none()
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found",
+        )
+
+    update_data = match_data.dict(exclude_unset=True)
+    if "event_details" in update_data:
+        events = player_stats_service.parse_events(update_data["event_details"])
+        await _check_references(db, events)
+
+    before = MatchSnapshot.of(match)
+    before_events = player_stats_service.parse_events(match.event_details)
+    before_status = match.status
+    for field, value in update_data.items():
+        setattr(match, field, value)
+    if "event_details" in update_data:
+        await match_events_service.replace_events(db, match, events)
+
+    competition_id = await standings_service.get_competition_id(db, match.schedule_id)
+    if competition_id is not None:
+        await standings_service.apply_match_change(
+            db, competition_id, before, MatchSnapshot.of(match)
+        )
+    timeline_changed = await analytics_service.sync_match(db, match, competition_id, before)
+    season = await player_stats_service.get_season(db, match.schedule_id)
+    if season is not None:
+        after_events = events if "event_details" in update_data else before_events
+        await player_stats_service.apply_match_events(
+            db, season, before_events, before_status, after_events, match.status
+        )
+    await db.commit()
+    await db.refresh(match)
+    if competition_id is not None:
+        await standings_service.invalidate(cache, competition_id)
+    if timeline_changed:
+        await analytics_service.invalidate(cache, competition_id)
+    await live_hub.publish(match.id, match_payload(match))
+    return model_response(MatchRecordSchema, match)
+
+
+@router.get("/{match_id}/events", response_model=List[MatchEventSchema])
+async def list_match_events(
+    match_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取一场比赛的事件"""
+    events = await match_events_service.query_events(db, match_id=match_id, limit=1000)
+    return model_response(List[MatchEventSchema], events)
+
+
+@router.post("/{match_id}/events", response_model=List[MatchEventSchema])
+async def append_match_events(
+    match_id: int,
+    events: List[MatchEventCreate],
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """追加比赛事件，已完赛的比赛同步更新球员统计"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    result = await db.execute(
+        select(MatchRecord).where(MatchRecord.id == match_id)
+    )
+    match = result.scalar_one_or_none()
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found",
+        )
+
+    new_events = [event.dict(exclude_none=True) for event in events]
+    await _check_references(db, new_events)
+
+    await match_events_service.append_events(db, match, new_events)
+    season = await player_stats_service.get_season(db, match.schedule_id)
+    if season is not None:
+        # 状态不变时统计的变化就是新增事件的贡献
+        await player_stats_service.apply_match_events(
+            db, season, [], match.status, new_events, match.status
+        )
+    await db.commit()
+    await db.refresh(match)
+    await live_hub.publish(match.id, match_payload(match, new_events))
+    events = await match_events_service.query_events(db, match_id=match_id, limit=1000)
+    return model_response(List[MatchEventSchema], events)
+
+
+@router.get("/{match_id}/live")
+async def stream_match_updates(match_id: int, request: Request):
+    """以 Server-Sent Events 推送比赛更新（WebSocket 不可用时使用）"""
+
+    async def events():
+        subscriber = live_hub.subscribe(match_id)
+        try:
+            await live_hub.send_current_state(match_id, subscriber)
+            while not await request.is_disconnected():
+                message = await subscriber.next(timeout=settings.LIVE_KEEPALIVE_SECONDS)
+                if message is None:
+                    yield b": keepalive\n\n"
+                    continue
+                yield f"data: {message}\n\n".encode("utf-8")
+        finally:
+            live_hub.unsubscribe(match_id, subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,60 +1,134 @@
 """球员管理接口"""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+import os
+import shutil
+import uuid
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified, row_sources
 from app.api.dependencies import get_current_user
-from app.db import get_db
-from app.models import Player, User
-from app.schemas import Player as PlayerSchema, PlayerCreate, PlayerUpdate
+from app.api.pagination import keyset_query, resolve_sort, set_next_cursor, split_page
+from app.api.responses import model_response
+from app.api.v1.endpoints.jobs import submit_job
+from app.core.config import settings
+from app.core.principals import Principal
+from app.db import get_db, get_read_db, loader_options
+from app.db.loaders import collapsed_fields, parse_expand
+from app.models import Player
+from app.schemas import Job as JobSchema
+from app.schemas import Player as PlayerSchema, PlayerCreate, PlayerImportResult, PlayerUpdate
+from app.schemas.job import PlayerImportParams, StatisticsRebuildParams
+from app.services import player_import
+from app.services import player_stats as player_stats_service
 
 router = APIRouter(prefix="/players", tags=["players"])
 
+# 游标分页允许的排序列
+SORT_FIELDS = ("name",)
+
+
+async def _get_player(db: AsyncSession, player_id: int, expand: Optional[str] = None):
+    result = await db.execute(
+        select(Player)
+        .where(Player.id == player_id)
+        .options(*loader_options(Player, PlayerSchema, expand))
+    )
+    return result.scalar_one_or_none()
+
 
 @router.get("", response_model=List[PlayerSchema])
 async def list_players(
+    request: Request,
+    response: Response,
     team_id: int = None,
     position: str = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    expand: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """获取球员列表"""
-    query = select(Player)
-    
+    """获取球员列表
+
+    expand 指定要展开的嵌套字段（逗号分隔，none 表示不展开），未展开的字段不出现在响应中；
+    传入 cursor 时使用游标分页，下一页游标见 X-Next-Cursor 响应头。
+    """
+    criteria = []
     if team_id:
-        query = query.where(Player.team_id == team_id)
+        criteria.append(Player.team_id == team_id)
     if position:
-        query = query.where(Player.position == position)
-    
-    result = await db.execute(query.offset(skip).limit(limit))
+        criteria.append(Player.position == position)
+
+    query = select(Player).where(*criteria)
+    if cursor is not None:
+        sort = resolve_sort(Player, sort, SORT_FIELDS)
+        page = keyset_query(query, Player, sort, cursor, limit)
+    else:
+        page = query.offset(skip).limit(limit)
+
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(Player, page, parse_expand(expand, Player, PlayerSchema)),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    result = await db.execute(page.options(*loader_options(Player, PlayerSchema, expand)))
     players = result.scalars().all()
-    return players
+    if cursor is not None:
+        players, next_cursor = split_page(players, sort, limit)
+        set_next_cursor(response, next_cursor)
+    # 未展开的关系不输出，避免与空列表混淆
+    exclude = collapsed_fields(Player, PlayerSchema, expand)
+    return model_response(List[PlayerSchema], players, response, exclude=exclude)
 
 
 @router.get("/{player_id}", response_model=PlayerSchema)
 async def get_player(
     player_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """获取球员详情"""
-    result = await db.execute(
-        select(Player).where(Player.id == player_id)
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(
+            Player,
+            select(Player).where(Player.id == player_id),
+            parse_expand(expand, Player, PlayerSchema),
+        ),
     )
-    player = result.scalar_one_or_none()
+    if not_modified is not None:
+        return not_modified
+
+    player = await _get_player(db, player_id, expand)
     if not player:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Player not found",
         )
-    return player
+    return model_response(
+        PlayerSchema,
+        player,
+        response,
+        exclude=collapsed_fields(Player, PlayerSchema, expand),
+    )
 
 
 @router.post("", response_model=PlayerSchema)
 async def create_player(
     player_data: PlayerCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """创建球员"""
@@ -67,15 +141,113 @@ async def create_player(
     player = Player(**player_data.dict())
     db.add(player)
     await db.commit()
-    await db.refresh(player)
-    return player
+    return model_response(PlayerSchema, await _get_player(db, player.id))
+
+
+@router.post("/bulk", response_model=PlayerImportResult)
+async def bulk_import_players(
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """批量导入球员（CSV 或 XLSX，首行为字段名）"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    # 上传大小由 BodySizeLimitMiddleware 在读取请求体时限制
+    try:
+        rows = await run_in_threadpool(player_import.iter_rows, file.file, file.filename)
+    except player_import.UnsupportedFileType:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV and XLSX files are supported",
+        )
+    except player_import.InvalidImportFile as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    report = await player_import.import_players(db, rows)
+    return report.to_dict()
+
+
+@router.post("/bulk/jobs", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def bulk_import_players_job(
+    request: Request,
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """以后台任务批量导入球员，上传完成即返回任务，进度通过 GET /jobs/{id} 查询"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    name = (file.filename or "").lower()
+    if not name.endswith(player_import.CSV_EXTENSIONS + player_import.XLSX_EXTENSIONS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV and XLSX files are supported",
+        )
+
+    # worker 从共享的上传目录读取文件，导入结束后删除
+    folder = os.path.join(settings.UPLOAD_FOLDER, "imports")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, uuid.uuid4().hex + os.path.splitext(name)[1])
+
+    def save():
+        with open(path, "wb") as output:
+            shutil.copyfileobj(file.file, output)
+
+    await run_in_threadpool(save)
+    try:
+        await run_in_threadpool(player_import.check_file, path, file.filename)
+    except player_import.InvalidImportFile as exc:
+        os.remove(path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    params = PlayerImportParams(path=os.path.abspath(path), filename=file.filename)
+    try:
+        return await submit_job(request, db, "players.import", params, current_user)
+    except HTTPException:
+        os.remove(path)
+        raise
+
+
+@router.post(
+    "/statistics/rebuild", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED
+)
+async def rebuild_statistics(
+    season: str,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """以后台任务根据赛季全部比赛事件重建球员统计，进度通过 GET /jobs/{id} 查询"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    params = StatisticsRebuildParams(season=season)
+    return await submit_job(request, db, "statistics.rebuild", params, current_user)
 
 
 @router.put("/{player_id}", response_model=PlayerSchema)
 async def update_player(
     player_id: int,
     player_data: PlayerUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """更新球员"""
@@ -100,14 +272,13 @@ async def update_player(
         setattr(player, field, value)
 
     await db.commit()
-    await db.refresh(player)
-    return player
+    return model_response(PlayerSchema, await _get_player(db, player.id))
 
 
 @router.delete("/{player_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_player(
     player_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """删除球员"""
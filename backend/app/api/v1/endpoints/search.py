@@ -0,0 +1,33 @@
+"""搜索接口"""
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_db
+from app.schemas import SearchResult
+from app.services import search as search_service
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResult)
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Literal["all", "player", "team"] = "all",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """按名称、国籍、简介搜索球员和球队，结果按相关度排序
+
+    MySQL 下每个词至少 2 个字符时使用全文索引。查询词更短或使用其他数据库时只按
+    名称匹配（第一个词为名称前缀，其余词为名称中任意位置），不搜索国籍、简介，
+    结果按名称排序，score 固定为 1。
+    """
+    players = []
+    teams = []
+    if type in ("all", "player"):
+        players = await search_service.search_players(db, q, skip, limit)
+    if type in ("all", "team"):
+        teams = await search_service.search_teams(db, q, skip, limit)
+    return {"query": q, "players": players, "teams": teams}
@@ -1,54 +1,155 @@
 """球队管理接口"""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import check_not_modified, row_sources
 from app.api.dependencies import get_current_user
-from app.db import get_db
-from app.models import Team, User
+from app.api.pagination import keyset_query, resolve_sort, set_next_cursor, split_page
+from app.api.responses import json_response, model_response
+from app.core.cache import Cache, get_cache
+from app.core.principals import Principal
+from app.db import get_db, get_read_db, loader_options
+from app.db.loaders import collapsed_fields, parse_expand
+from app.models import Team
 from app.schemas import Team as TeamSchema, TeamCreate, TeamUpdate
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
+# 游标分页允许的排序列
+SORT_FIELDS = ("name",)
+
+
+async def _get_team(db: AsyncSession, team_id: int, expand: Optional[str] = None):
+    result = await db.execute(
+        select(Team)
+        .where(Team.id == team_id)
+        .options(*loader_options(Team, TeamSchema, expand))
+    )
+    return result.scalar_one_or_none()
+
+
+def _expand_key(expand: Optional[str]) -> str:
+    return ",".join(sorted(parse_expand(expand, Team, TeamSchema)))
+
+
+def _dump(team: Team, expand: Optional[str]) -> dict:
+    # 未展开的关系不输出，避免与空列表混淆
+    return TeamSchema.model_validate(team).model_dump(
+        mode="json", exclude=collapsed_fields(Team, TeamSchema, expand)
+    )
+
 
 @router.get("", response_model=List[TeamSchema])
 async def list_teams(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    expand: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
 ):
-    """获取球队列表"""
-    result = await db.execute(
-        select(Team).offset(skip).limit(limit)
+    """获取球队列表
+
+    expand 指定要展开的嵌套字段（逗号分隔，none 表示不展开），未展开的字段不出现在响应中；
+    传入 cursor 时使用游标分页，下一页游标见 X-Next-Cursor 响应头。
+    """
+    if cursor is not None:
+        sort = resolve_sort(Team, sort, SORT_FIELDS)
+        page = keyset_query(select(Team), Team, sort, cursor, limit)
+    else:
+        page = select(Team).offset(skip).limit(limit)
+
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(Team, page, parse_expand(expand, Team, TeamSchema)),
+        await cache.version("teams"),
     )
-    teams = result.scalars().all()
-    return teams
+    if not_modified is not None:
+        return not_modified
+
+    query = page.options(*loader_options(Team, TeamSchema, expand))
+
+    if cursor is not None:
+
+        async def load_page():
+            result = await db.execute(query)
+            teams, next_cursor = split_page(result.scalars().all(), sort, limit)
+            return {
+                "items": [_dump(t, expand) for t in teams],
+                "next_cursor": next_cursor,
+            }
+
+        cached = await cache.get_or_set(
+            "teams", f"cursor:{sort}:{cursor}:{limit}:{_expand_key(expand)}", load_page
+        )
+        set_next_cursor(response, cached["next_cursor"])
+        return json_response(cached["items"], response)
+
+    async def load():
+        result = await db.execute(query)
+        teams = result.scalars().all()
+        return [_dump(t, expand) for t in teams]
+
+    teams = await cache.get_or_set(
+        "teams", f"list:{skip}:{limit}:{_expand_key(expand)}", load
+    )
+    return json_response(teams, response)
 
 
 @router.get("/{team_id}", response_model=TeamSchema)
 async def get_team(
     team_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
 ):
     """获取球队详情"""
-    result = await db.execute(
-        select(Team).where(Team.id == team_id)
+    not_modified = await check_not_modified(
+        request,
+        response,
+        db,
+        row_sources(
+            Team,
+            select(Team).where(Team.id == team_id),
+            parse_expand(expand, Team, TeamSchema),
+        ),
+        await cache.version("teams"),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    async def load():
+        team = await _get_team(db, team_id, expand)
+        if not team:
+            return None
+        return _dump(team, expand)
+
+    team = await cache.get_or_set(
+        "teams", f"detail:{team_id}:{_expand_key(expand)}", load
     )
-    team = result.scalar_one_or_none()
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team not found",
         )
-    return team
+    return json_response(team, response)
 
 
 @router.post("", response_model=TeamSchema)
 async def create_team(
     team_data: TeamCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
 ):
     """创建球队"""
     if not current_user.is_superuser:
@@ -70,16 +171,17 @@ async def create_team(
     team = Team(**team_data.dict())
     db.add(team)
     await db.commit()
-    await db.refresh(team)
-    return team
+    await cache.invalidate("teams")
+    return model_response(TeamSchema, await _get_team(db, team.id))
 
 
 @router.put("/{team_id}", response_model=TeamSchema)
 async def update_team(
     team_id: int,
     team_data: TeamUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
 ):
     """更新球队"""
     if not current_user.is_superuser:
@@ -103,15 +205,16 @@ async def update_team(
         setattr(team, field, value)
 
     await db.commit()
-    await db.refresh(team)
-    return team
+    await cache.invalidate("teams")
+    return model_response(TeamSchema, await _get_team(db, team.id))
 
 
 @router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_team(
     team_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
 ):
     """删除球队"""
     if not current_user.is_superuser:
@@ -132,3 +235,4 @@ async def delete_team(
 
     await db.delete(team)
     await db.commit()
+    await cache.invalidate("teams")
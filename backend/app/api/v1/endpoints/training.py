@@ -0,0 +1,398 @@
+"""训练管理接口：训练计划、训练记录和出勤/表现看板"""
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.api.responses import json_response, model_response
+from app.api.v1.endpoints.jobs import submit_job
+from app.core.cache import Cache, get_cache
+from app.core.principals import Principal
+from app.db import get_db, get_read_db
+from app.models import Player, Team, TrainingPlan, TrainingRecord
+from app.schemas import (
+    Job as JobSchema,
+    PlayerTrainingDashboard,
+    TeamTrainingDashboard,
+    TrainingPlan as TrainingPlanSchema,
+    TrainingPlanCreate,
+    TrainingPlanUpdate,
+    TrainingRecord as TrainingRecordSchema,
+    TrainingRecordCreate,
+    TrainingRecordUpdate,
+)
+from app.schemas.job import TrainingSummaryRebuildParams
+from app.services import training as training_service
+from app.services.training import CACHE_RESOURCE, RecordSnapshot
+
+router = APIRouter(prefix="/training", tags=["training"])
+
+
+async def _get_plan(db: AsyncSession, plan_id: int) -> TrainingPlan:
+    result = await db.execute(select(TrainingPlan).where(TrainingPlan.id == plan_id))
+    plan = result.scalar_one_or_none()
+    if not plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training plan not found",
+        )
+    return plan
+
+
+async def _check_team(db: AsyncSession, team_id: int) -> None:
+    result = await db.execute(select(Team.id).where(Team.id == team_id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found",
+        )
+
+
+def _date_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """看板统计区间，默认截至今天的最近 DEFAULT_RANGE_DAYS 天"""
+    end = end or date.today()
+    start = start or end - timedelta(days=training_service.DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days >= training_service.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {training_service.MAX_RANGE_DAYS} days",
+        )
+    return start, end
+
+
+@router.get("/plans", response_model=List[TrainingPlanSchema])
+async def list_plans(
+    team_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取训练计划，可按球队和日期区间筛选"""
+    query = select(TrainingPlan)
+    if team_id is not None:
+        query = query.where(TrainingPlan.team_id == team_id)
+    if start is not None:
+        query = query.where(TrainingPlan.scheduled_date >= start)
+    if end is not None:
+        query = query.where(TrainingPlan.scheduled_date <= end)
+    result = await db.execute(
+        query.order_by(TrainingPlan.scheduled_date.desc(), TrainingPlan.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return model_response(List[TrainingPlanSchema], result.scalars().all())
+
+
+@router.post("/plans", response_model=TrainingPlanSchema)
+async def create_plan(
+    plan_data: TrainingPlanCreate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """创建训练计划，未指定教练时为当前用户"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    await _check_team(db, plan_data.team_id)
+
+    plan = TrainingPlan(**plan_data.dict())
+    if plan.coach_id is None:
+        plan.coach_id = current_user.id
+    db.add(plan)
+    await db.commit()
+    await db.refresh(plan)
+    return model_response(TrainingPlanSchema, plan)
+
+
+@router.get("/plans/{plan_id}", response_model=TrainingPlanSchema)
+async def get_plan(
+    plan_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取训练计划"""
+    plan = await _get_plan(db, plan_id)
+    return model_response(TrainingPlanSchema, plan)
+
+
+@router.put("/plans/{plan_id}", response_model=TrainingPlanSchema)
+async def update_plan(
+    plan_id: int,
+    plan_data: TrainingPlanUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """更新训练计划；改期或换队时把该计划的记录移到新的日期和球队下汇总"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    plan = await _get_plan(db, plan_id)
+
+    update_data = plan_data.dict(exclude_unset=True)
+    if update_data.get("team_id") is not None:
+        await _check_team(db, update_data["team_id"])
+    before = await training_service.plan_snapshots(db, plan)
+    for field, value in update_data.items():
+        setattr(plan, field, value)
+    changed = await training_service.apply_changes(
+        db, before, training_service.move_snapshots(before, plan)
+    )
+    await db.commit()
+    await db.refresh(plan)
+    if changed:
+        await cache.invalidate(CACHE_RESOURCE)
+    return model_response(TrainingPlanSchema, plan)
+
+
+@router.delete("/plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_plan(
+    plan_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """删除训练计划及其记录"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    plan = await _get_plan(db, plan_id)
+
+    changed = await training_service.apply_changes(
+        db, await training_service.plan_snapshots(db, plan), []
+    )
+    await db.delete(plan)
+    await db.commit()
+    if changed:
+        await cache.invalidate(CACHE_RESOURCE)
+
+
+@router.get("/plans/{plan_id}/records", response_model=List[TrainingRecordSchema])
+async def list_records(
+    plan_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """获取一次训练的全部记录"""
+    await _get_plan(db, plan_id)
+    result = await db.execute(
+        select(TrainingRecord)
+        .where(TrainingRecord.training_plan_id == plan_id)
+        .order_by(TrainingRecord.player_id)
+    )
+    return model_response(List[TrainingRecordSchema], result.scalars().all())
+
+
+@router.post("/plans/{plan_id}/records", response_model=List[TrainingRecordSchema])
+async def save_records(
+    plan_id: int,
+    records: List[TrainingRecordCreate],
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """登记一次训练的出勤和表现，已有记录的球员按新数据覆盖"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    plan = await _get_plan(db, plan_id)
+
+    player_ids = {record.player_id for record in records}
+    if len(player_ids) != len(records):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate player_id in records",
+        )
+    result = await db.execute(select(Player.id).where(Player.id.in_(player_ids)))
+    missing = player_ids - set(result.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Player not found: {', '.join(map(str, sorted(missing)))}",
+        )
+
+    result = await db.execute(
+        select(TrainingRecord).where(
+            TrainingRecord.training_plan_id == plan_id,
+            TrainingRecord.player_id.in_(player_ids),
+        )
+    )
+    existing = {record.player_id: record for record in result.scalars().all()}
+    before, after, saved = [], [], []
+    for data in records:
+        record = existing.get(data.player_id)
+        if record is None:
+            record = TrainingRecord(training_plan_id=plan_id)
+            db.add(record)
+        else:
+            before.append(RecordSnapshot.of(record, plan))
+        for field, value in data.dict().items():
+            setattr(record, field, value)
+        after.append(RecordSnapshot.of(record, plan))
+        saved.append(record)
+
+    try:
+        changed = await training_service.apply_changes(db, before, after)
+        await db.commit()
+    except IntegrityError:
+        # 并发登记时另一个请求先为同一球员写入了记录
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Training records were modified concurrently, please retry",
+        )
+    for record in saved:
+        await db.refresh(record)
+    if changed:
+        await cache.invalidate(CACHE_RESOURCE)
+    return model_response(List[TrainingRecordSchema], saved)
+
+
+async def _get_record(db: AsyncSession, record_id: int) -> Tuple[TrainingRecord, TrainingPlan]:
+    result = await db.execute(
+        select(TrainingRecord, TrainingPlan)
+        .join(TrainingPlan, TrainingRecord.training_plan_id == TrainingPlan.id)
+        .where(TrainingRecord.id == record_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training record not found",
+        )
+    return row.TrainingRecord, row.TrainingPlan
+
+
+@router.put("/records/{record_id}", response_model=TrainingRecordSchema)
+async def update_record(
+    record_id: int,
+    record_data: TrainingRecordUpdate,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """更新训练记录"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    record, plan = await _get_record(db, record_id)
+
+    before = RecordSnapshot.of(record, plan)
+    for field, value in record_data.dict(exclude_unset=True).items():
+        setattr(record, field, value)
+    changed = await training_service.apply_changes(
+        db, [before], [RecordSnapshot.of(record, plan)]
+    )
+    await db.commit()
+    await db.refresh(record)
+    if changed:
+        await cache.invalidate(CACHE_RESOURCE)
+    return model_response(TrainingRecordSchema, record)
+
+
+@router.delete("/records/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_record(
+    record_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """删除训练记录"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    record, plan = await _get_record(db, record_id)
+
+    changed = await training_service.apply_changes(db, [RecordSnapshot.of(record, plan)], [])
+    await db.delete(record)
+    await db.commit()
+    if changed:
+        await cache.invalidate(CACHE_RESOURCE)
+
+
+@router.get("/dashboard/players/{player_id}", response_model=PlayerTrainingDashboard)
+async def get_player_dashboard(
+    player_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    window: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """球员出勤率、平均完成度和评分，以及 window 天滚动窗口的趋势"""
+    start, end = _date_range(start, end)
+
+    async def load():
+        return await training_service.player_dashboard(db, player_id, start, end, window)
+
+    data = await cache.get_or_set(
+        CACHE_RESOURCE, f"player:{player_id}:{start}:{end}:{window}", load
+    )
+    return json_response(data)
+
+
+@router.get("/dashboard/teams/{team_id}", response_model=TeamTrainingDashboard)
+async def get_team_dashboard(
+    team_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    window: int = Query(7, ge=1, le=90),
+    db: AsyncSession = Depends(get_read_db),
+    cache: Cache = Depends(get_cache),
+):
+    """球队整体和每名球员的出勤与表现，以及 window 天滚动窗口的趋势"""
+    start, end = _date_range(start, end)
+
+    async def load():
+        return await training_service.team_dashboard(db, team_id, start, end, window)
+
+    data = await cache.get_or_set(
+        CACHE_RESOURCE, f"team:{team_id}:{start}:{end}:{window}", load
+    )
+    return json_response(data)
+
+
+@router.post(
+    "/summary/rebuild", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED
+)
+async def rebuild_summary(
+    request: Request,
+    team_id: Optional[int] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """以后台任务根据训练记录重建每日汇总，用于数据修复"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    params = TrainingSummaryRebuildParams(team_id=team_id)
+    return await submit_job(request, db, "training.rebuild", params, current_user)
@@ -0,0 +1,50 @@
+"""实时推送接口"""
+import asyncio
+
+from fastapi import APIRouter, WebSocket
+
+from app.core.config import settings
+from app.services.live import Subscriber, live_hub
+
+router = APIRouter(tags=["live"])
+
+
+async def _send_updates(websocket: WebSocket, subscriber: Subscriber) -> None:
+    while True:
+        message = await subscriber.next(timeout=settings.LIVE_KEEPALIVE_SECONDS)
+        if message is None:
+            # 定期发送心跳，及时发现已断开的连接
+            await websocket.send_text('{"type":"ping"}')
+            continue
+        await websocket.send_text(message)
+
+
+async def _receive_until_closed(websocket: WebSocket) -> None:
+    """读取并丢弃客户端消息，收到关闭帧时返回
+
+    不读取时客户端的关闭帧和 pong 无人处理，断开的连接要等下一次发送失败才会发现。
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/ws/matches/{match_id}")
+async def match_updates(websocket: WebSocket, match_id: int):
+    """订阅比赛比分和事件更新"""
+    await websocket.accept()
+    subscriber = live_hub.subscribe(match_id)
+    try:
+        await live_hub.send_current_state(match_id, subscriber)
+        sender = asyncio.create_task(_send_updates(websocket, subscriber))
+        receiver = asyncio.create_task(_receive_until_closed(websocket))
+        try:
+            # 任一方结束（客户端关闭或发送失败）即结束连接
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            await asyncio.gather(sender, receiver, return_exceptions=True)
+    finally:
+        live_hub.unsubscribe(match_id, subscriber)
@@ -0,0 +1,183 @@
+"""Redis 读穿缓存
+
+接口按资源（competitions、standings、teams 等）选择性地接入缓存。键格式为
+``{前缀}:{资源}:v{资源版本}:{键}``，写操作通过递增资源版本使该资源的所有缓存
+一次性失效，旧键随 TTL 自然过期。资源可再按 scope（如赛事 ID）划分：键中
+同时带资源版本和 scope 版本，失效某个 scope 只影响该部分，失效整个资源则影响
+全部 scope。未配置 Redis 时使用进程内的 InMemoryRedis，
+测试环境也使用它代替真实的 Redis。
+"""
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRedis:
+    """进程内的 Redis 替身，实现缓存层用到的异步命令子集"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    def _alive(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        expires_at = item[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    async def get(self, key: str):
+        if not self._alive(key):
+            return None
+        return self._data[key][0]
+
+    async def mget(self, *keys: str):
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value, ex: Optional[int] = None):
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (value, expires_at)
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        expires_at = self._data[key][1] if key in self._data else None
+        self._data[key] = (str(value), expires_at)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    async def flushdb(self):
+        self._data.clear()
+        return True
+
+    async def close(self):
+        return None
+
+
+class Cache:
+    """带资源版本的读穿缓存"""
+
+    def __init__(self, client, prefix: str, default_ttl: int, ttls: Dict[str, int]):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.ttls = ttls
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, resource: str) -> int:
+        return self.ttls.get(resource, self.default_ttl)
+
+    def _namespace(self, resource: str, scope: Optional[str] = None) -> str:
+        if scope is None:
+            return f"{self.prefix}:{resource}"
+        return f"{self.prefix}:{resource}:{scope}"
+
+    def _version_key(self, resource: str, scope: Optional[str] = None) -> str:
+        return f"{self._namespace(resource, scope)}:version"
+
+    async def _versions(self, resource: str, scope: Optional[str] = None) -> str:
+        keys = [self._version_key(resource)]
+        if scope is not None:
+            keys.append(self._version_key(resource, scope))
+        values = await self.client.mget(*keys)
+        return ".".join(
+            value.decode() if isinstance(value, bytes) else (value or "0") for value in values
+        )
+
+    async def version(self, resource: str, scope: Optional[str] = None) -> str:
+        """资源（及 scope）的当前版本，用于条件请求；Redis 不可用时返回空串"""
+        try:
+            return await self._versions(resource, scope)
+        except Exception:
+            logger.warning("cache version read failed for %s", resource, exc_info=True)
+            return ""
+
+    async def make_key(self, resource: str, key: str, scope: Optional[str] = None) -> str:
+        version = await self._versions(resource, scope)
+        return f"{self._namespace(resource, scope)}:v{version}:{key}"
+
+    async def get_or_set(
+        self,
+        resource: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        scope: Optional[str] = None,
+    ) -> Any:
+        """读取缓存，未命中时调用 loader 并写回；loader 必须返回可 JSON 序列化的数据
+
+        Redis 不可用时直接回源，不影响接口可用性。
+        """
+        try:
+            full_key = await self.make_key(resource, key, scope)
+            raw = await self.client.get(full_key)
+        except Exception:
+            logger.warning("cache read failed for %s:%s", resource, key, exc_info=True)
+            metrics.CACHE_REQUESTS.labels(resource, "error").inc()
+            return await loader()
+
+        if raw is not None:
+            self.hits += 1
+            metrics.CACHE_REQUESTS.labels(resource, "hit").inc()
+            return json.loads(raw)
+
+        self.misses += 1
+        metrics.CACHE_REQUESTS.labels(resource, "miss").inc()
+        value = await loader()
+        try:
+            await self.client.set(full_key, json.dumps(value), ex=self.ttl_for(resource))
+        except Exception:
+            logger.warning("cache write failed for %s:%s", resource, key, exc_info=True)
+        return value
+
+    async def invalidate(self, *resources: str, scope: Optional[str] = None) -> None:
+        """递增资源版本，使该资源（指定 scope 时只是该 scope）下的所有缓存键失效"""
+        for resource in resources:
+            try:
+                await self.client.incr(self._version_key(resource, scope))
+            except Exception:
+                logger.warning("cache invalidation failed for %s", resource, exc_info=True)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def _create_client():
+    if not settings.REDIS_URL:
+        return InMemoryRedis()
+
+    from redis import asyncio as redis_asyncio
+
+    return redis_asyncio.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+def create_cache() -> Cache:
+    """按配置创建缓存实例；Redis 连接绑定创建时的事件循环，worker 中每个任务单独创建"""
+    return Cache(
+        _create_client(),
+        prefix=settings.CACHE_KEY_PREFIX,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        ttls=settings.CACHE_TTLS,
+    )
+
+
+cache = create_cache()
+
+
+def get_cache() -> Cache:
+    """获取缓存实例（依赖注入用，测试中可覆盖为使用 InMemoryRedis 的实例）"""
+    return cache
@@ -0,0 +1,31 @@
+"""Celery 应用
+
+broker 依次取 CELERY_BROKER_URL、REDIS_URL，都为空时使用本地 SQLite 文件（kombu
+的 SQLAlchemy 传输），单机开发只需另起一个 worker 进程。任务状态、进度和结果由
+任务自己写入 job 表，不使用 Celery 的结果后端。
+
+启动 worker（在 backend 目录下）：
+    celery -A app.core.celery_app worker --loglevel=info
+"""
+from celery import Celery
+
+from app.core.config import settings
+
+
+def broker_url() -> str:
+    return settings.CELERY_BROKER_URL or settings.REDIS_URL or settings.CELERY_SQLITE_BROKER
+
+
+celery_app = Celery("football", broker=broker_url(), include=["app.services.jobs"])
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    # 任务执行完才确认，worker 异常退出时由其他 worker 重新执行
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # 长任务不预取，避免排在忙碌 worker 后面
+    worker_prefetch_multiplier=1,
+    task_time_limit=settings.JOB_TIME_LIMIT,
+    broker_connection_retry_on_startup=True,
+)
@@ -0,0 +1,100 @@
+"""密码哈希工作池
+
+bcrypt 每次计算约 100-300 ms，直接在异步接口中调用会阻塞事件循环。这里把哈希与
+校验放到有界的线程池或进程池中执行：排队任务数超过上限时立即拒绝（由接口返回
+503），避免登录高峰拖垮同一进程中的其他接口。
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import hash_password, verify_password
+
+
+class HasherSaturated(Exception):
+    """密码哈希工作池已满"""
+
+
+class PasswordHasherPool:
+    """有界的密码哈希工作池"""
+
+    def __init__(self, workers: int, queue_size: int, mode: str = "thread"):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.mode = mode
+        self._executor: Optional[Executor] = None
+        self.pending = 0  # 排队和执行中的任务数
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            metrics.PASSWORD_HASH_REJECTED.inc()
+            raise HasherSaturated()
+
+        self.pending += 1
+        metrics.PASSWORD_HASH_PENDING.inc()
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.pending -= 1
+            metrics.PASSWORD_HASH_PENDING.dec()
+            metrics.PASSWORD_HASH_DURATION.observe(elapsed)
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """队列深度与耗时统计（耗时包含排队时间）"""
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "queue_depth": max(self.pending - self.workers, 0),
+            "in_flight": min(self.pending, self.workers),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+            "max_seconds": self.max_seconds,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    mode=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -0,0 +1,29 @@
+"""日志配置
+
+LOG_JSON 开启时根日志使用 python-json-logger 输出 JSON，每条日志一行，extra 中的
+字段（请求路径、耗时、SQL 统计等）成为独立的键，便于日志系统检索和聚合。
+"""
+import logging
+import sys
+
+from pythonjsonlogger import jsonlogger
+
+from app.core.config import settings
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+def configure_logging() -> None:
+    handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        handler.setFormatter(jsonlogger.JsonFormatter(LOG_FORMAT, json_ensure_ascii=False))
+    else:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # 连接池的 INFO 日志过多；DB_ECHO 开启时由 SQLAlchemy 自行输出 SQL
+    if not settings.DB_ECHO:
+        for name in ("sqlalchemy", "app.db.pool.InstrumentedPool"):
+            logging.getLogger(name).setLevel(logging.WARNING)
@@ -0,0 +1,219 @@
+"""认证用户缓存
+
+get_current_user 只需要用户的 id、激活状态、超级管理员标记和角色。这里把这些字段
+保存为精简的 Principal 快照，先查进程内 LRU，再查 Redis（可选），都未命中才查询
+数据库。用户或其角色在提交后会自动失效对应缓存；多进程部署下其他进程的本地缓存
+依赖较短的 TTL 过期。
+
+Redis 中的失效在 commit() 返回前完成（见 app.db.base.AppSession），提交之后的
+请求不会再从 Redis 读到旧快照。角色本身被修改时无法定位受影响的用户，改为递增
+Redis 中的代数键：每个条目记录写入时的代数，读取时与当前代数一同取回（MGET），
+代数不一致即视为未命中。
+
+开启 TOKEN_EMBED_CLAIMS 后，访问令牌中直接携带这些声明，校验权限无需访问数据库，
+代价是用户被禁用或降权后，已签发的令牌在过期前仍然有效。
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 写入令牌的声明名
+CLAIM_ACTIVE = "act"
+CLAIM_SUPERUSER = "su"
+CLAIM_ROLES = "roles"
+
+# 会话 info 中记录待失效用户的键
+CHANGED_USERS = "changed_user_ids"
+ROLES_CHANGED = "roles_changed"
+PENDING_USERS = "principal_pending_users"
+PENDING_CLEAR = "principal_pending_clear"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """当前用户的精简快照"""
+
+    id: int
+    username: str
+    is_active: bool
+    is_superuser: bool
+    roles: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            roles=tuple(sorted(role.name for role in user.roles)),
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> Optional["Principal"]:
+        """从令牌声明构造，令牌未携带声明时返回 None"""
+        if CLAIM_SUPERUSER not in payload:
+            return None
+        return cls(
+            id=int(payload["sub"]),
+            username=payload.get("username", ""),
+            is_active=bool(payload.get(CLAIM_ACTIVE, True)),
+            is_superuser=bool(payload[CLAIM_SUPERUSER]),
+            roles=tuple(payload.get(CLAIM_ROLES, ())),
+        )
+
+    def to_claims(self) -> dict:
+        return {
+            "username": self.username,
+            CLAIM_ACTIVE: self.is_active,
+            CLAIM_SUPERUSER: self.is_superuser,
+            CLAIM_ROLES: list(self.roles),
+        }
+
+
+class PrincipalCache:
+    """进程内 LRU + 可选 Redis 的两级缓存"""
+
+    def __init__(self, ttl: int, maxsize: int, use_redis: bool):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.use_redis = use_redis
+        self._local: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        # 本请求未命中时读到的 Redis 代数，set 时写入条目；查库期间角色被修改的话，
+        # 写入的条目代数已过期，不会被后续读取使用
+        self._generation: ContextVar[str] = ContextVar("principal_generation", default="0")
+
+    def _redis_key(self, user_id: int) -> str:
+        return f"{cache.prefix}:principal:{user_id}"
+
+    def _generation_key(self) -> str:
+        return f"{cache.prefix}:principal:generation"
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        item = self._local.get(user_id)
+        if item is not None:
+            principal, expires_at = item
+            if expires_at > time.monotonic():
+                self._local.move_to_end(user_id)
+                return principal
+            del self._local[user_id]
+
+        if not self.use_redis:
+            return None
+        try:
+            raw, generation = await cache.client.mget(
+                self._redis_key(user_id), self._generation_key()
+            )
+        except Exception:
+            logger.warning("principal cache read failed for %s", user_id, exc_info=True)
+            return None
+        generation = str(generation or "0")
+        self._generation.set(generation)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        if str(data.pop("generation", "0")) != generation:
+            return None
+        principal = Principal(**{**data, "roles": tuple(data["roles"])})
+        self._store_local(principal)
+        return principal
+
+    def _store_local(self, principal: Principal) -> None:
+        self._local[principal.id] = (principal, time.monotonic() + self.ttl)
+        self._local.move_to_end(principal.id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def set(self, principal: Principal) -> None:
+        self._store_local(principal)
+        if not self.use_redis:
+            return
+        data = {**asdict(principal), "generation": self._generation.get()}
+        try:
+            await cache.client.set(self._redis_key(principal.id), json.dumps(data), ex=self.ttl)
+        except Exception:
+            logger.warning("principal cache write failed for %s", principal.id, exc_info=True)
+
+    def drop_local(self, user_id: Optional[int] = None) -> None:
+        """只清除本进程的缓存（不指定用户时清空）"""
+        if user_id is None:
+            self._local.clear()
+        else:
+            self._local.pop(user_id, None)
+
+    async def invalidate(self, user_id: int) -> None:
+        self.drop_local(user_id)
+        if not self.use_redis:
+            return
+        try:
+            await cache.client.delete(self._redis_key(user_id))
+        except Exception:
+            logger.warning("principal cache invalidation failed for %s", user_id, exc_info=True)
+
+    async def clear(self) -> None:
+        """清空本地缓存，并递增代数使 Redis 中的全部条目失效"""
+        self.drop_local()
+        if not self.use_redis:
+            return
+        try:
+            await cache.client.incr(self._generation_key())
+        except Exception:
+            logger.warning("principal cache generation bump failed", exc_info=True)
+
+    async def apply_pending(self, info: dict) -> None:
+        """完成会话提交后记录的失效（由 AppSession.commit 调用）"""
+        if info.pop(PENDING_CLEAR, False):
+            await self.clear()
+        for user_id in info.pop(PENDING_USERS, ()):
+            await self.invalidate(user_id)
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    use_redis=settings.PRINCIPAL_CACHE_REDIS,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """记录本次事务中被修改或删除的用户（角色变更也会使用户变为 dirty）"""
+    from app.models import Role, User
+
+    changed = session.info.setdefault(CHANGED_USERS, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+        elif isinstance(obj, Role):
+            session.info[ROLES_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    # 事件回调是同步的：本地缓存立即失效，Redis 失效留给 AppSession.commit 等待完成
+    if session.info.pop(ROLES_CHANGED, False):
+        principal_cache.drop_local()
+        session.info[PENDING_CLEAR] = True
+    changed = session.info.pop(CHANGED_USERS, ())
+    for user_id in changed:
+        principal_cache.drop_local(user_id)
+    if changed:
+        session.info.setdefault(PENDING_USERS, set()).update(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop(CHANGED_USERS, None)
+    session.info.pop(ROLES_CHANGED, None)
@@ -1,4 +1,14 @@
 """数据库模块"""
-from app.db.base import Base, engine, AsyncSessionLocal, get_db
+from app.db.base import Base, engine, AsyncSessionLocal, get_db, get_pool_status
+from app.db.loaders import loader_options
+from app.db.replicas import get_read_db
 
-__all__ = ["Base", "engine", "AsyncSessionLocal", "get_db"]
+__all__ = [
+    "Base",
+    "engine",
+    "AsyncSessionLocal",
+    "get_db",
+    "get_read_db",
+    "get_pool_status",
+    "loader_options",
+]
@@ -3,23 +3,65 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.core.principals import principal_cache
+from app.db.pool import InstrumentedPool, instrument_pool, pool_status
+from app.db.profiling import install_query_hooks
 
 # 创建基类
 Base = declarative_base()
 
+
+
+def create_engine_for(url: str, name: str = "primary"):
+    """按统一的连接池配置创建异步引擎，返回引擎和连接池统计"""
+    db_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        pool_pre_ping=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    install_query_hooks(db_engine.sync_engine)
+    return db_engine, instrument_pool(db_engine.sync_engine.pool, name)
+
+
+def create_unpooled_engine(url: str):
+    """不使用连接池的异步引擎，用于每次在新事件循环中运行的 Celery 任务"""
+    db_engine = create_async_engine(url, echo=settings.DB_ECHO, future=True, poolclass=NullPool)
+    install_query_hooks(db_engine.sync_engine)
+    return db_engine
+
+
+class AppSession(AsyncSession):
+    """提交后等待认证用户缓存的 Redis 失效完成再返回"""
+
+    async def commit(self) -> None:
+        await super().commit()
+        await principal_cache.apply_pending(self.info)
+
+
+def create_session_factory(db_engine):
+    return sessionmaker(
+        db_engine, class_=AppSession, expire_on_commit=False, autoflush=False
+    )
+
+
 # 创建异步数据库引擎
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,
-)
+engine, pool_stats = create_engine_for(settings.DATABASE_URL)
 
 # 创建会话工厂
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
-)
+AsyncSessionLocal = create_session_factory(engine)
+
+
+def get_pool_status() -> dict:
+    """获取主库连接池状态"""
+    return pool_status(engine.sync_engine.pool, pool_stats)
 
 
 async def get_db():
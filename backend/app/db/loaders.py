@@ -0,0 +1,60 @@
+"""关系预加载策略
+
+根据响应模型中嵌套的关系字段为查询附加加载选项：集合关系使用 selectinload
+（每个关系固定一条 IN 查询），多对一关系使用 joinedload。未展开的关系使用
+noload，不会触发异步会话下的惰性加载；noload 的集合读出来是空列表，与"确实没有
+数据"无法区分，所以序列化时要用 collapsed_fields 把它们从响应中去掉。
+"""
+from typing import List, Optional, Set, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, noload, selectinload
+
+# expand 参数取这些值时不加载任何嵌套关系
+EXPAND_NONE = {"", "none"}
+
+
+def nested_fields(model: Type, schema: Type[BaseModel]) -> List[str]:
+    """返回响应模型中同时是 ORM 关系的字段"""
+    relationships = inspect(model).relationships
+    return [name for name in schema.model_fields if name in relationships]
+
+
+def parse_expand(
+    expand: Optional[str], model: Type, schema: Type[BaseModel]
+) -> Set[str]:
+    """解析逗号分隔的 expand 参数，未传时展开响应模型中的全部关系"""
+    available = nested_fields(model, schema)
+    if expand is None:
+        return set(available)
+    if expand.strip().lower() in EXPAND_NONE:
+        return set()
+    requested = {name.strip() for name in expand.split(",") if name.strip()}
+    return requested & set(available)
+
+
+def collapsed_fields(
+    model: Type, schema: Type[BaseModel], expand: Optional[str] = None
+) -> Set[str]:
+    """未展开的关系字段，序列化时作为 exclude 传入"""
+    return set(nested_fields(model, schema)) - parse_expand(expand, model, schema)
+
+
+def loader_options(
+    model: Type, schema: Type[BaseModel], expand: Optional[str] = None
+) -> list:
+    """为查询生成与响应模型匹配的加载选项"""
+    relationships = inspect(model).relationships
+    expanded = parse_expand(expand, model, schema)
+
+    options = []
+    for name in nested_fields(model, schema):
+        attr = getattr(model, name)
+        if name not in expanded:
+            options.append(noload(attr))
+        elif relationships[name].uselist:
+            options.append(selectinload(attr))
+        else:
+            options.append(joinedload(attr))
+    return options
@@ -0,0 +1,104 @@
+"""连接池统计
+
+通过连接池事件记录已检出连接数、溢出连接数、连接寿命，并在连接池子类中记录
+获取连接的等待时间，用于区分延迟来自连接池耗尽还是慢查询。同样的数据同步更新
+到 Prometheus 指标，按 database 标签区分主库和各只读副本。
+"""
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import metrics
+
+
+class PoolStats:
+    """连接池运行统计"""
+
+    def __init__(self, name: str = "primary"):
+        self.name = name
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connected_at = {}  # id(连接记录) -> 建立时间
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        metrics.DB_POOL_WAIT.labels(self.name).observe(seconds)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """记录获取连接等待时间的连接池"""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            self.stats.checkout_timeouts += 1
+            metrics.DB_POOL_TIMEOUTS.labels(self.stats.name).inc()
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+
+def instrument_pool(pool: InstrumentedPool, name: str = "primary") -> PoolStats:
+    """为连接池注册事件并返回其统计对象"""
+    stats = PoolStats(name)
+    pool.stats = stats
+    checked_out = metrics.DB_POOL_CHECKED_OUT.labels(name)
+    connections = metrics.DB_POOL_CONNECTIONS.labels(name)
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.connections_created += 1
+        stats.connected_at[id(connection_record)] = time.monotonic()
+        connections.inc()
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record):
+        stats.connections_closed += 1
+        stats.connected_at.pop(id(connection_record), None)
+        connections.dec()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    return stats
+
+
+def pool_status(pool, stats: PoolStats) -> dict:
+    """连接池当前状态"""
+    size = pool.size()
+    checked_out = pool.checkedout()
+    max_overflow = pool._max_overflow
+    capacity = size + max(max_overflow, 0)
+    now = time.monotonic()
+    ages = [now - connected_at for connected_at in stats.connected_at.values()]
+    return {
+        "pool_size": size,
+        "max_overflow": max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": checked_out / capacity if capacity else 0.0,
+        "connections_created": stats.connections_created,
+        "connections_closed": stats.connections_closed,
+        "checkouts": stats.checkouts,
+        "checkout_timeouts": stats.checkout_timeouts,
+        "wait_seconds_avg": stats.wait_seconds_total / stats.checkouts if stats.checkouts else 0.0,
+        "wait_seconds_max": stats.wait_seconds_max,
+        "connection_age_max": max(ages) if ages else 0.0,
+    }
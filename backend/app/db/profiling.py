@@ -0,0 +1,188 @@
+"""按请求统计 SQL
+
+在每个引擎上注册 before_cursor_execute / after_cursor_execute 事件，把语句数、
+数据库总耗时和最慢的几条语句记到当前请求的 QueryStats（通过 contextvars 传递）。
+QueryProfilingMiddleware 为每个请求建立统计，响应时写入 Server-Timing 头并输出
+一条结构化请求日志。
+
+超过 SLOW_QUERY_MS 的语句另外记录慢查询日志：SQL 中的字面量替换为 ?，IN 列表
+折叠，参数只记录类型不记录值。
+"""
+import contextvars
+import heapq
+import itertools
+import logging
+import re
+import time
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+request_logger = logging.getLogger("app.request")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# 日志中单条 SQL 的最大长度
+MAX_STATEMENT_LENGTH = 1000
+
+
+def normalize_sql(statement: str) -> str:
+    """去掉字面量并折叠 IN 列表和空白，使同类语句归一"""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    if len(sql) > MAX_STATEMENT_LENGTH:
+        sql = sql[:MAX_STATEMENT_LENGTH] + "..."
+    return sql
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """只保留参数的类型"""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class QueryStats:
+    """一个请求内的 SQL 统计"""
+
+    def __init__(self, path: str = "", top_n: int = 3):
+        self.path = path
+        self.count = 0
+        self.total_ms = 0.0
+        self.top_n = top_n
+        self._slowest: List[Tuple[float, int, str]] = []  # 小顶堆
+        self._sequence = itertools.count()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.top_n <= 0:
+            return
+        item = (elapsed_ms, next(self._sequence), statement)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, item)
+        elif elapsed_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self) -> List[dict]:
+        """按耗时降序的最慢语句（已归一化）"""
+        return [
+            {"ms": round(elapsed_ms, 2), "sql": normalize_sql(statement)}
+            for elapsed_ms, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # 同一连接上的语句依次执行，只需记录当前语句的开始时间
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "slow query",
+            extra={
+                "duration_ms": round(elapsed_ms, 2),
+                "statement": normalize_sql(statement),
+                "parameters": redact_parameters(parameters, executemany),
+                "path": stats.path if stats is not None else None,
+            },
+        )
+
+
+def _handle_error(context) -> None:
+    # 语句出错时不会触发 after_cursor_execute，丢弃对应的开始时间
+    if context.connection is not None:
+        context.connection.info.pop("query_started", None)
+
+
+def install_query_hooks(sync_engine) -> None:
+    """为引擎注册 SQL 计时事件"""
+    if not settings.SQL_PROFILING:
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def server_timing(stats: QueryStats, total_ms: float) -> str:
+    return (
+        f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries", '
+        f"total;dur={total_ms:.2f}"
+    )
+
+
+class QueryProfilingMiddleware:
+    """为每个 HTTP 请求统计 SQL，输出 Server-Timing 头和请求日志"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_PROFILING:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope["path"], settings.SQL_PROFILE_TOP_N)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", server_timing(stats, elapsed_ms).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if settings.REQUEST_LOG:
+                request_logger.info(
+                    "request",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                        "db_queries": stats.count,
+                        "db_ms": round(stats.total_ms, 2),
+                        "db_slowest": stats.slowest(),
+                    },
+                )
@@ -0,0 +1,298 @@
+"""只读副本路由
+
+配置 DATABASE_REPLICA_URLS 后，GET 接口通过 get_read_db 轮询使用只读副本，写操作
+仍使用 get_db 连接主库。副本上的语句遇到连接错误时，该副本被标记为不可用，语句
+在主库上重试一次，请求不会因此失败。不可用的副本至少跳过 REPLICA_FAILURE_COOLDOWN
+秒，之后由 ReplicaRouter.run_probes 每 REPLICA_PROBE_INTERVAL 秒执行一次 SELECT 1，
+探测成功才重新分流。全部副本不可用时使用主库。
+
+为保证读到自己的写入，写请求成功后 ReadYourWritesMiddleware 会设置一个短期 Cookie，
+在 READ_YOUR_WRITES_SECONDS 秒内该客户端的读请求固定走主库。Cookie 由客户端保存，
+只用于选择主库还是副本，不参与任何权限判断；超出窗口的时间戳不被采信，客户端无法
+借此长期占用主库。使用 Bearer 令牌、不保存 Cookie 的客户端按令牌中的用户固定：
+写请求成功后在缓存（Redis）中记录该用户的固定标记，多个进程共享。
+
+带缓存的读接口在缓存未命中时同样经 get_read_db 加载。固定到主库的客户端写入后的
+第一次读取从主库加载；其他客户端恰好在副本延迟期间未命中时，旧数据最多保留到该
+资源下次失效或 TTL 到期。
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.security import verify_token
+from app.db.base import AppSession, AsyncSessionLocal, create_engine_for, engine
+from app.db.pool import pool_status
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "db_pin"
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    return isinstance(exc, OperationalError) or (
+        isinstance(exc, DBAPIError) and exc.connection_invalidated
+    )
+
+
+class ReplicaSession(AppSession):
+    """副本上的只读会话，语句遇到连接错误时标记副本不可用并在主库上重试一次"""
+
+    replica: Optional["Replica"] = None
+
+    async def _fail_over(self, exc: Exception) -> bool:
+        if self.replica is None or not _is_connection_error(exc):
+            return False
+        self.replica.mark_down()
+        self.replica = None
+        await self.rollback()
+        self.sync_session.bind = engine.sync_engine
+        return True
+
+    async def execute(self, statement, *args, **kwargs):
+        try:
+            return await super().execute(statement, *args, **kwargs)
+        except Exception as exc:
+            if not await self._fail_over(exc):
+                raise
+        return await super().execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        try:
+            return await super().scalar(statement, *args, **kwargs)
+        except Exception as exc:
+            if not await self._fail_over(exc):
+                raise
+        return await super().scalar(statement, *args, **kwargs)
+
+    async def get(self, entity, ident, *args, **kwargs):
+        try:
+            return await super().get(entity, ident, *args, **kwargs)
+        except Exception as exc:
+            if not await self._fail_over(exc):
+                raise
+        return await super().get(entity, ident, *args, **kwargs)
+
+
+class Replica:
+    """一个只读副本及其健康状态"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine, self.pool_stats = create_engine_for(url, name)
+        self._session_factory = sessionmaker(
+            self.engine, class_=ReplicaSession, expire_on_commit=False, autoflush=False
+        )
+        self.down = False
+        self.down_until = 0.0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        return not self.down
+
+    def session(self) -> ReplicaSession:
+        session = self._session_factory()
+        session.replica = self
+        return session
+
+    def mark_down(self) -> None:
+        self.failures += 1
+        self.down = True
+        self.down_until = time.monotonic() + settings.REPLICA_FAILURE_COOLDOWN
+        logger.warning("read replica %s marked down for at least %ss", self.name, settings.REPLICA_FAILURE_COOLDOWN)
+
+    async def probe(self) -> bool:
+        """冷却期已过的不可用副本执行 SELECT 1，成功后恢复分流"""
+        if not self.down or self.down_until > time.monotonic():
+            return self.healthy
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(
+                    conn.execute(text("SELECT 1")), settings.REPLICA_PROBE_TIMEOUT
+                )
+        except Exception:
+            logger.warning("read replica %s probe failed", self.name, exc_info=True)
+            self.mark_down()
+            return False
+        self.down = False
+        logger.info("read replica %s is back", self.name)
+        return True
+
+
+class ReplicaRouter:
+    """在健康的副本之间轮询"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica-{i}", url) for i, url in enumerate(urls)]
+        self._counter = itertools.count()
+        self._prober: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def status(self) -> list:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "failures": replica.failures,
+                "pool": pool_status(replica.engine.sync_engine.pool, replica.pool_stats),
+            }
+            for replica in self.replicas
+        ]
+
+    async def probe(self) -> None:
+        await asyncio.gather(*(replica.probe() for replica in self.replicas))
+
+    async def run_probes(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REPLICA_PROBE_INTERVAL)
+            try:
+                await self.probe()
+            except Exception:
+                logger.warning("read replica probes failed", exc_info=True)
+
+    async def start(self) -> None:
+        if self.replicas and self._prober is None:
+            self._prober = asyncio.create_task(self.run_probes())
+
+    async def dispose(self) -> None:
+        if self._prober is not None:
+            self._prober.cancel()
+            try:
+                await self._prober
+            except asyncio.CancelledError:
+                pass
+            self._prober = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    """客户端是否处于写后读主库的窗口内
+
+    Cookie 值是客户端可改的过期时间戳，只采信窗口长度以内的值。
+    """
+    value = request.cookies.get(PIN_COOKIE)
+    if not value:
+        return False
+    try:
+        expires = float(value)
+    except ValueError:
+        return False
+    now = time.time()
+    return now < expires <= now + settings.READ_YOUR_WRITES_SECONDS + 1
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """Authorization 头中 Bearer 令牌的用户 ID，缺失或无效时返回 None"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    payload = verify_token(token.strip())
+    subject = payload.get("sub") if payload else None
+    return str(subject) if subject is not None else None
+
+
+def _pin_key(subject: str) -> str:
+    return f"{cache.prefix}:db_pin:{subject}"
+
+
+async def pin_principal(subject: str) -> None:
+    """在写后读窗口内把该用户的读请求固定到主库"""
+    try:
+        await cache.client.set(_pin_key(subject), "1", ex=settings.READ_YOUR_WRITES_SECONDS)
+    except Exception:
+        logger.warning("failed to pin user %s to primary", subject, exc_info=True)
+
+
+async def is_principal_pinned(request: Request) -> bool:
+    subject = token_subject(request.headers.get("authorization"))
+    if subject is None:
+        return False
+    try:
+        return await cache.client.get(_pin_key(subject)) is not None
+    except Exception:
+        # 无法确认时读主库，宁可少分流也不返回旧数据
+        logger.warning("failed to read primary pin for user %s", subject, exc_info=True)
+        return True
+
+
+async def get_read_db(request: Request):
+    """获取只读数据库会话，无可用副本或处于写后读窗口时使用主库"""
+    replica = None if is_pinned_to_primary(request) else replica_router.choose()
+    if replica is not None and await is_principal_pinned(request):
+        replica = None
+    if replica is None:
+        async with AsyncSessionLocal() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
+        return
+
+    async with replica.session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+class ReadYourWritesMiddleware:
+    """写请求成功后设置 Cookie 并按令牌用户记录固定标记，使客户端在短时间内的读请求走主库"""
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self.SAFE_METHODS
+            or not replica_router.replicas
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        subject = token_subject(Headers(scope=scope).get("authorization"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                if subject is not None:
+                    # 在响应发出前写入，客户端收到响应后的读请求一定能看到标记
+                    await pin_principal(subject)
+                window = settings.READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{PIN_COOKIE}={time.time() + window:.0f}; Max-Age={window}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1"))
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,16 +1,31 @@
 """FastAPI 主应用"""
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
+from app.core import metrics
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.core.hashing import password_hasher
+from app.api.compression import CompressionMiddleware
+from app.api.limits import BodySizeLimitMiddleware
+from app.api.responses import FastJSONResponse
 from app.api.v1 import router as api_v1_router
+from app.api.ws import router as ws_router
+from app.db import get_pool_status
+from app.db.profiling import QueryProfilingMiddleware
+from app.db.replicas import ReadYourWritesMiddleware, replica_router
+from app.services.live import live_hub
+
+configure_logging()
 
 # 创建应用
 app = FastAPI(
     title=settings.APP_NAME,
     description="足球管理系统API",
     version=settings.APP_VERSION,
+    default_response_class=FastJSONResponse,
 )
 
 # 添加CORS中间件
@@ -20,13 +35,48 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
+    expose_headers=settings.CORS_EXPOSE_HEADERS,
 )
 
 # 添加信任主机中间件
 app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
 
+# 响应压缩（在指标和 SQL 统计中间件之内，请求耗时包含压缩时间）
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# 写后读主库
+app.add_middleware(ReadYourWritesMiddleware)
+
+# 请求体大小限制，在上传文件落盘之前拒绝
+app.add_middleware(BodySizeLimitMiddleware)
+
+# 按请求统计 SQL 语句数和耗时
+app.add_middleware(QueryProfilingMiddleware)
+
+# Prometheus 请求指标
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # 包含API路由
 app.include_router(api_v1_router)
+app.include_router(ws_router)
+
+
+@app.on_event("startup")
+async def start_live_hub():
+    """启动实时推送的 Redis 订阅和只读副本探测"""
+    await live_hub.start()
+    await replica_router.start()
+
+
+@app.on_event("shutdown")
+async def close_resources():
+    """关闭实时推送、缓存连接、只读副本连接和密码哈希工作池"""
+    await live_hub.stop()
+    await cache.close()
+    await replica_router.dispose()
+    password_hasher.shutdown()
 
 
 @app.get("/")
@@ -45,6 +95,29 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+async def db_health_check():
+    """数据库连接池健康检查"""
+    pool = get_pool_status()
+    replicas = replica_router.status()
+    saturated = pool["saturation"] >= settings.DB_POOL_SATURATION_WARN
+    replica_down = any(not replica["healthy"] for replica in replicas)
+    return {
+        "status": "degraded" if saturated or replica_down else "healthy",
+        "pool": pool,
+        "replicas": replicas,
+    }
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get(settings.METRICS_PATH, include_in_schema=False)
+    async def export_metrics():
+        """Prometheus 指标"""
+        content, content_type = metrics.render()
+        return Response(content=content, headers={"Content-Type": content_type})
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,8 +2,21 @@
 from app.models.user import User, Role, Permission
 from app.models.team import Team, Honor
 from app.models.player import Player, PlayerStatistics, HealthRecord
-from app.models.match import Competition, Schedule, MatchRecord, Standing
-from app.models.training import TrainingPlan, TrainingRecord, TrainingResource
+from app.models.match import (
+    Competition,
+    Schedule,
+    MatchRecord,
+    MatchEvent,
+    TeamResult,
+    Standing,
+)
+from app.models.training import (
+    TrainingPlan,
+    TrainingRecord,
+    TrainingDailySummary,
+    TrainingResource,
+)
+from app.models.job import Job
 
 __all__ = [
     "User",
@@ -17,8 +30,12 @@ __all__ = [
     "Competition",
     "Schedule",
     "MatchRecord",
+    "MatchEvent",
+    "TeamResult",
     "Standing",
     "TrainingPlan",
     "TrainingRecord",
+    "TrainingDailySummary",
     "TrainingResource",
+    "Job",
 ]
@@ -0,0 +1,30 @@
+"""后台任务模型"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index
+from app.db.base import Base
+
+
+class Job(Base):
+    """后台任务，记录状态、进度和结果"""
+
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("idx_job_created_by_created_at", "created_by", "created_at"),
+    )
+
+    id = Column(String(32), primary_key=True)  # uuid4 十六进制
+    name = Column(String(50), nullable=False)  # 任务类型，如 standings.rebuild
+    status = Column(String(20), nullable=False)  # 状态：pending、running、succeeded、failed
+    progress = Column(Integer, default=0)  # 进度（百分比）
+    message = Column(String(255), nullable=True)
+    params = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("user.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Job {self.name} {self.status}>"
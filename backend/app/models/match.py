@@ -1,6 +1,18 @@
 """赛事和比赛模型"""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Time, Text
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Date,
+    Time,
+    Boolean,
+    Text,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -37,6 +49,17 @@ class Schedule(Base):
     """赛程模型"""
 
     __tablename__ = "schedule"
+    __table_args__ = (
+        # 按赛事（及轮次）查询赛程
+        Index("idx_schedule_competition_round", "competition_id", "round_number"),
+        UniqueConstraint(
+            "competition_id",
+            "home_team_id",
+            "away_team_id",
+            "match_date",
+            name="uq_schedule_fixture",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     competition_id = Column(Integer, ForeignKey("competition.id"))
@@ -63,6 +86,10 @@ class MatchRecord(Base):
     """比赛记录模型"""
 
     __tablename__ = "match_record"
+    __table_args__ = (
+        # 每个赛程只有一条比赛记录
+        UniqueConstraint("schedule_id", name="uq_match_record_schedule"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     schedule_id = Column(Integer, ForeignKey("schedule.id"))
@@ -71,7 +98,7 @@ class MatchRecord(Base):
     home_goals = Column(Integer, default=0)
     away_goals = Column(Integer, default=0)
     status = Column(String(50))  # 状态：进行中、已完成
-    event_details = Column(Text, nullable=True)  # JSON格式的事件详情
+    event_details = Column(Text, nullable=True)  # JSON格式的事件详情（与 match_event 表同步）
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -79,15 +106,92 @@ class MatchRecord(Base):
     schedule = relationship("Schedule", back_populates="match_record")
     home_team = relationship("Team", foreign_keys=[home_team_id])
     away_team = relationship("Team", foreign_keys=[away_team_id])
+    events = relationship(
+        "MatchEvent",
+        back_populates="match",
+        cascade="all, delete-orphan",
+        order_by="MatchEvent.minute",
+    )
+    team_results = relationship(
+        "TeamResult", back_populates="match", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<MatchRecord {self.home_goals}-{self.away_goals}>"
 
 
+class MatchEvent(Base):
+    """比赛事件模型"""
+
+    __tablename__ = "match_event"
+    __table_args__ = (
+        Index("idx_match_event_match_minute", "match_id", "minute"),
+        Index("idx_match_event_player_type", "player_id", "event_type"),
+        Index("idx_match_event_team_type", "team_id", "event_type"),
+        Index("idx_match_event_type_match", "event_type", "match_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(Integer, ForeignKey("match_record.id"), nullable=False)
+    minute = Column(Integer, nullable=True)  # 比赛分钟
+    event_type = Column(String(30), nullable=False)  # 类型：appearance、goal、assist、yellow_card 等
+    player_id = Column(Integer, ForeignKey("player.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("team.id"), nullable=True)
+    related_player_id = Column(Integer, ForeignKey("player.id"), nullable=True)  # 助攻球员等
+    minutes = Column(Integer, nullable=True)  # 出场事件的出场时间
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # 关系
+    match = relationship("MatchRecord", back_populates="events")
+
+    def __repr__(self):
+        return f"<MatchEvent {self.event_type} {self.minute}'>"
+
+
+class TeamResult(Base):
+    """球队赛果时间线
+
+    每场已完成的比赛为两支球队各写一行（以该队视角记录对手、主客场和比分），
+    近况、交锋和连胜等统计直接按球队读取，不再同时按主队、客队扫描比赛记录。
+    """
+
+    __tablename__ = "team_result"
+    __table_args__ = (
+        UniqueConstraint("match_id", "team_id", name="uq_team_result_match_team"),
+        Index("idx_team_result_team_date", "team_id", "match_date", "match_id"),
+        Index("idx_team_result_team_opponent", "team_id", "opponent_id", "match_date"),
+        Index("idx_team_result_competition_team", "competition_id", "team_id", "match_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    match_id = Column(Integer, ForeignKey("match_record.id"), nullable=False)
+    competition_id = Column(Integer, ForeignKey("competition.id"), nullable=True)
+    team_id = Column(Integer, ForeignKey("team.id"), nullable=False)
+    opponent_id = Column(Integer, ForeignKey("team.id"), nullable=False)
+    match_date = Column(Date, nullable=True)
+    is_home = Column(Boolean, nullable=False)
+    goals_for = Column(Integer, default=0)
+    goals_against = Column(Integer, default=0)
+    outcome = Column(String(1), nullable=False)  # 结果：W 胜、D 平、L 负
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # 关系
+    match = relationship("MatchRecord", back_populates="team_results")
+
+    def __repr__(self):
+        return f"<TeamResult Team {self.team_id} {self.outcome}>"
+
+
 class Standing(Base):
     """积分榜模型"""
 
     __tablename__ = "standing"
+    __table_args__ = (
+        # 每支球队在一个赛事中只有一行积分
+        UniqueConstraint("competition_id", "team_id", name="uq_standing_competition_team"),
+        # 按名次输出积分榜
+        Index("idx_standing_competition_rank", "competition_id", "rank"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     competition_id = Column(Integer, ForeignKey("competition.id"))
@@ -1,6 +1,17 @@
 """球员模型"""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Date, Text
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Float,
+    DateTime,
+    ForeignKey,
+    Date,
+    Text,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,6 +20,20 @@ class Player(Base):
     """球员模型"""
 
     __tablename__ = "player"
+    __table_args__ = (
+        # 全文检索索引（MySQL ngram 解析器，支持中文）
+        Index("ft_player_name", "name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        Index(
+            "ft_player_search",
+            "name",
+            "nationality",
+            "biography",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        # 按球队（及位置）筛选球员
+        Index("idx_player_team_position", "team_id", "position"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("team.id"))
@@ -41,6 +66,10 @@ class PlayerStatistics(Base):
     """球员统计模型"""
 
     __tablename__ = "player_statistics"
+    __table_args__ = (
+        # 每名球员每个赛季一行；同时用于按球员/赛季查询
+        UniqueConstraint("player_id", "season", name="uq_player_statistics_player_season"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("player.id"))
@@ -52,6 +81,7 @@ class PlayerStatistics(Base):
     red_cards = Column(Integer, default=0)  # 红牌
     minutes_played = Column(Integer, default=0)  # 出场时间（分钟）
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 关系
     player = relationship("Player", back_populates="statistics")
@@ -64,6 +94,9 @@ class HealthRecord(Base):
     """健康记录模型"""
 
     __tablename__ = "health_record"
+    __table_args__ = (
+        Index("idx_health_record_player_status", "player_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("player.id"))
@@ -74,6 +107,7 @@ class HealthRecord(Base):
     status = Column(String(50))  # 状态：进行中、已完成、已取消
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 关系
     player = relationship("Player", back_populates="health_records")
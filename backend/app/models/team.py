@@ -1,6 +1,6 @@
 """球队模型"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,6 +9,17 @@ class Team(Base):
     """球队模型"""
 
     __tablename__ = "team"
+    __table_args__ = (
+        # 全文检索索引（MySQL ngram 解析器，支持中文）
+        Index("ft_team_name", "name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+        Index(
+            "ft_team_search",
+            "name",
+            "description",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), unique=True, index=True)
@@ -44,6 +55,7 @@ class Honor(Base):
     image = Column(String(255), nullable=True)
     year = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 关系
     team = relationship("Team", back_populates="honors")
@@ -1,6 +1,6 @@
 """训练管理模型"""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Time, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Time, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -9,6 +9,9 @@ class TrainingPlan(Base):
     """训练计划模型"""
 
     __tablename__ = "training_plan"
+    __table_args__ = (
+        Index("idx_training_plan_team_date", "team_id", "scheduled_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("team.id"))
@@ -40,6 +43,12 @@ class TrainingRecord(Base):
     """训练记录模型"""
 
     __tablename__ = "training_record"
+    __table_args__ = (
+        # 每名球员在一次训练中只有一条记录；同时用于按训练计划查询
+        UniqueConstraint(
+            "training_plan_id", "player_id", name="uq_training_record_plan_player"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     training_plan_id = Column(Integer, ForeignKey("training_plan.id"))
@@ -58,6 +67,42 @@ class TrainingRecord(Base):
         return f"<TrainingRecord Player {self.player_id}>"
 
 
+class TrainingDailySummary(Base):
+    """球员每日训练汇总
+
+    训练记录写入时增量维护，看板按日期区间对本表做聚合，不再扫描训练记录。
+    出勤数包含迟到；完成度和评分保存总和与有效记录数，平均值在读取时计算。
+    """
+
+    __tablename__ = "training_daily_summary"
+    __table_args__ = (
+        UniqueConstraint(
+            "team_id",
+            "summary_date",
+            "player_id",
+            name="uq_training_daily_summary_team_date_player",
+        ),
+        Index("idx_training_daily_summary_player_date", "player_id", "summary_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("team.id"), nullable=False)
+    player_id = Column(Integer, ForeignKey("player.id"), nullable=False)
+    summary_date = Column(Date, nullable=False)
+    sessions = Column(Integer, default=0)  # 训练次数
+    attended = Column(Integer, default=0)  # 出勤次数（含迟到）
+    late = Column(Integer, default=0)
+    absent = Column(Integer, default=0)
+    completion_total = Column(Integer, default=0)  # 完成度之和
+    completion_count = Column(Integer, default=0)  # 有完成度的记录数
+    score_total = Column(Integer, default=0)  # 评分之和
+    score_count = Column(Integer, default=0)  # 有评分的记录数
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TrainingDailySummary Player {self.player_id} {self.summary_date}>"
+
+
 class TrainingResource(Base):
     """训练资源模型"""
 
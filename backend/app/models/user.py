@@ -1,6 +1,15 @@
 """用户模型"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Table,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -10,6 +19,7 @@ user_role_association = Table(
     Base.metadata,
     Column("user_id", Integer, ForeignKey("user.id")),
     Column("role_id", Integer, ForeignKey("role.id")),
+    UniqueConstraint("user_id", "role_id", name="uq_user_role"),
 )
 
 
@@ -96,4 +106,5 @@ role_permission_association = Table(
     Base.metadata,
     Column("role_id", Integer, ForeignKey("role.id")),
     Column("permission_id", Integer, ForeignKey("permission.id")),
+    UniqueConstraint("role_id", "permission_id", name="uq_role_permission"),
 )
@@ -1,7 +1,46 @@
 """数据模型模块"""
 from app.schemas.user import User, UserCreate, UserLogin, Token, Role, Permission
-from app.schemas.team import Team, TeamCreate, Honor
-from app.schemas.player import Player, PlayerCreate, PlayerStatistics, HealthRecord
+from app.schemas.team import Team, TeamCreate, TeamUpdate, Honor
+from app.schemas.player import (
+    Player,
+    PlayerCreate,
+    PlayerUpdate,
+    PlayerStatistics,
+    HealthRecord,
+    PlayerImportResult,
+)
+from app.schemas.match import (
+    Competition,
+    CompetitionCreate,
+    CompetitionSummary,
+    MatchRecord,
+    MatchRecordCreate,
+    MatchRecordUpdate,
+    MatchEvent,
+    MatchEventCreate,
+    Standing,
+    Schedule,
+    ScheduleGenerate,
+    ScheduleGenerateResult,
+)
+from app.schemas.search import SearchResult
+from app.schemas.analytics import (
+    TeamForm,
+    TeamStreaks,
+    HeadToHead,
+    MatchPreview,
+)
+from app.schemas.job import Job, JobCreate
+from app.schemas.training import (
+    TrainingPlan,
+    TrainingPlanCreate,
+    TrainingPlanUpdate,
+    TrainingRecord,
+    TrainingRecordCreate,
+    TrainingRecordUpdate,
+    PlayerTrainingDashboard,
+    TeamTrainingDashboard,
+)
 
 __all__ = [
     "User",
@@ -12,9 +51,39 @@ __all__ = [
     "Permission",
     "Team",
     "TeamCreate",
+    "TeamUpdate",
     "Honor",
     "Player",
     "PlayerCreate",
+    "PlayerUpdate",
     "PlayerStatistics",
     "HealthRecord",
+    "PlayerImportResult",
+    "Competition",
+    "CompetitionCreate",
+    "CompetitionSummary",
+    "MatchRecord",
+    "MatchRecordCreate",
+    "MatchRecordUpdate",
+    "MatchEvent",
+    "MatchEventCreate",
+    "Standing",
+    "Schedule",
+    "ScheduleGenerate",
+    "ScheduleGenerateResult",
+    "SearchResult",
+    "TeamForm",
+    "TeamStreaks",
+    "HeadToHead",
+    "MatchPreview",
+    "Job",
+    "JobCreate",
+    "TrainingPlan",
+    "TrainingPlanCreate",
+    "TrainingPlanUpdate",
+    "TrainingRecord",
+    "TrainingRecordCreate",
+    "TrainingRecordUpdate",
+    "PlayerTrainingDashboard",
+    "TeamTrainingDashboard",
 ]
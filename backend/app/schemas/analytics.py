@@ -0,0 +1,84 @@
+"""统计分析数据模型"""
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ResultItem(BaseModel):
+    """球队视角的一场赛果"""
+
+    match_id: int
+    competition_id: Optional[int] = None
+    match_date: Optional[date] = None
+    opponent_id: int
+    is_home: bool
+    goals_for: int
+    goals_against: int
+    outcome: str  # W 胜、D 平、L 负
+
+
+class RecordSummary(BaseModel):
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+
+
+class CurrentStreak(BaseModel):
+    outcome: str
+    length: int
+
+
+class Streaks(BaseModel):
+    current: Optional[CurrentStreak] = None
+    unbeaten: int  # 当前连续不败场次
+    winless: int  # 当前连续不胜场次
+    longest_win: int
+    longest_unbeaten: int
+    longest_loss: int
+
+
+class TeamStreaks(Streaks):
+    team_id: int
+    competition_id: Optional[int] = None
+
+
+class TeamForm(BaseModel):
+    team_id: int
+    competition_id: Optional[int] = None
+    form: str  # 最近 N 场结果，最近一场在前，如 "WWDLW"
+    overall: RecordSummary
+    home: RecordSummary
+    away: RecordSummary
+    last_matches: List[ResultItem]
+    streaks: Streaks
+
+
+class HeadToHead(BaseModel):
+    """两队交锋记录，以 team_id 一方的视角统计"""
+
+    team_id: int
+    opponent_id: int
+    competition_id: Optional[int] = None
+    played: int
+    team_wins: int
+    draws: int
+    opponent_wins: int
+    team_goals: int
+    opponent_goals: int
+    team_home: RecordSummary
+    team_away: RecordSummary
+    last_meetings: List[ResultItem]
+
+
+class MatchPreview(BaseModel):
+    schedule_id: int
+    competition_id: Optional[int] = None
+    match_date: Optional[date] = None
+    home: TeamForm
+    away: TeamForm
+    head_to_head: HeadToHead
@@ -0,0 +1,64 @@
+"""后台任务数据模型"""
+from datetime import datetime
+from typing import Any, Dict, Literal, Optional
+from pydantic import BaseModel, model_validator
+
+
+class JobCreate(BaseModel):
+    """提交任务：name 为任务类型，params 按任务类型校验"""
+
+    name: str
+    params: Dict[str, Any] = {}
+
+
+class Job(BaseModel):
+    id: str
+    name: str
+    status: str
+    progress: int = 0
+    message: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class StandingsRebuildParams(BaseModel):
+    competition_id: int
+
+
+class StatisticsRebuildParams(BaseModel):
+    season: str
+
+
+class TimelineRebuildParams(BaseModel):
+    competition_id: Optional[int] = None
+
+
+class TrainingSummaryRebuildParams(BaseModel):
+    team_id: Optional[int] = None
+
+
+class ReportParams(BaseModel):
+    report: Literal["players", "statistics", "standings"]
+    format: Literal["csv", "ndjson", "xlsx"] = "csv"
+    team_id: Optional[int] = None
+    season: Optional[str] = None
+    competition_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def require_competition(self):
+        if self.report == "standings" and self.competition_id is None:
+            raise ValueError("competition_id is required for the standings report")
+        return self
+
+
+class PlayerImportParams(BaseModel):
+    path: str  # 上传文件在共享目录中的路径
+    filename: str
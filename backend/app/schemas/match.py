@@ -0,0 +1,162 @@
+"""比赛数据模型"""
+import json
+from typing import Optional, List
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
+from datetime import datetime, date, time
+
+
+class CompetitionBase(BaseModel):
+    name: str
+    competition_type: Optional[str] = None
+    season: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class CompetitionCreate(CompetitionBase):
+    description: Optional[str] = None
+    rules: Optional[str] = None
+
+
+class CompetitionSummary(CompetitionBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class Competition(CompetitionSummary):
+    description: Optional[str] = None
+    rules: Optional[str] = None
+
+
+class MatchEventCreate(BaseModel):
+    type: str = Field(min_length=1, max_length=30)
+    minute: Optional[int] = Field(default=None, ge=0)
+    player_id: Optional[int] = None
+    team_id: Optional[int] = None
+    assist_player_id: Optional[int] = None
+    minutes: Optional[int] = Field(default=None, ge=0)
+
+
+_EVENT_LIST = TypeAdapter(List[MatchEventCreate])
+
+
+def normalize_event_details(value: Optional[str]) -> Optional[str]:
+    """按 MatchEventCreate 校验事件 JSON 数组，返回规范化后的 JSON"""
+    if not value:
+        return None
+    try:
+        events = _EVENT_LIST.validate_json(value)
+    except ValidationError as exc:
+        error = exc.errors(include_url=False)[0]
+        location = ".".join(str(part) for part in error["loc"])
+        raise ValueError(f"invalid event at {location}: {error['msg']}" if location else error["msg"])
+    if not events:
+        return None
+    return json.dumps(
+        [event.model_dump(exclude_none=True) for event in events], ensure_ascii=False
+    )
+
+
+class MatchRecordBase(BaseModel):
+    schedule_id: int
+    home_team_id: int
+    away_team_id: int
+    home_goals: int = Field(0, ge=0)
+    away_goals: int = Field(0, ge=0)
+    status: str = "进行中"
+    event_details: Optional[str] = None
+
+
+class MatchRecordCreate(MatchRecordBase):
+    _check_event_details = field_validator("event_details")(normalize_event_details)
+
+
+class MatchRecordUpdate(BaseModel):
+    home_goals: Optional[int] = Field(None, ge=0)
+    away_goals: Optional[int] = Field(None, ge=0)
+    status: Optional[str] = None
+    event_details: Optional[str] = None
+
+    _check_event_details = field_validator("event_details")(normalize_event_details)
+
+    @field_validator("home_goals", "away_goals")
+    @classmethod
+    def goals_not_null(cls, value):
+        # 未传入的字段不经过校验；显式传入 null 会把比分清空，积分榜增量无法计算
+        if value is None:
+            raise ValueError("goals may not be null")
+        return value
+
+
+class MatchRecord(MatchRecordBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MatchEvent(BaseModel):
+    id: int
+    match_id: int
+    event_type: str
+    minute: Optional[int] = None
+    player_id: Optional[int] = None
+    team_id: Optional[int] = None
+    related_player_id: Optional[int] = None
+    minutes: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class Standing(BaseModel):
+    id: int
+    competition_id: int
+    team_id: int
+    rank: Optional[int] = None
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    goal_difference: int = 0
+    points: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+class Schedule(BaseModel):
+    id: int
+    competition_id: int
+    round_number: int
+    match_date: date
+    match_time: Optional[time] = None
+    home_team_id: int
+    away_team_id: int
+    venue: Optional[str] = None
+    status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduleGenerate(BaseModel):
+    team_ids: List[int]
+    start_date: date
+    double_round: bool = True
+    interval_days: int = 7
+    excluded_dates: List[date] = []
+    match_time: Optional[time] = None
+    replace_existing: bool = False
+
+
+class ScheduleGenerateResult(BaseModel):
+    competition_id: int
+    rounds: int
+    fixtures: int
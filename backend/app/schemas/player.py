@@ -76,3 +76,16 @@ class Player(PlayerBase):
 
     class Config:
         from_attributes = True
+
+
+class PlayerImportError(BaseModel):
+    row: int
+    errors: List[dict]
+
+
+class PlayerImportResult(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    errors: List[PlayerImportError] = []
+    errors_truncated: bool = False
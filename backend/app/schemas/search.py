@@ -0,0 +1,25 @@
+"""搜索数据模型"""
+from typing import Optional, List
+from pydantic import BaseModel
+
+
+class PlayerSearchHit(BaseModel):
+    id: int
+    name: str
+    team_id: Optional[int] = None
+    position: Optional[str] = None
+    nationality: Optional[str] = None
+    score: float
+
+
+class TeamSearchHit(BaseModel):
+    id: int
+    name: str
+    home_ground: Optional[str] = None
+    score: float
+
+
+class SearchResult(BaseModel):
+    query: str
+    players: List[PlayerSearchHit] = []
+    teams: List[TeamSearchHit] = []
@@ -0,0 +1,120 @@
+"""训练数据模型"""
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+Attendance = Literal["出席", "缺席", "迟到"]
+
+
+class TrainingPlanBase(BaseModel):
+    team_id: int
+    title: str
+    topic: Optional[str] = None
+    description: Optional[str] = None
+    scheduled_date: date
+    scheduled_time: Optional[time] = None
+    duration: Optional[int] = None
+    location: Optional[str] = None
+    category: Optional[str] = None
+    status: str = "scheduled"
+
+
+class TrainingPlanCreate(TrainingPlanBase):
+    coach_id: Optional[int] = None
+
+
+class TrainingPlanUpdate(BaseModel):
+    team_id: Optional[int] = None
+    coach_id: Optional[int] = None
+    title: Optional[str] = None
+    topic: Optional[str] = None
+    description: Optional[str] = None
+    scheduled_date: Optional[date] = None
+    scheduled_time: Optional[time] = None
+    duration: Optional[int] = None
+    location: Optional[str] = None
+    category: Optional[str] = None
+    status: Optional[str] = None
+
+
+class TrainingPlan(TrainingPlanBase):
+    id: int
+    coach_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TrainingRecordBase(BaseModel):
+    player_id: int
+    attendance: Attendance
+    completion_rate: Optional[int] = Field(None, ge=0, le=100)
+    performance_score: Optional[int] = Field(None, ge=1, le=10)
+    coach_comment: Optional[str] = None
+
+
+class TrainingRecordCreate(TrainingRecordBase):
+    pass
+
+
+class TrainingRecordUpdate(BaseModel):
+    attendance: Optional[Attendance] = None
+    completion_rate: Optional[int] = Field(None, ge=0, le=100)
+    performance_score: Optional[int] = Field(None, ge=1, le=10)
+    coach_comment: Optional[str] = None
+
+
+class TrainingRecord(TrainingRecordBase):
+    id: int
+    training_plan_id: int
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TrainingTotals(BaseModel):
+    """区间汇总；比率为百分比，没有记录时为 None"""
+
+    sessions: int
+    attended: int
+    late: int
+    absent: int
+    attendance_rate: Optional[float] = None
+    avg_completion: Optional[float] = None
+    avg_score: Optional[float] = None
+
+
+class TrainingTrendPoint(TrainingTotals):
+    """某一训练日的汇总，rolling_* 为截至当日的滚动窗口值"""
+
+    date: date
+    rolling_attendance_rate: Optional[float] = None
+    rolling_avg_completion: Optional[float] = None
+    rolling_avg_score: Optional[float] = None
+
+
+class PlayerTrainingTotals(TrainingTotals):
+    player_id: int
+
+
+class PlayerTrainingDashboard(BaseModel):
+    player_id: int
+    start: date
+    end: date
+    window: int  # 滚动窗口天数
+    totals: TrainingTotals
+    trend: List[TrainingTrendPoint]
+
+
+class TeamTrainingDashboard(BaseModel):
+    team_id: int
+    start: date
+    end: date
+    window: int
+    totals: TrainingTotals
+    players: List[PlayerTrainingTotals]
+    trend: List[TrainingTrendPoint]
+
@@ -0,0 +1,368 @@
+"""球队近况、交锋和连续纪录统计
+
+统计基于 team_result 时间线：每场已完成的比赛为两支球队各写一行。比赛记录创建
+或修改时由 sync_match 在同一事务内增量维护（删除该场的旧行，按最新比分重写），
+读取时只按球队（及对手、赛事）走索引：主客场战绩在 SQL 中分组汇总，最近 N 场
+用 LIMIT 取出，连胜/不败纪录只读取结果一列的序列。
+
+结果按赛事缓存（资源 analytics，scope 为赛事 ID，不限赛事的统计使用 all），
+某个赛事的比赛变化只失效该赛事和 all 两个 scope。
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.models import MatchRecord, Schedule, Team, TeamResult
+from app.services.standings import (
+    MATCH_STATUS_FINISHED,
+    POINTS_DRAW,
+    POINTS_WIN,
+    MatchSnapshot,
+)
+
+OUTCOME_WIN = "W"
+OUTCOME_DRAW = "D"
+OUTCOME_LOSS = "L"
+
+CACHE_RESOURCE = "analytics"
+ALL_COMPETITIONS = "all"
+
+
+def outcome_of(scored: int, conceded: int) -> str:
+    if scored > conceded:
+        return OUTCOME_WIN
+    if scored == conceded:
+        return OUTCOME_DRAW
+    return OUTCOME_LOSS
+
+
+def cache_scope(competition_id: Optional[int]) -> str:
+    return str(competition_id) if competition_id is not None else ALL_COMPETITIONS
+
+
+async def invalidate(cache: Cache, competition_id: Optional[int]) -> None:
+    """失效一个赛事及不限赛事的统计缓存"""
+    if competition_id is not None:
+        await cache.invalidate(CACHE_RESOURCE, scope=cache_scope(competition_id))
+    await cache.invalidate(CACHE_RESOURCE, scope=ALL_COMPETITIONS)
+
+
+def _timeline_rows(
+    match_id: int,
+    competition_id: Optional[int],
+    match_date: Optional[date],
+    snapshot: MatchSnapshot,
+) -> List[dict]:
+    home, away = snapshot.home_team_id, snapshot.away_team_id
+    sides = (
+        (home, away, True, snapshot.home_goals, snapshot.away_goals),
+        (away, home, False, snapshot.away_goals, snapshot.home_goals),
+    )
+    return [
+        {
+            "match_id": match_id,
+            "competition_id": competition_id,
+            "match_date": match_date,
+            "team_id": team_id,
+            "opponent_id": opponent_id,
+            "is_home": is_home,
+            "goals_for": scored,
+            "goals_against": conceded,
+            "outcome": outcome_of(scored, conceded),
+        }
+        for team_id, opponent_id, is_home, scored, conceded in sides
+    ]
+
+
+def timeline_affected(before: Optional[MatchSnapshot], after: MatchSnapshot) -> bool:
+    """比赛变化是否影响时间线：只有完赛前后的比分、球队或状态变化才需要改写"""
+    if before == after:
+        return False
+    return after.counted or (before is not None and before.counted)
+
+
+async def sync_match(
+    db: AsyncSession,
+    match: MatchRecord,
+    competition_id: Optional[int],
+    before: Optional[MatchSnapshot],
+) -> bool:
+    """按比赛记录的最新状态更新时间线，返回时间线是否变化
+
+    只修改会话中的数据，由调用方提交事务。
+    """
+    after = MatchSnapshot.of(match)
+    if not timeline_affected(before, after):
+        return False
+
+    await db.execute(delete(TeamResult).where(TeamResult.match_id == match.id))
+    if after.counted:
+        result = await db.execute(
+            select(Schedule.match_date).where(Schedule.id == match.schedule_id)
+        )
+        match_date = result.scalar_one_or_none()
+        await db.execute(
+            insert(TeamResult), _timeline_rows(match.id, competition_id, match_date, after)
+        )
+    return True
+
+
+async def rebuild_timeline(db: AsyncSession, competition_id: Optional[int] = None) -> int:
+    """根据已完成的比赛重建时间线（不指定赛事时重建全部），返回比赛场数"""
+    clear = delete(TeamResult)
+    query = (
+        select(
+            MatchRecord.id,
+            MatchRecord.home_team_id,
+            MatchRecord.away_team_id,
+            MatchRecord.home_goals,
+            MatchRecord.away_goals,
+            MatchRecord.status,
+            Schedule.competition_id,
+            Schedule.match_date,
+        )
+        .join(Schedule, MatchRecord.schedule_id == Schedule.id)
+        .where(MatchRecord.status == MATCH_STATUS_FINISHED)
+    )
+    if competition_id is not None:
+        clear = clear.where(TeamResult.competition_id == competition_id)
+        query = query.where(Schedule.competition_id == competition_id)
+
+    await db.execute(clear)
+    rows = []
+    matches = (await db.execute(query)).all()
+    for match in matches:
+        snapshot = MatchSnapshot(
+            home_team_id=match.home_team_id,
+            away_team_id=match.away_team_id,
+            home_goals=match.home_goals or 0,
+            away_goals=match.away_goals or 0,
+            status=match.status,
+        )
+        rows.extend(_timeline_rows(match.id, match.competition_id, match.match_date, snapshot))
+    if rows:
+        await db.execute(insert(TeamResult), rows)
+    return len(matches)
+
+
+def _filtered(
+    query, team_id: int, competition_id: Optional[int], opponent_id: Optional[int]
+):
+    query = query.where(TeamResult.team_id == team_id)
+    if competition_id is not None:
+        query = query.where(TeamResult.competition_id == competition_id)
+    if opponent_id is not None:
+        query = query.where(TeamResult.opponent_id == opponent_id)
+    return query
+
+
+_LATEST_FIRST = (TeamResult.match_date.desc(), TeamResult.match_id.desc())
+
+
+async def _load_results(
+    db: AsyncSession,
+    team_id: int,
+    competition_id: Optional[int] = None,
+    opponent_id: Optional[int] = None,
+    limit: int = 5,
+) -> list:
+    """按时间倒序读取球队最近 limit 场赛果"""
+    query = select(
+        TeamResult.match_id,
+        TeamResult.competition_id,
+        TeamResult.match_date,
+        TeamResult.opponent_id,
+        TeamResult.is_home,
+        TeamResult.goals_for,
+        TeamResult.goals_against,
+        TeamResult.outcome,
+    )
+    query = _filtered(query, team_id, competition_id, opponent_id)
+    result = await db.execute(query.order_by(*_LATEST_FIRST).limit(limit))
+    return result.all()
+
+
+async def _load_outcomes(
+    db: AsyncSession, team_id: int, competition_id: Optional[int] = None
+) -> List[str]:
+    """按时间倒序读取球队全部比赛的结果（只取 outcome 一列），用于连续纪录"""
+    query = _filtered(select(TeamResult.outcome), team_id, competition_id, None)
+    result = await db.execute(query.order_by(*_LATEST_FIRST))
+    return list(result.scalars())
+
+
+def _empty_record() -> dict:
+    return dict.fromkeys(("played", "won", "drawn", "lost", "goals_for", "goals_against"), 0)
+
+
+def _finish_record(record: dict) -> dict:
+    record["goal_difference"] = record["goals_for"] - record["goals_against"]
+    record["points"] = record["won"] * POINTS_WIN + record["drawn"] * POINTS_DRAW
+    return record
+
+
+_OUTCOME_FIELDS = {OUTCOME_WIN: "won", OUTCOME_DRAW: "drawn", OUTCOME_LOSS: "lost"}
+
+
+async def _load_records(
+    db: AsyncSession,
+    team_id: int,
+    competition_id: Optional[int] = None,
+    opponent_id: Optional[int] = None,
+) -> dict:
+    """胜平负、进失球和积分汇总：按主客场和结果在 SQL 中分组，返回 overall/home/away"""
+    query = select(
+        TeamResult.is_home,
+        TeamResult.outcome,
+        func.count(),
+        func.coalesce(func.sum(TeamResult.goals_for), 0),
+        func.coalesce(func.sum(TeamResult.goals_against), 0),
+    )
+    query = _filtered(query, team_id, competition_id, opponent_id)
+    result = await db.execute(query.group_by(TeamResult.is_home, TeamResult.outcome))
+
+    records = {"overall": _empty_record(), "home": _empty_record(), "away": _empty_record()}
+    for is_home, outcome, played, goals_for, goals_against in result.all():
+        for record in (records["overall"], records["home" if is_home else "away"]):
+            record["played"] += played
+            record[_OUTCOME_FIELDS[outcome]] += played
+            record["goals_for"] += goals_for
+            record["goals_against"] += goals_against
+    return {name: _finish_record(record) for name, record in records.items()}
+
+
+def _result_item(row) -> dict:
+    return {
+        "match_id": row.match_id,
+        "competition_id": row.competition_id,
+        "match_date": row.match_date.isoformat() if row.match_date else None,
+        "opponent_id": row.opponent_id,
+        "is_home": row.is_home,
+        "goals_for": row.goals_for or 0,
+        "goals_against": row.goals_against or 0,
+        "outcome": row.outcome,
+    }
+
+
+def _longest(outcomes: List[str], accepted: str) -> int:
+    longest = current = 0
+    for outcome in outcomes:
+        current = current + 1 if outcome in accepted else 0
+        longest = max(longest, current)
+    return longest
+
+
+def _leading(outcomes: List[str], accepted: str) -> int:
+    count = 0
+    for outcome in outcomes:
+        if outcome not in accepted:
+            break
+        count += 1
+    return count
+
+
+def compute_streaks(outcomes: List[str]) -> dict:
+    """连续纪录，outcomes 按时间倒序（最近一场在前）"""
+    current = None
+    if outcomes:
+        current = {"outcome": outcomes[0], "length": _leading(outcomes, outcomes[0])}
+    chronological = outcomes[::-1]
+    return {
+        "current": current,
+        "unbeaten": _leading(outcomes, OUTCOME_WIN + OUTCOME_DRAW),
+        "winless": _leading(outcomes, OUTCOME_DRAW + OUTCOME_LOSS),
+        "longest_win": _longest(chronological, OUTCOME_WIN),
+        "longest_unbeaten": _longest(chronological, OUTCOME_WIN + OUTCOME_DRAW),
+        "longest_loss": _longest(chronological, OUTCOME_LOSS),
+    }
+
+
+def _form(
+    team_id: int, competition_id: Optional[int], records: dict, recent: list, outcomes: List[str]
+) -> dict:
+    return {
+        "team_id": team_id,
+        "competition_id": competition_id,
+        "form": "".join(row.outcome for row in recent),
+        **records,
+        "last_matches": [_result_item(row) for row in recent],
+        "streaks": compute_streaks(outcomes),
+    }
+
+
+async def team_exists(db: AsyncSession, team_id: int) -> bool:
+    result = await db.execute(select(Team.id).where(Team.id == team_id))
+    return result.scalar_one_or_none() is not None
+
+
+async def team_form(
+    db: AsyncSession, team_id: int, competition_id: Optional[int] = None, last: int = 5
+) -> dict:
+    """球队近况：最近 N 场、总战绩、主客场战绩和连续纪录"""
+    records = await _load_records(db, team_id, competition_id)
+    recent = await _load_results(db, team_id, competition_id, limit=last)
+    outcomes = await _load_outcomes(db, team_id, competition_id)
+    return _form(team_id, competition_id, records, recent, outcomes)
+
+
+async def team_streaks(
+    db: AsyncSession, team_id: int, competition_id: Optional[int] = None
+) -> dict:
+    outcomes = await _load_outcomes(db, team_id, competition_id)
+    return {
+        "team_id": team_id,
+        "competition_id": competition_id,
+        **compute_streaks(outcomes),
+    }
+
+
+def _head_to_head(
+    team_id: int, opponent_id: int, competition_id: Optional[int], records: dict, recent: list
+) -> dict:
+    overall = records["overall"]
+    return {
+        "team_id": team_id,
+        "opponent_id": opponent_id,
+        "competition_id": competition_id,
+        "played": overall["played"],
+        "team_wins": overall["won"],
+        "draws": overall["drawn"],
+        "opponent_wins": overall["lost"],
+        "team_goals": overall["goals_for"],
+        "opponent_goals": overall["goals_against"],
+        "team_home": records["home"],
+        "team_away": records["away"],
+        "last_meetings": [_result_item(row) for row in recent],
+    }
+
+
+async def head_to_head(
+    db: AsyncSession,
+    team_id: int,
+    opponent_id: int,
+    competition_id: Optional[int] = None,
+    last: int = 5,
+) -> dict:
+    """两队交锋记录，胜负以 team_id 一方的视角统计"""
+    records = await _load_records(db, team_id, competition_id, opponent_id)
+    recent = await _load_results(db, team_id, competition_id, opponent_id, limit=last)
+    return _head_to_head(team_id, opponent_id, competition_id, records, recent)
+
+
+async def match_preview(
+    db: AsyncSession, schedule: Schedule, competition_only: bool = False, last: int = 5
+) -> dict:
+    """赛前数据：两队近况和交锋记录"""
+    competition_id = schedule.competition_id if competition_only else None
+    home_id, away_id = schedule.home_team_id, schedule.away_team_id
+    return {
+        "schedule_id": schedule.id,
+        "competition_id": schedule.competition_id,
+        "match_date": schedule.match_date.isoformat() if schedule.match_date else None,
+        "home": await team_form(db, home_id, competition_id, last),
+        "away": await team_form(db, away_id, competition_id, last),
+        "head_to_head": await head_to_head(db, home_id, away_id, competition_id, last),
+    }
@@ -0,0 +1,162 @@
+"""报表流式导出
+
+查询通过 AsyncSession.stream 使用服务端游标按批读取，逐行编码后直接写入
+StreamingResponse，内存占用与导出行数无关。CSV 和 NDJSON 在读到第一批数据时即开始
+输出；XLSX 使用 openpyxl 只写模式写入临时文件（超过阈值后落盘），文件格式要求
+整体生成后才能发送。openpyxl 逐行序列化单元格是纯 CPU 工作，每批数据都在线程池中
+写入工作表，避免大导出期间阻塞事件循环。
+"""
+import csv
+import io
+import json
+import tempfile
+from typing import AsyncIterator, List, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+
+from app.models import Player, PlayerStatistics, Standing, Team
+
+# 服务端游标每批读取的行数
+STREAM_BATCH_SIZE = 1000
+# 读取 XLSX 临时文件时每次发送的字节数
+XLSX_CHUNK_SIZE = 64 * 1024
+# XLSX 临时文件在内存中保留的最大字节数
+XLSX_SPOOL_SIZE = 8 * 1024 * 1024
+
+# text/* 类型由 Starlette 自动追加 charset=utf-8
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def players_query(team_id: int = None) -> Select:
+    query = select(
+        Player.id,
+        Player.team_id,
+        Player.name,
+        Player.position,
+        Player.jersey_number,
+        Player.nationality,
+        Player.birth_date,
+        Player.height,
+        Player.weight,
+    ).order_by(Player.id)
+    if team_id:
+        query = query.where(Player.team_id == team_id)
+    return query
+
+
+def statistics_query(season: str = None) -> Select:
+    query = (
+        select(
+            PlayerStatistics.player_id,
+            Player.name.label("player_name"),
+            PlayerStatistics.season,
+            PlayerStatistics.appearance,
+            PlayerStatistics.goals,
+            PlayerStatistics.assists,
+            PlayerStatistics.yellow_cards,
+            PlayerStatistics.red_cards,
+            PlayerStatistics.minutes_played,
+        )
+        .join(Player, PlayerStatistics.player_id == Player.id)
+        .order_by(PlayerStatistics.id)
+    )
+    if season:
+        query = query.where(PlayerStatistics.season == season)
+    return query
+
+
+def standings_query(competition_id: int) -> Select:
+    return (
+        select(
+            Standing.rank,
+            Standing.team_id,
+            Team.name.label("team_name"),
+            Standing.played,
+            Standing.won,
+            Standing.drawn,
+            Standing.lost,
+            Standing.goals_for,
+            Standing.goals_against,
+            Standing.goal_difference,
+            Standing.points,
+        )
+        .join(Team, Standing.team_id == Team.id)
+        .where(Standing.competition_id == competition_id)
+        .order_by(Standing.rank, Standing.team_id)
+    )
+
+
+async def _stream_batches(db: AsyncSession, query: Select) -> AsyncIterator[Sequence]:
+    result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for batch in result.partitions(STREAM_BATCH_SIZE):
+        yield batch
+
+
+def _columns(query: Select) -> List[str]:
+    return [column.key for column in query.selected_columns]
+
+
+async def stream_csv(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_columns(query))
+    # 带 BOM 便于 Excel 正确识别中文
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+    async for batch in _stream_batches(db, query):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def stream_ndjson(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    columns = _columns(query)
+    async for batch in _stream_batches(db, query):
+        lines = [
+            json.dumps(jsonable_encoder(dict(zip(columns, row))), ensure_ascii=False)
+            for row in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _append_rows(sheet, rows) -> None:
+    for row in rows:
+        sheet.append(list(row))
+
+
+async def stream_xlsx(db: AsyncSession, query: Select, title: str) -> AsyncIterator[bytes]:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    sheet.append(_columns(query))
+
+    # 同一时刻只有一个线程写入工作表，批次按顺序依次提交
+    async for batch in _stream_batches(db, query):
+        await run_in_threadpool(_append_rows, sheet, batch)
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE) as output:
+        await run_in_threadpool(workbook.save, output)
+        output.seek(0)
+        while True:
+            chunk = await run_in_threadpool(output.read, XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream(db: AsyncSession, query: Select, fmt: str, title: str) -> AsyncIterator[bytes]:
+    """按格式返回字节流生成器"""
+    if fmt == "csv":
+        return stream_csv(db, query)
+    if fmt == "ndjson":
+        return stream_ndjson(db, query)
+    return stream_xlsx(db, query, title)
@@ -0,0 +1,181 @@
+"""赛程编排
+
+使用圆桌法（circle method）生成单循环或双循环赛程：固定一支球队，其余球队每轮
+轮转，球队数为奇数时补一个轮空位。主客场按 Berger 表规则交替，并避免同一轮两支
+共用主场的球队同时主场作战；双循环的第二阶段主客场对调，因此第一阶段同一轮共用
+主场的球队也不能同时客场作战。生成的赛程在一个事务内批量写入。
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import MatchRecord, Schedule, Team
+
+SCHEDULE_STATUS_PENDING = "待定"
+
+
+class FixtureError(ValueError):
+    """赛程参数无法满足"""
+
+
+class ScheduleExistsError(FixtureError):
+    """赛事已有赛程且未要求替换"""
+
+
+def round_robin_pairings(team_ids: Sequence[int]) -> List[List[Tuple[int, int]]]:
+    """圆桌法生成单循环每轮的 (主队, 客队)
+
+    固定位置的球队逐轮交替主客场，其余对阵按位置奇偶确定主客场，
+    每支球队连续主场或连续客场的次数最少（整个单循环共 n-2 次）。
+    """
+    teams: List[Optional[int]] = list(team_ids)
+    if len(teams) < 2:
+        raise FixtureError("At least two teams are required")
+    if len(set(teams)) != len(teams):
+        raise FixtureError("Duplicate teams")
+    if len(teams) % 2:
+        teams.append(None)  # 轮空
+
+    n = len(teams)
+    rounds = []
+    for round_index in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = teams[i], teams[n - 1 - i]
+            if a is None or b is None:
+                continue
+            a_home = round_index % 2 == 0 if i == 0 else i % 2 == 1
+            pairs.append((a, b) if a_home else (b, a))
+        rounds.append(pairs)
+        # 固定第一个位置，其余位置轮转
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def resolve_venue_conflicts(
+    rounds: List[List[Tuple[int, int]]],
+    venues: Dict[int, Optional[str]],
+    mirrored: bool = False,
+) -> List[List[Tuple[int, int]]]:
+    """同一轮两支共用主场的球队不能同时主场作战，冲突时尽量对调主客场
+
+    mirrored 为 True 时这些轮次还会主客场对调再踢一次，本轮的客队届时成为主队，
+    因此共用主场的球队同样不能同时客场作战。
+    """
+    result = []
+    for pairs in rounds:
+        home_venues: Set[str] = set()
+        away_venues: Set[str] = set()
+
+        def clashes(home: int, away: int) -> bool:
+            if venues.get(home) in home_venues:
+                return True
+            return mirrored and venues.get(away) in away_venues
+
+        fixtures = []
+        for home, away in pairs:
+            if clashes(home, away) and not clashes(away, home):
+                home, away = away, home
+            if venues.get(home):
+                home_venues.add(venues[home])
+            if mirrored and venues.get(away):
+                away_venues.add(venues[away])
+            fixtures.append((home, away))
+        result.append(fixtures)
+    return result
+
+
+def round_dates(
+    rounds: int,
+    start_date: date,
+    interval_days: int,
+    excluded_dates: Iterable[date] = (),
+    end_date: Optional[date] = None,
+) -> List[date]:
+    """计算每轮比赛日期，遇到排除日期顺延一天"""
+    if interval_days < 1:
+        raise FixtureError("interval_days must be positive")
+    excluded = set(excluded_dates)
+    dates = []
+    current = start_date
+    for _ in range(rounds):
+        while current in excluded:
+            current += timedelta(days=1)
+        if end_date is not None and current > end_date:
+            raise FixtureError("Schedule does not fit before the competition end date")
+        dates.append(current)
+        current += timedelta(days=interval_days)
+    return dates
+
+
+async def generate_schedule(
+    db: AsyncSession,
+    competition,
+    team_ids: Sequence[int],
+    start_date: date,
+    double_round: bool = True,
+    interval_days: int = 7,
+    excluded_dates: Iterable[date] = (),
+    match_time=None,
+    replace_existing: bool = False,
+) -> Tuple[int, int]:
+    """生成并写入赛事赛程，返回 (轮数, 比赛数)，由调用方提交事务"""
+    result = await db.execute(
+        select(Team.id, Team.home_ground).where(Team.id.in_(team_ids))
+    )
+    venues = {row.id: row.home_ground for row in result.all()}
+    missing = set(team_ids) - set(venues)
+    if missing:
+        raise FixtureError(f"Teams not found: {sorted(missing)}")
+
+    rounds = resolve_venue_conflicts(
+        round_robin_pairings(team_ids), venues, mirrored=double_round
+    )
+    if double_round:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+
+    dates = round_dates(
+        len(rounds),
+        start_date,
+        interval_days,
+        excluded_dates,
+        competition.end_date,
+    )
+
+    values = [
+        {
+            "competition_id": competition.id,
+            "round_number": round_number,
+            "match_date": match_date,
+            "match_time": match_time,
+            "home_team_id": home,
+            "away_team_id": away,
+            "venue": venues.get(home),
+            "status": SCHEDULE_STATUS_PENDING,
+        }
+        for round_number, (pairs, match_date) in enumerate(zip(rounds, dates), start=1)
+        for home, away in pairs
+    ]
+
+    if not replace_existing:
+        existing = await db.execute(
+            select(Schedule.id).where(Schedule.competition_id == competition.id).limit(1)
+        )
+        if existing.first() is not None:
+            raise ScheduleExistsError("Competition already has a schedule")
+    else:
+        played = await db.execute(
+            select(MatchRecord.id)
+            .join(Schedule, MatchRecord.schedule_id == Schedule.id)
+            .where(Schedule.competition_id == competition.id)
+            .limit(1)
+        )
+        if played.first() is not None:
+            raise FixtureError("Existing schedule already has match records")
+        await db.execute(
+            delete(Schedule).where(Schedule.competition_id == competition.id)
+        )
+    await db.execute(insert(Schedule), values)
+    return len(rounds), len(values)
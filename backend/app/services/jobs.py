@@ -0,0 +1,300 @@
+"""后台任务
+
+积分榜重建、赛季统计重算、赛果时间线和训练汇总重建、批量导入和报表生成可能耗时
+数分钟，接口只写入一条 job 记录并投递到 Celery，立即返回 202；worker 执行任务时
+把状态、进度和结果写回 job 表，客户端通过 GET /jobs/{id} 轮询。
+
+JOBS_EAGER 为 true 时不经过 broker，任务在 API 进程的事件循环中以 asyncio 任务
+执行，用于测试和没有 worker 的开发环境。
+"""
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Set, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import Cache, create_cache, get_cache
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db import AsyncSessionLocal
+from app.db.base import create_session_factory, create_unpooled_engine
+from app.models import Job
+from app.schemas.job import (
+    PlayerImportParams,
+    ReportParams,
+    StandingsRebuildParams,
+    StatisticsRebuildParams,
+    TimelineRebuildParams,
+    TrainingSummaryRebuildParams,
+)
+from app.services import analytics as analytics_service
+from app.services import exports as exports_service
+from app.services import player_import
+from app.services import player_stats as player_stats_service
+from app.services import standings as standings_service
+from app.services import training as training_service
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class JobQueueError(RuntimeError):
+    """任务无法投递到队列"""
+
+
+class JobContext:
+    """任务执行环境：工作会话、缓存和进度上报"""
+
+    def __init__(self, job_id: str, db: AsyncSession, session_factory, cache: Cache):
+        self.job_id = job_id
+        self.db = db
+        self.cache = cache
+        self._session_factory = session_factory
+
+    async def progress(self, percent: Optional[int] = None, message: Optional[str] = None) -> None:
+        """在独立的会话中提交进度，轮询方不必等任务结束就能看到"""
+        async with self._session_factory() as session:
+            job = await session.get(Job, self.job_id)
+            if percent is not None:
+                job.progress = max(0, min(100, int(percent)))
+            if message is not None:
+                job.message = message[:255]
+            await session.commit()
+
+
+Handler = Callable[[JobContext, BaseModel], Awaitable[dict]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    params_model: Type[BaseModel]
+    handler: Handler
+    superuser_only: bool = True
+    public: bool = True  # 能否通过 POST /jobs 直接提交
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(name: str, params_model: Type[BaseModel], **options):
+    """注册任务类型"""
+
+    def decorator(handler: Handler) -> Handler:
+        JOB_TYPES[name] = JobType(name, params_model, handler, **options)
+        return handler
+
+    return decorator
+
+
+@job_type("standings.rebuild", StandingsRebuildParams)
+async def rebuild_standings(ctx: JobContext, params: StandingsRebuildParams) -> dict:
+    standings = await standings_service.rebuild_standings(ctx.db, params.competition_id)
+    await ctx.db.commit()
+    await standings_service.invalidate(ctx.cache, params.competition_id)
+    return {"competition_id": params.competition_id, "teams": len(standings)}
+
+
+@job_type("statistics.rebuild", StatisticsRebuildParams)
+async def rebuild_statistics(ctx: JobContext, params: StatisticsRebuildParams) -> dict:
+    players = await player_stats_service.rebuild_season(ctx.db, params.season)
+    await ctx.db.commit()
+    return {"season": params.season, "players": players}
+
+
+@job_type("analytics.rebuild", TimelineRebuildParams)
+async def rebuild_timeline(ctx: JobContext, params: TimelineRebuildParams) -> dict:
+    matches = await analytics_service.rebuild_timeline(ctx.db, params.competition_id)
+    await ctx.db.commit()
+    if params.competition_id is None:
+        await ctx.cache.invalidate(analytics_service.CACHE_RESOURCE)
+    else:
+        await analytics_service.invalidate(ctx.cache, params.competition_id)
+    return {"competition_id": params.competition_id, "matches": matches}
+
+
+@job_type("training.rebuild", TrainingSummaryRebuildParams)
+async def rebuild_training_summary(ctx: JobContext, params: TrainingSummaryRebuildParams) -> dict:
+    rows = await training_service.rebuild_summary(ctx.db, params.team_id)
+    await ctx.db.commit()
+    await ctx.cache.invalidate(training_service.CACHE_RESOURCE)
+    return {"team_id": params.team_id, "rows": rows}
+
+
+@job_type("players.import", PlayerImportParams, public=False)
+async def import_players(ctx: JobContext, params: PlayerImportParams) -> dict:
+    size = os.path.getsize(params.path) or 1
+    try:
+        with open(params.path, "rb") as fileobj:
+
+            async def on_chunk(report: player_import.ImportReport) -> None:
+                # 按已读取的字节估算进度，XLSX 为压缩格式，只是近似值
+                await ctx.progress(
+                    min(99, fileobj.tell() * 100 // size), f"{report.total} rows processed"
+                )
+
+            rows = player_import.iter_rows(fileobj, params.filename)
+            report = await player_import.import_players(ctx.db, rows, on_chunk=on_chunk)
+    finally:
+        os.remove(params.path)
+    return report.to_dict()
+
+
+@job_type("reports.export", ReportParams, superuser_only=False)
+async def export_report(ctx: JobContext, params: ReportParams) -> dict:
+    if params.report == "players":
+        query = exports_service.players_query(params.team_id)
+    elif params.report == "statistics":
+        query = exports_service.statistics_query(params.season)
+    else:
+        query = exports_service.standings_query(params.competition_id)
+
+    media_type, extension = exports_service.FORMATS[params.format]
+    os.makedirs(settings.JOB_RESULT_DIR, exist_ok=True)
+    filename = f"{ctx.job_id}.{extension}"
+    size = 0
+    with open(os.path.join(settings.JOB_RESULT_DIR, filename), "wb") as output:
+        async for chunk in exports_service.stream(ctx.db, query, params.format, params.report):
+            output.write(chunk)
+            size += len(chunk)
+    return {
+        "file": filename,
+        "download_name": f"{params.report}.{extension}",
+        "media_type": media_type,
+        "size": size,
+    }
+
+
+def result_path(job: Job) -> Optional[str]:
+    """任务结果文件的路径，没有文件结果时返回 None"""
+    filename = (job.result or {}).get("file")
+    if not filename:
+        return None
+    return os.path.join(settings.JOB_RESULT_DIR, os.path.basename(filename))
+
+
+def validate_params(name: str, params: dict) -> BaseModel:
+    """按任务类型校验参数，类型不存在时抛出 KeyError，参数错误时抛出 ValidationError"""
+    return JOB_TYPES[name].params_model(**params)
+
+
+async def run_job(job_id: str, session_factory, cache: Cache) -> None:
+    """执行任务并写回状态；重复投递时已结束的任务直接跳过"""
+    async with session_factory() as session:
+        job = await session.get(Job, job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return
+        job.status = JOB_RUNNING
+        job.started_at = datetime.utcnow()
+        await session.commit()
+        name, raw_params = job.name, job.params or {}
+
+    result = None
+    error = None
+    async with session_factory() as db:
+        try:
+            # 任务类型或参数无效时同样记为失败，不让任务停留在 running
+            definition = JOB_TYPES.get(name)
+            if definition is None:
+                raise LookupError(f"unknown job type: {name}")
+            params = definition.params_model(**raw_params)
+            result = await definition.handler(JobContext(job_id, db, session_factory, cache), params)
+        except Exception as exc:
+            await db.rollback()
+            logger.exception("job %s (%s) failed", job_id, name)
+            error = str(exc) or type(exc).__name__
+
+    async with session_factory() as session:
+        job = await session.get(Job, job_id)
+        job.status = JOB_FAILED if error else JOB_SUCCEEDED
+        job.result = result
+        job.error = error
+        if not error:
+            job.progress = 100
+        job.finished_at = datetime.utcnow()
+        await session.commit()
+
+
+async def _run_in_worker(job_id: str) -> None:
+    # 每个任务在新的事件循环中运行，数据库连接和 Redis 连接都不跨任务复用；
+    # 会话与 API 进程配置一致（AppSession、SQL 计时）
+    engine = create_unpooled_engine(settings.DATABASE_URL)
+    cache = create_cache()
+    try:
+        await run_job(job_id, create_session_factory(engine), cache)
+    finally:
+        await cache.close()
+        await engine.dispose()
+
+
+@celery_app.task(name="jobs.execute")
+def execute_job(job_id: str) -> None:
+    asyncio.run(_run_in_worker(job_id))
+
+
+# JOBS_EAGER 模式下运行中的任务，保留引用避免被垃圾回收
+_local_tasks: Set[asyncio.Task] = set()
+
+
+async def submit(
+    db: AsyncSession, name: str, params: BaseModel, created_by: Optional[int]
+) -> Job:
+    """创建任务记录并投递，返回 pending 状态的任务"""
+    job = Job(
+        id=uuid.uuid4().hex,
+        name=name,
+        status=JOB_PENDING,
+        progress=0,
+        params=params.model_dump(mode="json"),
+        created_by=created_by,
+    )
+    db.add(job)
+    await db.commit()
+
+    if settings.JOBS_EAGER:
+        task = asyncio.create_task(run_job(job.id, AsyncSessionLocal, get_cache()))
+        _local_tasks.add(task)
+        task.add_done_callback(_local_tasks.discard)
+        return job
+
+    try:
+        # 投递是阻塞的网络调用，放到线程池中执行
+        await run_in_threadpool(execute_job.delay, job.id)
+    except Exception as exc:
+        logger.exception("failed to enqueue job %s", job.id)
+        job.status = JOB_FAILED
+        job.error = "job queue unavailable"
+        job.finished_at = datetime.utcnow()
+        await db.commit()
+        raise JobQueueError(str(exc)) from exc
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[Job]:
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    return result.scalar_one_or_none()
+
+
+async def list_jobs(
+    db: AsyncSession, created_by: Optional[int], skip: int = 0, limit: int = 50
+) -> list:
+    """按提交时间倒序列出任务，created_by 为 None 时列出全部"""
+    query = select(Job)
+    if created_by is not None:
+        query = query.where(Job.created_by == created_by)
+    result = await db.execute(
+        query.order_by(Job.created_at.desc(), Job.id).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
@@ -0,0 +1,190 @@
+"""比赛实时比分推送
+
+LiveHub 在进程内维护每场比赛的订阅者。比分或事件更新时只序列化一次，再分发给
+该场比赛的全部连接。每个订阅者只保存最新一条待发送消息：客户端消费慢时中间
+状态被合并丢弃，不会无限堆积内存，也不会拖慢其他连接。
+
+多进程部署时开启 LIVE_HUB_REDIS，更新通过 Redis pub/sub 发布，每个进程用一个
+订阅任务接收后再在本进程内分发。
+
+每场比赛的最新消息只在有订阅者时保留，用于新连接的首条推送；最后一个订阅者
+离开或比赛完赛后即删除，不随历史比赛数增长。没有保留消息时（如该场第一个连接），
+send_current_state 从数据库读取比赛当前状态作为首条推送。
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Set
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.db import AsyncSessionLocal
+from app.models import MatchRecord
+from app.services.standings import MATCH_STATUS_FINISHED
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """一个连接的订阅状态，只保留最新一条消息"""
+
+    __slots__ = ("pending", "event", "dropped")
+
+    def __init__(self):
+        self.pending: Optional[str] = None
+        self.event = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, message: str) -> None:
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = message
+        self.event.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[str]:
+        """等待下一条消息，超时返回 None"""
+        if self.pending is None:
+            try:
+                await asyncio.wait_for(self.event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        message, self.pending = self.pending, None
+        self.event.clear()
+        return message
+
+
+class LiveHub:
+    """比赛更新的发布/订阅中心"""
+
+    def __init__(self, use_redis: bool):
+        self.use_redis = use_redis
+        self.subscribers: Dict[int, Set[Subscriber]] = {}
+        self.last_message: Dict[int, str] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def channel_prefix(self) -> str:
+        return f"{cache.prefix}:live"
+
+    def subscribe(self, match_id: int) -> Subscriber:
+        subscriber = Subscriber()
+        self.subscribers.setdefault(match_id, set()).add(subscriber)
+        last = self.last_message.get(match_id)
+        if last is not None:
+            subscriber.offer(last)
+        return subscriber
+
+    def unsubscribe(self, match_id: int, subscriber: Subscriber) -> None:
+        subscribers = self.subscribers.get(match_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[match_id]
+            self.last_message.pop(match_id, None)
+
+    def connection_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def _fan_out(self, match_id: int, message: str, finished: bool) -> None:
+        subscribers = self.subscribers.get(match_id)
+        if subscribers and not finished:
+            self.last_message[match_id] = message
+        else:
+            self.last_message.pop(match_id, None)
+        for subscriber in subscribers or ():
+            subscriber.offer(message)
+
+    async def send_current_state(self, match_id: int, subscriber: Subscriber) -> None:
+        """订阅者还没有待发送消息时，从数据库读取比赛当前状态作为首条推送
+
+        在 subscribe 之后调用：读取期间发布的更新比数据库状态新，不会被覆盖。
+        """
+        if subscriber.pending is not None:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                match = await session.get(MatchRecord, match_id)
+        except Exception:
+            logger.warning("failed to load match %s for live subscriber", match_id, exc_info=True)
+            return
+        if match is not None and subscriber.pending is None:
+            subscriber.offer(_encode(match_payload(match)))
+
+    async def publish(self, match_id: int, payload: dict) -> None:
+        """发布一场比赛的最新状态"""
+        message = _encode(payload)
+        finished = payload.get("status") == MATCH_STATUS_FINISHED
+        if not self.use_redis:
+            self._fan_out(match_id, message, finished)
+            return
+        try:
+            await cache.client.publish(f"{self.channel_prefix}:{match_id}", message)
+        except Exception:
+            logger.warning("live publish via redis failed, delivering locally", exc_info=True)
+            self._fan_out(match_id, message, finished)
+
+    async def _listen_once(self) -> None:
+        pubsub = cache.client.pubsub()
+        await pubsub.psubscribe(f"{self.channel_prefix}:*")
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") != "pmessage":
+                    continue
+                channel = item["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                data = item["data"]
+                if isinstance(data, bytes):
+                    data = data.decode()
+                finished = json.loads(data).get("status") == MATCH_STATUS_FINISHED
+                self._fan_out(int(channel.rsplit(":", 1)[1]), data, finished)
+        finally:
+            await pubsub.close()
+
+    async def _listen(self) -> None:
+        """订阅 Redis 频道，连接断开后自动重连"""
+        while True:
+            try:
+                await self._listen_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("live hub redis listener failed, reconnecting", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self.use_redis and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+live_hub = LiveHub(use_redis=settings.LIVE_HUB_REDIS)
+
+
+def _encode(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def match_payload(match, events: Optional[List[dict]] = None) -> dict:
+    """比赛推送消息体，events 为本次新增的事件"""
+    payload = {
+        "match_id": match.id,
+        "home_team_id": match.home_team_id,
+        "away_team_id": match.away_team_id,
+        "home_goals": match.home_goals,
+        "away_goals": match.away_goals,
+        "status": match.status,
+        "updated_at": match.updated_at,
+    }
+    if events:
+        payload["events"] = events
+    return payload
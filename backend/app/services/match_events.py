@@ -0,0 +1,191 @@
+"""比赛事件存储
+
+比赛事件以 match_event 表逐条存储，可按比赛、球员、球队和事件类型走索引查询。
+MatchRecord.event_details 保留为同一事件列表的 JSON 副本，供旧客户端和球员统计
+汇总使用；通过本模块写入事件时两者同步更新。
+
+接口写入前已校验事件格式和引用的球员、球队；回填历史数据时数值字段按整数解析，
+引用不存在的球员或球队的事件跳过。
+"""
+import json
+import logging
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import MatchEvent, MatchRecord, Player, Schedule, Team
+from app.services.player_stats import as_int, parse_events
+
+logger = logging.getLogger(__name__)
+
+
+def to_row(match_id: int, event: dict) -> dict:
+    """事件字典转换为 match_event 行，非整数的数值字段视为空"""
+    return {
+        "match_id": match_id,
+        "minute": as_int(event.get("minute")),
+        "event_type": str(event["type"])[:30],
+        "player_id": as_int(event.get("player_id")),
+        "team_id": as_int(event.get("team_id")),
+        "related_player_id": as_int(event.get("assist_player_id")),
+        "minutes": as_int(event.get("minutes")),
+    }
+
+
+async def unknown_teams(db: AsyncSession, events: Iterable[dict]) -> List[int]:
+    """事件中引用但不存在的球队 ID"""
+    team_ids = {event["team_id"] for event in events if event.get("team_id") is not None}
+    if not team_ids:
+        return []
+    result = await db.execute(select(Team.id).where(Team.id.in_(team_ids)))
+    return sorted(team_ids - set(result.scalars().all()))
+
+
+async def _existing(db: AsyncSession, column, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    result = await db.execute(select(column).where(column.in_(ids)))
+    return set(result.scalars().all())
+
+
+async def _drop_dangling(db: AsyncSession, rows: List[dict]) -> List[dict]:
+    """去掉引用不存在的球员或球队的事件行"""
+    player_ids = {
+        player_id
+        for row in rows
+        for player_id in (row["player_id"], row["related_player_id"])
+        if player_id is not None
+    }
+    team_ids = {row["team_id"] for row in rows if row["team_id"] is not None}
+    players = await _existing(db, Player.id, player_ids) | {None}
+    teams = await _existing(db, Team.id, team_ids) | {None}
+    valid = [
+        row
+        for row in rows
+        if row["player_id"] in players
+        and row["related_player_id"] in players
+        and row["team_id"] in teams
+    ]
+    if len(valid) < len(rows):
+        logger.warning(
+            "skipped %d events referencing missing players or teams", len(rows) - len(valid)
+        )
+    return valid
+
+
+def to_event(row: MatchEvent) -> dict:
+    """match_event 行转换为事件字典（去掉空字段）"""
+    event = {
+        "type": row.event_type,
+        "minute": row.minute,
+        "player_id": row.player_id,
+        "team_id": row.team_id,
+        "assist_player_id": row.related_player_id,
+        "minutes": row.minutes,
+    }
+    return {key: value for key, value in event.items() if value is not None}
+
+
+def dump_events(events: Iterable[dict]) -> Optional[str]:
+    events = list(events)
+    return json.dumps(events, ensure_ascii=False) if events else None
+
+
+async def _insert(db: AsyncSession, match_id: int, events: List[dict]) -> None:
+    rows = [to_row(match_id, event) for event in events if event.get("type")]
+    if rows:
+        await db.execute(insert(MatchEvent), rows)
+
+
+async def replace_events(db: AsyncSession, match: MatchRecord, events: List[dict]) -> None:
+    """用给定事件列表替换比赛的全部事件"""
+    await db.execute(delete(MatchEvent).where(MatchEvent.match_id == match.id))
+    await _insert(db, match.id, events)
+    match.event_details = dump_events(events)
+
+
+async def append_events(db: AsyncSession, match: MatchRecord, events: List[dict]) -> None:
+    """追加事件，按分钟排序后同步 event_details"""
+    await _insert(db, match.id, events)
+    merged = parse_events(match.event_details) + list(events)
+    merged.sort(key=lambda event: (event.get("minute") is None, event.get("minute") or 0))
+    match.event_details = dump_events(merged)
+
+
+async def query_events(
+    db: AsyncSession,
+    match_id: int = None,
+    event_type: str = None,
+    player_id: int = None,
+    team_id: int = None,
+    competition_id: int = None,
+    round_number: int = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[MatchEvent]:
+    """按条件查询事件，赛事和轮次条件通过赛程关联"""
+    query = select(MatchEvent)
+    if match_id:
+        query = query.where(MatchEvent.match_id == match_id)
+    if event_type:
+        query = query.where(MatchEvent.event_type == event_type)
+    if player_id:
+        query = query.where(MatchEvent.player_id == player_id)
+    if team_id:
+        query = query.where(MatchEvent.team_id == team_id)
+    if competition_id or round_number:
+        query = query.join(MatchRecord, MatchEvent.match_id == MatchRecord.id).join(
+            Schedule, MatchRecord.schedule_id == Schedule.id
+        )
+        if competition_id:
+            query = query.where(Schedule.competition_id == competition_id)
+        if round_number:
+            query = query.where(Schedule.round_number == round_number)
+
+    result = await db.execute(
+        query.order_by(MatchEvent.match_id, MatchEvent.minute, MatchEvent.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def backfill(db: AsyncSession, batch_size: int = 500) -> int:
+    """把已有 event_details 中的事件写入 match_event 表，返回处理的比赛数
+
+    按 id 分批处理并逐批提交；已有事件行的比赛会被跳过，可重复执行。
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        result = await db.execute(
+            select(MatchRecord.id, MatchRecord.event_details)
+            .where(MatchRecord.id > last_id, MatchRecord.event_details.isnot(None))
+            .order_by(MatchRecord.id)
+            .limit(batch_size)
+        )
+        batch = result.all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        ids = [row.id for row in batch]
+        done = await db.execute(
+            select(MatchEvent.match_id).where(MatchEvent.match_id.in_(ids)).distinct()
+        )
+        skip = set(done.scalars().all())
+
+        rows = [
+            to_row(row.id, event)
+            for row in batch
+            if row.id not in skip
+            for event in parse_events(row.event_details)
+            if event.get("type")
+        ]
+        rows = await _drop_dangling(db, rows)
+        if rows:
+            await db.execute(insert(MatchEvent), rows)
+        await db.commit()
+        processed += len(batch) - len(skip)
+    return processed
@@ -0,0 +1,234 @@
+"""球员批量导入
+
+按行流式读取 CSV / XLSX 上传文件，每 BULK_IMPORT_CHUNK_SIZE 行校验一次并用一条
+批量 INSERT 写入，内存占用与文件大小无关。校验失败的行逐行报告，其余行照常导入。
+
+iter_rows 在返回前打开工作簿、解码表头，文件损坏或编码不对时直接抛出
+InvalidImportFile，不会先写入一部分。CSV 须为 UTF-8，表头之后无法解码的行作为
+该行的错误报告。
+"""
+import codecs
+import csv
+import itertools
+import zipfile
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models import Player, Team
+from app.schemas import PlayerCreate
+
+CSV_EXTENSIONS = (".csv",)
+XLSX_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+class UnsupportedFileType(ValueError):
+    """不支持的导入文件类型"""
+
+
+class InvalidImportFile(ValueError):
+    """文件无法解析：不是有效的工作簿，或 CSV 表头不是 UTF-8"""
+
+
+class RowError:
+    """无法解析的行，导入时作为该行的错误报告"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _clean(row: Dict[str, object]) -> Dict[str, object]:
+    """去掉空单元格，使可选字段取默认值"""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        cleaned[str(key).strip()] = value
+    return cleaned
+
+
+Row = Union[Dict[str, object], RowError]
+
+
+class _Utf8Lines:
+    """逐行解码二进制文件，记录自上次检查以来是否遇到无法解码的行"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.invalid = False
+
+    def __iter__(self) -> Iterator[str]:
+        for index, raw in enumerate(self.fileobj):
+            if index == 0 and raw.startswith(codecs.BOM_UTF8):
+                raw = raw[len(codecs.BOM_UTF8):]
+            try:
+                yield raw.decode("utf-8")
+            except UnicodeDecodeError:
+                self.invalid = True
+                yield raw.decode("utf-8", errors="replace")
+
+
+def _iter_csv(fileobj) -> Iterator[Row]:
+    lines = _Utf8Lines(fileobj)
+    reader = csv.DictReader(iter(lines))
+    try:
+        reader.fieldnames
+    except csv.Error as exc:
+        raise InvalidImportFile("Malformed CSV header") from exc
+    if lines.invalid:
+        raise InvalidImportFile("CSV file must be UTF-8 encoded")
+
+    def rows() -> Iterator[Row]:
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                yield RowError(f"Malformed CSV row: {exc}")
+                continue
+            if lines.invalid:
+                lines.invalid = False
+                yield RowError("Row is not valid UTF-8")
+                continue
+            yield _clean(row)
+
+    return rows()
+
+
+def _iter_xlsx(fileobj) -> Iterator[Row]:
+    # 只读模式按需解析工作表，不会把整个文件载入内存
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        sheet_rows = workbook.active.iter_rows(values_only=True)
+        header = next(sheet_rows, None)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, ValueError, OSError) as exc:
+        raise InvalidImportFile("Not a valid XLSX workbook") from exc
+
+    def rows() -> Iterator[Row]:
+        try:
+            if header is None:
+                return
+            columns = [str(name).strip() if name is not None else None for name in header]
+            for values in sheet_rows:
+                if all(value is None for value in values):
+                    continue
+                yield _clean(dict(zip(columns, values)))
+        finally:
+            workbook.close()
+
+    return rows()
+
+
+def iter_rows(fileobj, filename: str) -> Iterator[Row]:
+    """按文件扩展名选择解析器，先校验文件能否打开、表头能否解码"""
+    name = (filename or "").lower()
+    if name.endswith(CSV_EXTENSIONS):
+        return _iter_csv(fileobj)
+    if name.endswith(XLSX_EXTENSIONS):
+        return _iter_xlsx(fileobj)
+    raise UnsupportedFileType(filename)
+
+
+def check_file(path: str, filename: str) -> None:
+    """只做 iter_rows 的前置校验，供提交后台任务前使用"""
+    with open(path, "rb") as fileobj:
+        rows = iter_rows(fileobj, filename)
+        try:
+            next(rows, None)
+        finally:
+            rows.close()
+
+
+class ImportReport:
+    """导入结果，错误明细最多保留 BULK_IMPORT_MAX_ERRORS 条"""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.total = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, row_number: int, errors: list) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def _existing_team_ids(db: AsyncSession, team_ids) -> set:
+    if not team_ids:
+        return set()
+    result = await db.execute(select(Team.id).where(Team.id.in_(team_ids)))
+    return set(result.scalars().all())
+
+
+async def import_players(
+    db: AsyncSession,
+    rows: Iterator[Row],
+    chunk_size: Optional[int] = None,
+    on_chunk: Optional[Callable[[ImportReport], Awaitable[None]]] = None,
+) -> ImportReport:
+    """分块校验并批量写入球员，每个分块单独提交；on_chunk 在每块处理完后调用"""
+    chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+    report = ImportReport(settings.BULK_IMPORT_MAX_ERRORS)
+    # 表头占第 1 行，数据从第 2 行开始
+    numbered = enumerate(rows, start=2)
+
+    while True:
+        chunk = await run_in_threadpool(lambda: list(itertools.islice(numbered, chunk_size)))
+        if not chunk:
+            break
+        report.total += len(chunk)
+
+        valid = []
+        for row_number, row in chunk:
+            if isinstance(row, RowError):
+                report.add_error(row_number, [{"field": "", "message": row.message}])
+                continue
+            try:
+                valid.append((row_number, PlayerCreate(**row)))
+            except ValidationError as exc:
+                report.add_error(
+                    row_number,
+                    [
+                        {"field": ".".join(str(p) for p in error["loc"]), "message": error["msg"]}
+                        for error in exc.errors()
+                    ],
+                )
+
+        team_ids = await _existing_team_ids(db, {player.team_id for _, player in valid})
+        values = []
+        for row_number, player in valid:
+            if player.team_id not in team_ids:
+                report.add_error(row_number, [{"field": "team_id", "message": "Team not found"}])
+                continue
+            values.append(player.dict())
+
+        if values:
+            await db.execute(insert(Player), values)
+            await db.commit()
+            report.inserted += len(values)
+        if on_chunk is not None:
+            await on_chunk(report)
+
+    return report
@@ -0,0 +1,255 @@
+"""球员赛季统计汇总
+
+MatchRecord.event_details 保存 JSON 数组形式的比赛事件，例如::
+
+    [
+        {"type": "appearance", "player_id": 7, "team_id": 1, "minutes": 90},
+        {"type": "goal", "minute": 23, "player_id": 7, "team_id": 1, "assist_player_id": 9},
+        {"type": "yellow_card", "minute": 41, "player_id": 12, "team_id": 2}
+    ]
+
+比赛完赛或修改时只统计这一场的事件，把与上一次的差值以一条 upsert
+（col = col + 增量）累加到 PlayerStatistics，并发写入同一球员时不会丢失增量，
+首次写入也不会与唯一约束冲突；另提供按赛季整体重建的批处理模式，用 pandas
+向量化聚合。球员资料页直接读取汇总行。
+
+接口写入的事件已按 MatchEventCreate 校验；库中的历史数据仍可能有非整数的 ID 或
+出场时间，汇总时跳过这类事件而不是报错。
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Competition, MatchRecord, Player, PlayerStatistics, Schedule
+from app.services.standings import MATCH_STATUS_FINISHED
+
+logger = logging.getLogger(__name__)
+
+EVENT_APPEARANCE = "appearance"
+EVENT_GOAL = "goal"
+EVENT_ASSIST = "assist"
+EVENT_YELLOW_CARD = "yellow_card"
+EVENT_RED_CARD = "red_card"
+
+STAT_FIELDS = (
+    "appearance",
+    "goals",
+    "assists",
+    "yellow_cards",
+    "red_cards",
+    "minutes_played",
+)
+
+
+def parse_events(event_details: Optional[str]) -> List[dict]:
+    """解析事件 JSON，格式错误时记录日志并视为无事件"""
+    if not event_details:
+        return []
+    try:
+        events = json.loads(event_details)
+    except ValueError:
+        logger.warning("invalid event_details JSON, ignored")
+        return []
+    if not isinstance(events, list):
+        return []
+    return [event for event in events if isinstance(event, dict)]
+
+
+def as_int(value) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def event_rows(events: Iterable[dict]) -> List[dict]:
+    """把事件展开为 (player_id, 字段, 增量) 形式的行，ID 或出场时间不是整数的事件跳过"""
+    rows = []
+    for event in events:
+        event_type = event.get("type")
+        player_id = as_int(event.get("player_id"))
+        if player_id is None:
+            continue
+        if event_type == EVENT_APPEARANCE:
+            minutes = as_int(event.get("minutes") or 0)
+            if minutes is None:
+                logger.warning("invalid minutes in appearance event, ignored")
+                continue
+            rows.append({"player_id": player_id, "field": "appearance", "value": 1})
+            rows.append({"player_id": player_id, "field": "minutes_played", "value": minutes})
+        elif event_type == EVENT_GOAL:
+            rows.append({"player_id": player_id, "field": "goals", "value": 1})
+            assist_player_id = as_int(event.get("assist_player_id"))
+            if assist_player_id is not None:
+                rows.append({"player_id": assist_player_id, "field": "assists", "value": 1})
+        elif event_type == EVENT_ASSIST:
+            rows.append({"player_id": player_id, "field": "assists", "value": 1})
+        elif event_type == EVENT_YELLOW_CARD:
+            rows.append({"player_id": player_id, "field": "yellow_cards", "value": 1})
+        elif event_type == EVENT_RED_CARD:
+            rows.append({"player_id": player_id, "field": "red_cards", "value": 1})
+    return rows
+
+
+def match_contribution(
+    events: Iterable[dict], status: Optional[str]
+) -> Dict[int, Dict[str, int]]:
+    """一场比赛（已解析的事件）对各球员统计字段的贡献，只有已完成的比赛计入"""
+    if status != MATCH_STATUS_FINISHED:
+        return {}
+    totals: Dict[int, Dict[str, int]] = {}
+    for row in event_rows(events):
+        player = totals.setdefault(row["player_id"], dict.fromkeys(STAT_FIELDS, 0))
+        player[row["field"]] += row["value"]
+    return totals
+
+
+async def unknown_players(db: AsyncSession, events: Iterable[dict]) -> List[int]:
+    """事件中引用但不存在的球员 ID"""
+    player_ids = {
+        player_id
+        for event in events
+        for player_id in (event.get("player_id"), event.get("assist_player_id"))
+        if player_id is not None
+    }
+    if not player_ids:
+        return []
+    result = await db.execute(select(Player.id).where(Player.id.in_(player_ids)))
+    return sorted(player_ids - set(result.scalars().all()))
+
+
+def _diff(
+    before: Dict[int, Dict[str, int]], after: Dict[int, Dict[str, int]]
+) -> Dict[int, Dict[str, int]]:
+    deltas = {}
+    for player_id in set(before) | set(after):
+        old = before.get(player_id, {})
+        new = after.get(player_id, {})
+        delta = {field: new.get(field, 0) - old.get(field, 0) for field in STAT_FIELDS}
+        if any(delta.values()):
+            deltas[player_id] = delta
+    return deltas
+
+
+async def get_season(db: AsyncSession, schedule_id: int) -> Optional[str]:
+    """获取比赛所属赛事的赛季"""
+    result = await db.execute(
+        select(Competition.season)
+        .join(Schedule, Schedule.competition_id == Competition.id)
+        .where(Schedule.id == schedule_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def _upsert(dialect: str, values: List[dict]):
+    """插入统计行，已存在时把增量累加到各字段"""
+    table = PlayerStatistics.__table__
+
+    def accumulate(added) -> dict:
+        return {
+            **{
+                field: func.coalesce(table.c[field], 0) + added[field]
+                for field in STAT_FIELDS
+            },
+            "updated_at": added.updated_at,
+        }
+
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(values)
+        return statement.on_duplicate_key_update(accumulate(statement.inserted))
+    statement = sqlite.insert(table).values(values)
+    return statement.on_conflict_do_update(
+        index_elements=["player_id", "season"], set_=accumulate(statement.excluded)
+    )
+
+
+async def apply_match_events(
+    db: AsyncSession,
+    season: str,
+    before_events: Iterable[dict],
+    before_status: Optional[str],
+    after_events: Iterable[dict],
+    after_status: Optional[str],
+) -> int:
+    """把一场比赛事件的变化增量写入球员赛季统计，返回受影响的球员数
+
+    事件由调用方解析后传入；由调用方提交事务。
+    """
+    deltas = _diff(
+        match_contribution(before_events, before_status),
+        match_contribution(after_events, after_status),
+    )
+    if not deltas:
+        return 0
+
+    now = datetime.utcnow()
+    # 按球员 ID 排序，并发事务以相同顺序加锁，避免死锁
+    values = [
+        {
+            "player_id": player_id,
+            "season": season,
+            **deltas[player_id],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for player_id in sorted(deltas)
+    ]
+    await db.execute(_upsert(db.bind.dialect.name, values))
+    return len(deltas)
+
+
+def aggregate_season(event_details: Iterable[Optional[str]]) -> pd.DataFrame:
+    """向量化汇总多场比赛的事件，返回以 player_id 为索引、统计字段为列的表"""
+    rows = [row for details in event_details for row in event_rows(parse_events(details))]
+    if not rows:
+        return pd.DataFrame(columns=list(STAT_FIELDS), dtype="int64")
+    frame = pd.DataFrame.from_records(rows)
+    frame["player_id"] = frame["player_id"].astype("int64")
+    table = frame.pivot_table(
+        index="player_id", columns="field", values="value", aggfunc="sum", fill_value=0
+    )
+    return table.reindex(columns=list(STAT_FIELDS), fill_value=0).astype("int64")
+
+
+async def rebuild_season(db: AsyncSession, season: str) -> int:
+    """根据该赛季全部已完成比赛重建球员统计，返回有统计的球员数
+
+    已有的统计行先清零再写入汇总值，由调用方提交事务。
+    """
+    result = await db.execute(
+        select(MatchRecord.event_details)
+        .join(Schedule, MatchRecord.schedule_id == Schedule.id)
+        .join(Competition, Schedule.competition_id == Competition.id)
+        .where(
+            Competition.season == season,
+            MatchRecord.status == MATCH_STATUS_FINISHED,
+        )
+    )
+    table = aggregate_season(result.scalars().all())
+
+    existing = await db.execute(
+        select(PlayerStatistics).where(PlayerStatistics.season == season)
+    )
+    rows = {row.player_id: row for row in existing.scalars().all()}
+    for row in rows.values():
+        for field in STAT_FIELDS:
+            setattr(row, field, 0)
+
+    for player_id, values in zip(table.index.tolist(), table.to_dict("records")):
+        row = rows.get(player_id)
+        if row is None:
+            row = PlayerStatistics(player_id=player_id, season=season)
+            db.add(row)
+        for field in STAT_FIELDS:
+            setattr(row, field, int(values[field]))
+
+    await db.flush()
+    return len(table)
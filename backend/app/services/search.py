@@ -0,0 +1,107 @@
+"""球员与球队全文搜索
+
+MySQL 下使用带 ngram 解析器的 FULLTEXT 索引（可切分中文姓名），索引随增删改自动
+维护。结果按相关度排序，名称命中的权重高于简介等长文本。查询词不足 ngram 长度
+（ngram_token_size，默认 2）或使用其他数据库时，回退为只匹配名称：第一个词按名称
+前缀匹配（LIKE 'x%' 可走名称索引的范围扫描），其余词在该范围内按包含匹配。回退
+路径不搜索简介、国籍等长文本列，`%x%` 在这些列上只能全表扫描。
+"""
+import re
+from typing import List
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Player, Team
+
+NGRAM_TOKEN_SIZE = 2
+# 名称命中的相关度权重
+NAME_WEIGHT = 3.0
+
+# 布尔模式下有特殊含义的字符
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+
+def tokenize(q: str) -> List[str]:
+    return [token for token in _BOOLEAN_OPERATORS.sub(" ", q).split() if token]
+
+
+def boolean_query(tokens: List[str]) -> str:
+    """构造布尔模式查询：每个词都必须出现，最后一个词按前缀匹配以支持输入联想"""
+    terms = [f'+"{token}"' for token in tokens[:-1]]
+    terms.append(f"+{tokens[-1]}*")
+    return " ".join(terms)
+
+
+def _use_fulltext(db: AsyncSession, tokens: List[str]) -> bool:
+    return (
+        db.bind.dialect.name == "mysql"
+        and bool(tokens)
+        and all(len(token) >= NGRAM_TOKEN_SIZE for token in tokens)
+    )
+
+
+def _name_filter(column, tokens: List[str]):
+    """第一个词匹配名称前缀，其余词匹配名称中任意位置"""
+    return [column.startswith(tokens[0], autoescape=True)] + [
+        column.icontains(token, autoescape=True) for token in tokens[1:]
+    ]
+
+
+async def search_players(
+    db: AsyncSession, q: str, skip: int = 0, limit: int = 20
+) -> List[dict]:
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    columns = (
+        Player.id,
+        Player.name,
+        Player.team_id,
+        Player.position,
+        Player.nationality,
+    )
+    if _use_fulltext(db, tokens):
+        against = boolean_query(tokens)
+        name_score = match(Player.name, against=against).in_boolean_mode()
+        all_score = match(
+            Player.name, Player.nationality, Player.biography, against=against
+        ).in_boolean_mode()
+        score = (name_score * NAME_WEIGHT + all_score).label("score")
+        query = select(*columns, score).where(all_score > 0).order_by(score.desc(), Player.id)
+    else:
+        query = (
+            select(*columns, literal(1.0).label("score"))
+            .where(*_name_filter(Player.name, tokens))
+            .order_by(Player.name, Player.id)
+        )
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [dict(row._mapping) for row in result.all()]
+
+
+async def search_teams(
+    db: AsyncSession, q: str, skip: int = 0, limit: int = 20
+) -> List[dict]:
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    columns = (Team.id, Team.name, Team.home_ground)
+    if _use_fulltext(db, tokens):
+        against = boolean_query(tokens)
+        name_score = match(Team.name, against=against).in_boolean_mode()
+        all_score = match(Team.name, Team.description, against=against).in_boolean_mode()
+        score = (name_score * NAME_WEIGHT + all_score).label("score")
+        query = select(*columns, score).where(all_score > 0).order_by(score.desc(), Team.id)
+    else:
+        query = (
+            select(*columns, literal(1.0).label("score"))
+            .where(*_name_filter(Team.name, tokens))
+            .order_by(Team.name, Team.id)
+        )
+
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [dict(row._mapping) for row in result.all()]
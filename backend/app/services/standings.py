@@ -0,0 +1,255 @@
+"""积分榜增量计算
+
+积分榜以 Standing 表存储，每次比赛记录创建、修改或完赛时只对涉及的两支球队
+应用增量，再在同一事务内重新计算名次。读取积分榜只需按名次读取 Standing 行，
+代价为 O(球队数)，不再对比赛记录做聚合。
+
+积分榜缓存在资源 standings 下按赛事划分 scope，一场比赛的比分变化只使所属赛事
+的积分榜缓存失效。
+
+写入前以 SELECT ... FOR UPDATE 锁定该赛事的积分榜行，同一赛事的并发比分更新
+依次执行，后一个事务读到的是前一个已提交的结果，增量不会丢失。
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.models import MatchRecord, Schedule, Standing
+
+CACHE_RESOURCE = "standings"
+
+# 计入积分榜的比赛状态
+MATCH_STATUS_FINISHED = "已完成"
+
+# 积分规则：胜3分、平1分、负0分
+POINTS_WIN = 3
+POINTS_DRAW = 1
+POINTS_LOSS = 0
+
+STAT_FIELDS = ("played", "won", "drawn", "lost", "goals_for", "goals_against")
+
+
+@dataclass(frozen=True)
+class MatchSnapshot:
+    """比赛记录中影响积分榜的字段快照"""
+
+    home_team_id: int
+    away_team_id: int
+    home_goals: int
+    away_goals: int
+    status: Optional[str]
+
+    @classmethod
+    def of(cls, match: MatchRecord) -> "MatchSnapshot":
+        return cls(
+            home_team_id=match.home_team_id,
+            away_team_id=match.away_team_id,
+            home_goals=match.home_goals or 0,
+            away_goals=match.away_goals or 0,
+            status=match.status,
+        )
+
+    @property
+    def counted(self) -> bool:
+        """只有已完成的比赛计入积分榜"""
+        return self.status == MATCH_STATUS_FINISHED
+
+
+def cache_scope(competition_id: int) -> str:
+    return str(competition_id)
+
+
+async def invalidate(cache: Cache, competition_id: int) -> None:
+    """失效一个赛事的积分榜缓存"""
+    await cache.invalidate(CACHE_RESOURCE, scope=cache_scope(competition_id))
+
+
+def _contribution(snapshot: Optional[MatchSnapshot], sign: int) -> Dict[int, Dict[str, int]]:
+    """计算一场比赛对两支球队统计字段的贡献（sign 为 1 表示加，-1 表示减）"""
+    if snapshot is None or not snapshot.counted:
+        return {}
+
+    deltas: Dict[int, Dict[str, int]] = {}
+    sides = (
+        (snapshot.home_team_id, snapshot.home_goals, snapshot.away_goals),
+        (snapshot.away_team_id, snapshot.away_goals, snapshot.home_goals),
+    )
+    for team_id, scored, conceded in sides:
+        delta = deltas.setdefault(team_id, dict.fromkeys(STAT_FIELDS, 0))
+        delta["played"] += sign
+        delta["goals_for"] += sign * scored
+        delta["goals_against"] += sign * conceded
+        if scored > conceded:
+            delta["won"] += sign
+        elif scored == conceded:
+            delta["drawn"] += sign
+        else:
+            delta["lost"] += sign
+    return deltas
+
+
+def _merge(*parts: Dict[int, Dict[str, int]]) -> Dict[int, Dict[str, int]]:
+    merged: Dict[int, Dict[str, int]] = {}
+    for part in parts:
+        for team_id, delta in part.items():
+            target = merged.setdefault(team_id, dict.fromkeys(STAT_FIELDS, 0))
+            for field, value in delta.items():
+                target[field] += value
+    return {
+        team_id: delta
+        for team_id, delta in merged.items()
+        if any(delta.values())
+    }
+
+
+def _refresh_derived(standing: Standing) -> None:
+    """根据基础统计字段重新计算净胜球和积分"""
+    standing.goal_difference = (standing.goals_for or 0) - (standing.goals_against or 0)
+    standing.points = (
+        (standing.won or 0) * POINTS_WIN
+        + (standing.drawn or 0) * POINTS_DRAW
+        + (standing.lost or 0) * POINTS_LOSS
+    )
+
+
+def rank_standings(standings: Iterable[Standing]) -> List[Standing]:
+    """按积分、净胜球、进球数排序并写回名次，积分相同且净胜球、进球数相同时名次并列"""
+    ordered = sorted(
+        standings,
+        key=lambda s: (-(s.points or 0), -(s.goal_difference or 0), -(s.goals_for or 0), s.team_id),
+    )
+    previous_key = None
+    rank = 0
+    for position, standing in enumerate(ordered, start=1):
+        key = (standing.points, standing.goal_difference, standing.goals_for)
+        if key != previous_key:
+            rank = position
+            previous_key = key
+        standing.rank = rank
+    return ordered
+
+
+async def get_competition_id(db: AsyncSession, schedule_id: int) -> Optional[int]:
+    """根据赛程获取比赛所属的赛事"""
+    result = await db.execute(
+        select(Schedule.competition_id).where(Schedule.id == schedule_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _load_standings(db: AsyncSession, competition_id: int) -> Dict[int, Standing]:
+    """读取并锁定赛事的积分榜行，直到事务结束
+
+    populate_existing 使会话中已加载的对象也按加锁后读到的最新值刷新。
+    """
+    result = await db.execute(
+        select(Standing)
+        .where(Standing.competition_id == competition_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return {s.team_id: s for s in result.scalars().all()}
+
+
+def _new_standing(competition_id: int, team_id: int) -> Standing:
+    standing = Standing(competition_id=competition_id, team_id=team_id)
+    for field in STAT_FIELDS:
+        setattr(standing, field, 0)
+    _refresh_derived(standing)
+    return standing
+
+
+async def apply_match_change(
+    db: AsyncSession,
+    competition_id: int,
+    before: Optional[MatchSnapshot],
+    after: Optional[MatchSnapshot],
+) -> List[Standing]:
+    """将一场比赛从 before 变为 after 的增量应用到积分榜
+
+    创建比赛时 before 为 None，删除比赛时 after 为 None。
+    只修改会话中的对象，由调用方提交事务，保证比赛记录和积分榜一同生效。
+    """
+    deltas = _merge(_contribution(before, -1), _contribution(after, 1))
+    if not deltas:
+        return []
+
+    standings = await _load_standings(db, competition_id)
+    for team_id, delta in deltas.items():
+        standing = standings.get(team_id)
+        if standing is None:
+            standing = _new_standing(competition_id, team_id)
+            db.add(standing)
+            standings[team_id] = standing
+        for field, value in delta.items():
+            setattr(standing, field, (getattr(standing, field) or 0) + value)
+        _refresh_derived(standing)
+
+    ranked = rank_standings(standings.values())
+    await db.flush()
+    return ranked
+
+
+async def rebuild_standings(db: AsyncSession, competition_id: int) -> List[Standing]:
+    """根据全部已完成的比赛重建赛事积分榜，用于数据修复
+
+    已有的积分榜行会被清零后重新累加，没有已完成比赛的球队保留零分行。
+    """
+    standings = await _load_standings(db, competition_id)
+    for standing in standings.values():
+        for field in STAT_FIELDS:
+            setattr(standing, field, 0)
+
+    result = await db.execute(
+        select(
+            MatchRecord.home_team_id,
+            MatchRecord.away_team_id,
+            MatchRecord.home_goals,
+            MatchRecord.away_goals,
+            MatchRecord.status,
+        )
+        .join(Schedule, MatchRecord.schedule_id == Schedule.id)
+        .where(
+            Schedule.competition_id == competition_id,
+            MatchRecord.status == MATCH_STATUS_FINISHED,
+        )
+    )
+    totals: Dict[int, Dict[str, int]] = {}
+    for row in result.all():
+        snapshot = MatchSnapshot(
+            home_team_id=row.home_team_id,
+            away_team_id=row.away_team_id,
+            home_goals=row.home_goals or 0,
+            away_goals=row.away_goals or 0,
+            status=row.status,
+        )
+        totals = _merge(totals, _contribution(snapshot, 1))
+
+    for team_id, delta in totals.items():
+        standing = standings.get(team_id)
+        if standing is None:
+            standing = _new_standing(competition_id, team_id)
+            db.add(standing)
+            standings[team_id] = standing
+        for field, value in delta.items():
+            setattr(standing, field, value)
+
+    for standing in standings.values():
+        _refresh_derived(standing)
+
+    ranked = rank_standings(standings.values())
+    await db.flush()
+    return ranked
+
+
+async def list_standings(db: AsyncSession, competition_id: int) -> List[Standing]:
+    """按名次读取积分榜"""
+    result = await db.execute(
+        select(Standing)
+        .where(Standing.competition_id == competition_id)
+        .order_by(Standing.rank, Standing.team_id)
+    )
+    return list(result.scalars().all())
@@ -0,0 +1,360 @@
+"""训练出勤与表现汇总
+
+每条训练记录按（球队、训练日期、球员）计入 training_daily_summary 表。记录的创建、
+修改、删除以及训练计划改期、换队都只对涉及的汇总行应用增量（与积分榜的做法相同），
+由调用方在同一事务内提交。看板按日期区间对汇总表做 GROUP BY，读取的行数与天数
+和球员数相关，与训练记录总数无关。
+
+增量以 upsert（MySQL 的 ON DUPLICATE KEY UPDATE，SQLite 的 ON CONFLICT DO UPDATE）
+写入，SET col = col + 增量由数据库在行锁内完成：并发修改同一天记录的请求不会互相
+覆盖，同时为同一行插入也不会违反唯一约束。
+
+结果缓存在资源 training 下，任何训练数据变化都使其整体失效。
+"""
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, tuple_
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TrainingDailySummary, TrainingPlan, TrainingRecord
+
+ATTENDANCE_PRESENT = "出席"
+ATTENDANCE_LATE = "迟到"
+ATTENDANCE_ABSENT = "缺席"
+
+CACHE_RESOURCE = "training"
+
+# 看板默认统计最近 90 天，区间最长一年
+DEFAULT_RANGE_DAYS = 90
+MAX_RANGE_DAYS = 366
+
+SUMMARY_FIELDS = (
+    "sessions",
+    "attended",
+    "late",
+    "absent",
+    "completion_total",
+    "completion_count",
+    "score_total",
+    "score_count",
+)
+
+SummaryKey = Tuple[int, date, int]
+
+
+@dataclass(frozen=True)
+class RecordSnapshot:
+    """训练记录中影响汇总的字段快照"""
+
+    team_id: Optional[int]
+    summary_date: Optional[date]
+    player_id: Optional[int]
+    attendance: Optional[str]
+    completion_rate: Optional[int]
+    performance_score: Optional[int]
+
+    @classmethod
+    def of(cls, record: TrainingRecord, plan: TrainingPlan) -> "RecordSnapshot":
+        return cls(
+            team_id=plan.team_id,
+            summary_date=plan.scheduled_date,
+            player_id=record.player_id,
+            attendance=record.attendance,
+            completion_rate=record.completion_rate,
+            performance_score=record.performance_score,
+        )
+
+    @property
+    def key(self) -> SummaryKey:
+        return (self.team_id, self.summary_date, self.player_id)
+
+    @property
+    def counted(self) -> bool:
+        """计划没有球队或日期时无法归入汇总"""
+        return None not in self.key
+
+
+def _contribution(snapshot: RecordSnapshot, sign: int) -> Dict[str, int]:
+    delta = dict.fromkeys(SUMMARY_FIELDS, 0)
+    delta["sessions"] = sign
+    if snapshot.attendance in (ATTENDANCE_PRESENT, ATTENDANCE_LATE):
+        delta["attended"] = sign
+    if snapshot.attendance == ATTENDANCE_LATE:
+        delta["late"] = sign
+    if snapshot.attendance == ATTENDANCE_ABSENT:
+        delta["absent"] = sign
+    if snapshot.completion_rate is not None:
+        delta["completion_total"] = sign * snapshot.completion_rate
+        delta["completion_count"] = sign
+    if snapshot.performance_score is not None:
+        delta["score_total"] = sign * snapshot.performance_score
+        delta["score_count"] = sign
+    return delta
+
+
+def _deltas(
+    before: Iterable[RecordSnapshot], after: Iterable[RecordSnapshot]
+) -> Dict[SummaryKey, Dict[str, int]]:
+    merged: Dict[SummaryKey, Dict[str, int]] = {}
+    for snapshots, sign in ((before, -1), (after, 1)):
+        for snapshot in snapshots:
+            if snapshot is None or not snapshot.counted:
+                continue
+            target = merged.setdefault(snapshot.key, dict.fromkeys(SUMMARY_FIELDS, 0))
+            for field, value in _contribution(snapshot, sign).items():
+                target[field] += value
+    return {key: delta for key, delta in merged.items() if any(delta.values())}
+
+
+async def apply_changes(
+    db: AsyncSession,
+    before: Iterable[RecordSnapshot],
+    after: Iterable[RecordSnapshot],
+) -> int:
+    """把训练记录从 before 变为 after 的增量写入每日汇总，返回受影响的汇总行数
+
+    新建记录时 before 为空，删除时 after 为空；计划改期或换队时传入该计划全部
+    记录的前后快照。只修改会话中的对象，由调用方提交事务。
+    """
+    deltas = _deltas(before, after)
+    if not deltas:
+        return 0
+
+    now = datetime.utcnow()
+    # 按键排序，并发事务以相同顺序加锁，避免死锁
+    values = [
+        {
+            "team_id": team_id,
+            "summary_date": summary_date,
+            "player_id": player_id,
+            **deltas[(team_id, summary_date, player_id)],
+            "updated_at": now,
+        }
+        for team_id, summary_date, player_id in sorted(deltas)
+    ]
+    await db.execute(_upsert(db.bind.dialect.name, values))
+
+    # 当天已没有训练记录的行删除；汇总中原本缺少的行（如旧数据尚未重建）减去增量后
+    # 也会在这里删除，留给 rebuild_summary 修复
+    removed = [key for key, delta in deltas.items() if delta["sessions"] < 0]
+    if removed:
+        await db.execute(
+            delete(TrainingDailySummary).where(
+                tuple_(
+                    TrainingDailySummary.team_id,
+                    TrainingDailySummary.summary_date,
+                    TrainingDailySummary.player_id,
+                ).in_(removed),
+                TrainingDailySummary.sessions <= 0,
+            )
+        )
+    return len(deltas)
+
+
+def _upsert(dialect: str, values: List[dict]):
+    """插入汇总行，已存在时把增量累加到各字段"""
+    table = TrainingDailySummary.__table__
+    if dialect == "mysql":
+        statement = mysql.insert(table).values(values)
+        added = statement.inserted
+        return statement.on_duplicate_key_update(
+            {
+                **{field: table.c[field] + added[field] for field in SUMMARY_FIELDS},
+                "updated_at": added.updated_at,
+            }
+        )
+    statement = sqlite.insert(table).values(values)
+    added = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=["team_id", "summary_date", "player_id"],
+        set_={
+            **{field: table.c[field] + added[field] for field in SUMMARY_FIELDS},
+            "updated_at": added.updated_at,
+        },
+    )
+
+
+async def plan_snapshots(db: AsyncSession, plan: TrainingPlan) -> List[RecordSnapshot]:
+    """训练计划下全部记录的快照"""
+    result = await db.execute(
+        select(TrainingRecord).where(TrainingRecord.training_plan_id == plan.id)
+    )
+    return [RecordSnapshot.of(record, plan) for record in result.scalars().all()]
+
+
+def move_snapshots(
+    snapshots: Iterable[RecordSnapshot], plan: TrainingPlan
+) -> List[RecordSnapshot]:
+    """计划改期或换队后记录的快照"""
+    return [
+        replace(snapshot, team_id=plan.team_id, summary_date=plan.scheduled_date)
+        for snapshot in snapshots
+    ]
+
+
+async def rebuild_summary(db: AsyncSession, team_id: Optional[int] = None) -> int:
+    """用一条 INSERT ... SELECT ... GROUP BY 重建每日汇总（不指定球队时重建全部），
+    返回汇总行数，用于数据修复
+    """
+    attended = (ATTENDANCE_PRESENT, ATTENDANCE_LATE)
+    query = (
+        select(
+            TrainingPlan.team_id,
+            TrainingPlan.scheduled_date,
+            TrainingRecord.player_id,
+            func.count(TrainingRecord.id),
+            func.sum(case((TrainingRecord.attendance.in_(attended), 1), else_=0)),
+            func.sum(case((TrainingRecord.attendance == ATTENDANCE_LATE, 1), else_=0)),
+            func.sum(case((TrainingRecord.attendance == ATTENDANCE_ABSENT, 1), else_=0)),
+            func.coalesce(func.sum(TrainingRecord.completion_rate), 0),
+            func.count(TrainingRecord.completion_rate),
+            func.coalesce(func.sum(TrainingRecord.performance_score), 0),
+            func.count(TrainingRecord.performance_score),
+            func.current_timestamp(),
+        )
+        .join(TrainingPlan, TrainingRecord.training_plan_id == TrainingPlan.id)
+        .where(
+            TrainingPlan.team_id.is_not(None),
+            TrainingPlan.scheduled_date.is_not(None),
+            TrainingRecord.player_id.is_not(None),
+        )
+        .group_by(TrainingPlan.team_id, TrainingPlan.scheduled_date, TrainingRecord.player_id)
+    )
+    clear = delete(TrainingDailySummary)
+    if team_id is not None:
+        query = query.where(TrainingPlan.team_id == team_id)
+        clear = clear.where(TrainingDailySummary.team_id == team_id)
+
+    await db.execute(clear)
+    result = await db.execute(
+        insert(TrainingDailySummary).from_select(
+            ["team_id", "summary_date", "player_id", *SUMMARY_FIELDS, "updated_at"], query
+        )
+    )
+    return result.rowcount
+
+
+def _sum_columns() -> list:
+    return [
+        func.coalesce(func.sum(getattr(TrainingDailySummary, field)), 0).label(field)
+        for field in SUMMARY_FIELDS
+    ]
+
+
+def _ratio(total: int, count: int, scale: int = 1) -> Optional[float]:
+    return round(total * scale / count, 1) if count else None
+
+
+def _totals(sums: Dict[str, int]) -> dict:
+    return {
+        "sessions": sums["sessions"],
+        "attended": sums["attended"],
+        "late": sums["late"],
+        "absent": sums["absent"],
+        "attendance_rate": _ratio(sums["attended"], sums["sessions"], 100),
+        "avg_completion": _ratio(sums["completion_total"], sums["completion_count"]),
+        "avg_score": _ratio(sums["score_total"], sums["score_count"]),
+    }
+
+
+def _row_sums(row) -> Dict[str, int]:
+    return {field: int(getattr(row, field) or 0) for field in SUMMARY_FIELDS}
+
+
+def _add(target: Dict[str, int], row, sign: int = 1) -> None:
+    for field, value in _row_sums(row).items():
+        target[field] += sign * value
+
+
+def _trend(daily: list, start: date, window: int) -> Tuple[Dict[str, int], List[dict]]:
+    """按日期升序的每日汇总计算区间合计和滚动窗口趋势
+
+    daily 从 start 之前 window - 1 天开始，使区间第一天的滚动值也覆盖完整窗口。
+    """
+    totals = dict.fromkeys(SUMMARY_FIELDS, 0)
+    rolling = dict.fromkeys(SUMMARY_FIELDS, 0)
+    in_window = deque()
+    points = []
+    for row in daily:
+        in_window.append(row)
+        _add(rolling, row)
+        while in_window[0].summary_date <= row.summary_date - timedelta(days=window):
+            _add(rolling, in_window.popleft(), -1)
+        if row.summary_date < start:
+            continue
+        _add(totals, row)
+        window_totals = _totals(rolling)
+        points.append({
+            "date": row.summary_date.isoformat(),
+            **_totals(_row_sums(row)),
+            "rolling_attendance_rate": window_totals["attendance_rate"],
+            "rolling_avg_completion": window_totals["avg_completion"],
+            "rolling_avg_score": window_totals["avg_score"],
+        })
+    return totals, points
+
+
+async def _daily(db: AsyncSession, condition, start: date, end: date, window: int) -> list:
+    warmup = start - timedelta(days=window - 1)
+    result = await db.execute(
+        select(TrainingDailySummary.summary_date, *_sum_columns())
+        .where(
+            condition,
+            TrainingDailySummary.summary_date >= warmup,
+            TrainingDailySummary.summary_date <= end,
+        )
+        .group_by(TrainingDailySummary.summary_date)
+        .order_by(TrainingDailySummary.summary_date)
+    )
+    return result.all()
+
+
+async def player_dashboard(
+    db: AsyncSession, player_id: int, start: date, end: date, window: int
+) -> dict:
+    """球员在区间内的出勤率、平均完成度和评分，以及按训练日的滚动趋势"""
+    daily = await _daily(db, TrainingDailySummary.player_id == player_id, start, end, window)
+    totals, trend = _trend(daily, start, window)
+    return {
+        "player_id": player_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "window": window,
+        "totals": _totals(totals),
+        "trend": trend,
+    }
+
+
+async def team_dashboard(
+    db: AsyncSession, team_id: int, start: date, end: date, window: int
+) -> dict:
+    """球队在区间内的整体和每名球员的出勤与表现，以及按训练日的滚动趋势"""
+    daily = await _daily(db, TrainingDailySummary.team_id == team_id, start, end, window)
+    totals, trend = _trend(daily, start, window)
+
+    result = await db.execute(
+        select(TrainingDailySummary.player_id, *_sum_columns())
+        .where(
+            TrainingDailySummary.team_id == team_id,
+            TrainingDailySummary.summary_date >= start,
+            TrainingDailySummary.summary_date <= end,
+        )
+        .group_by(TrainingDailySummary.player_id)
+        .order_by(TrainingDailySummary.player_id)
+    )
+    players = [
+        {"player_id": row.player_id, **_totals(_row_sums(row))} for row in result.all()
+    ]
+    return {
+        "team_id": team_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "window": window,
+        "totals": _totals(totals),
+        "players": players,
+        "trend": trend,
+    }
@@ -0,0 +1,502 @@
+"""API 负载基准
+
+在本地 SQLite（aiosqlite）数据库上启动 app.main:app，写入 benchmarks.seed 生成的
+数据后，用 httpx 的 ASGI 传输并发请求各读接口，统计每个路由的吞吐量、
+p50/p95/p99 延迟和每个请求执行的 SQL 条数，结果保存为 JSON。传入 --baseline
+时与之前的结果比较，p95 延迟或吞吐量退化超过阈值则以非零状态退出。
+
+登录饱和场景（路由名 POST /auth/login）并发发出超过密码哈希工作池容量的登录请求，
+同时请求读接口，检查 bcrypt 计算不阻塞事件循环：读接口 p95 和事件循环延迟与只有
+读请求时的基线相比在限额内，超出容量的登录请求立即返回带 Retry-After 的 503。
+任一检查失败时以非零状态退出。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.load --output bench.json
+    python -m benchmarks.load --teams 40 --concurrency 50 --baseline bench.json
+    python -m benchmarks.load --routes login --login-requests 400
+
+--database-url 可改用 MySQL 等其他数据库，此时数据库需为空库。
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+_DEFAULT_DB = os.path.join(tempfile.gettempdir(), "football_bench.db")
+_DEFAULT_URL = f"sqlite+aiosqlite:///{_DEFAULT_DB}"
+
+SEARCH_TERMS = ("球队", "王", "李伟", "体育场")
+
+LOGIN_ROUTE = "POST /auth/login"
+LOGIN_USERNAME = "bench-login"
+LOGIN_PASSWORD = "bench-password"
+# 登录饱和期间测量延迟的读接口
+LOGIN_PROBE_ROUTE = "GET /players/{id}"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="API load benchmark")
+    parser.add_argument("--database-url", default=_DEFAULT_URL)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--players-per-team", type=int, default=25)
+    parser.add_argument("--seasons", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="每个路由的请求数")
+    parser.add_argument("--routes", default=None, help="只运行名称包含该子串的路由")
+    parser.add_argument("--output", default=None, help="结果 JSON 路径")
+    parser.add_argument("--baseline", default=None, help="用于比较的基线结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的退化比例")
+    parser.add_argument(
+        "--login-requests", type=int, default=300, help="登录饱和场景的并发登录请求数"
+    )
+    parser.add_argument(
+        "--login-latency-factor",
+        type=float,
+        default=3.0,
+        help="登录饱和期间读接口 p95 允许为基线 p95 的倍数",
+    )
+    parser.add_argument(
+        "--login-latency-slack-ms", type=float, default=50.0, help="在倍数之外允许的额外毫秒数"
+    )
+    parser.add_argument(
+        "--login-max-loop-lag-ms",
+        type=float,
+        default=100.0,
+        help="登录饱和期间事件循环延迟 p99 允许高出基线的毫秒数",
+    )
+    args = parser.parse_args(argv)
+    if args.players_per_team < 11:
+        parser.error("--players-per-team must be at least 11")
+    return args
+
+
+def percentile(values: List[float], q: float) -> float:
+    """线性插值百分位"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class Route:
+    name: str
+    make_path: Callable[[random.Random], str]
+
+
+@dataclass
+class RouteResult:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "throughput": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "mean": round(sum(self.latencies) / count, 3) if count else 0.0,
+                "p50": round(percentile(self.latencies, 0.50), 3),
+                "p95": round(percentile(self.latencies, 0.95), 3),
+                "p99": round(percentile(self.latencies, 0.99), 3),
+            },
+            "queries_per_request": {
+                "mean": round(sum(self.queries) / count, 2) if count else 0.0,
+                "max": max(self.queries, default=0),
+            },
+        }
+
+
+def build_routes(summary) -> List[Route]:
+    """基准覆盖的读接口，路径参数从生成的数据中随机选取"""
+    from benchmarks.seed import TRAINING_START
+
+    teams, players = summary.team_ids, summary.player_ids
+    competitions, matches = summary.competition_ids, summary.match_ids
+    prefix = "/api/v1"
+    training_range = f"start={TRAINING_START}&end={TRAINING_START + timedelta(days=89)}"
+    return [
+        Route("GET /teams", lambda rng: f"{prefix}/teams?limit=50"),
+        Route("GET /teams/{id}", lambda rng: f"{prefix}/teams/{rng.choice(teams)}"),
+        Route(
+            "GET /players?team_id",
+            lambda rng: f"{prefix}/players?team_id={rng.choice(teams)}",
+        ),
+        Route("GET /players/{id}", lambda rng: f"{prefix}/players/{rng.choice(players)}"),
+        Route("GET /competitions", lambda rng: f"{prefix}/competitions"),
+        Route(
+            "GET /competitions/{id}/standings",
+            lambda rng: f"{prefix}/competitions/{rng.choice(competitions)}/standings",
+        ),
+        Route(
+            "GET /competitions/{id}/schedules",
+            lambda rng: f"{prefix}/competitions/{rng.choice(competitions)}/schedules"
+            f"?round_number={rng.randint(1, 10)}",
+        ),
+        Route("GET /matches/{id}", lambda rng: f"{prefix}/matches/{rng.choice(matches)}"),
+        Route(
+            "GET /matches/{id}/events",
+            lambda rng: f"{prefix}/matches/{rng.choice(matches)}/events",
+        ),
+        Route(
+            "GET /matches/events?player_id",
+            lambda rng: f"{prefix}/matches/events?player_id={rng.choice(players)}",
+        ),
+        Route("GET /search", lambda rng: f"{prefix}/search?q={rng.choice(SEARCH_TERMS)}"),
+        Route(
+            "GET /training/dashboard/teams/{id}",
+            lambda rng: f"{prefix}/training/dashboard/teams/{rng.choice(teams)}?{training_range}",
+        ),
+        Route(
+            "GET /training/dashboard/players/{id}",
+            lambda rng: f"{prefix}/training/dashboard/players/{rng.choice(players)}"
+            f"?{training_range}",
+        ),
+    ]
+
+
+# 当前请求的 SQL 计数器；每个请求在自己的上下文中设置一个新的列表
+_query_counter: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "bench_query_counter", default=None
+)
+
+
+def install_query_counter(engine) -> None:
+    from sqlalchemy import event
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+async def run_route(client, route: Route, args, rng: random.Random) -> RouteResult:
+    result = RouteResult(route.name)
+    paths = [route.make_path(rng) for _ in range(args.requests)]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(path: str):
+        async with semaphore:
+            counter = [0]
+            _query_counter.set(counter)
+            start = time.perf_counter()
+            response = await client.get(path)
+            result.latencies.append((time.perf_counter() - start) * 1000)
+            result.queries.append(counter[0])
+            if response.status_code >= 400:
+                result.errors += 1
+
+    # 预热：按并发数先发一批请求，填充缓存并建立连接池中的连接
+    await asyncio.gather(*(client.get(path) for path in paths[: args.concurrency]))
+    start = time.perf_counter()
+    await asyncio.gather(*(asyncio.create_task(one(path)) for path in paths))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def create_login_user() -> None:
+    """写入登录场景使用的用户，密码哈希与线上相同（bcrypt）"""
+    from app.core.security import hash_password
+    from app.db import AsyncSessionLocal
+    from app.models import User
+
+    async with AsyncSessionLocal() as session:
+        session.add(
+            User(
+                username=LOGIN_USERNAME,
+                email=f"{LOGIN_USERNAME}@example.com",
+                password=hash_password(LOGIN_PASSWORD),
+                is_active=True,
+            )
+        )
+        await session.commit()
+
+
+async def _probe(client, probe: Route, rng: random.Random, count: int, concurrency: int) -> List[float]:
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await client.get(probe.make_path(rng))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def run_login_saturation(client, probe: Route, args, rng: random.Random) -> dict:
+    """并发登录压满密码哈希工作池，同时测量读接口延迟和事件循环延迟"""
+    from app.core.hashing import password_hasher
+
+    probe_count = max(args.concurrency * 5, 100)
+    await _probe(client, probe, rng, args.concurrency, args.concurrency)  # 预热
+
+    async def watch_loop(lag: List[float], done: asyncio.Event, interval: float = 0.01):
+        # 定时器实际唤醒时间与预期之差即事件循环被占用的时长
+        while not done.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    # 基线：只有读请求时的延迟和事件循环延迟（客户端与应用在同一事件循环中）
+    baseline_lag: List[float] = []
+    baseline_done = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(baseline_lag, baseline_done))
+    baseline = await _probe(client, probe, rng, probe_count, args.concurrency)
+    baseline_done.set()
+    await watcher
+
+    statuses: Dict[int, int] = {}
+    missing_retry_after = 0
+    login_latencies: List[float] = []
+    saturated: List[float] = []
+    loop_lag: List[float] = []
+    done = asyncio.Event()
+
+    async def login():
+        nonlocal missing_retry_after
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"username": LOGIN_USERNAME, "password": LOGIN_PASSWORD},
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            login_latencies.append((time.perf_counter() - start) * 1000)
+        elif response.status_code == 503 and "retry-after" not in response.headers:
+            missing_retry_after += 1
+
+    async def probe_until_done():
+        while not done.is_set():
+            saturated.extend(await _probe(client, probe, rng, args.concurrency, args.concurrency))
+
+    background = [
+        asyncio.create_task(probe_until_done()),
+        asyncio.create_task(watch_loop(loop_lag, done)),
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(args.login_requests)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*background)
+
+    baseline_p95 = percentile(baseline, 0.95)
+    saturated_p95 = percentile(saturated, 0.95)
+    budget = baseline_p95 * args.login_latency_factor + args.login_latency_slack_ms
+    baseline_lag_p99 = percentile(baseline_lag, 0.99)
+    lag_p99 = percentile(loop_lag, 0.99)
+    ok, rejected = statuses.get(200, 0), statuses.get(503, 0)
+
+    failures = []
+    if saturated_p95 > budget:
+        failures.append(
+            f"{probe.name} p95 {saturated_p95:.2f}ms during login saturation "
+            f"exceeds {budget:.2f}ms (baseline {baseline_p95:.2f}ms)"
+        )
+    if lag_p99 > baseline_lag_p99 + args.login_max_loop_lag_ms:
+        failures.append(
+            f"event loop lag p99 {lag_p99:.2f}ms exceeds baseline {baseline_lag_p99:.2f}ms "
+            f"by more than {args.login_max_loop_lag_ms}ms"
+        )
+    if args.login_requests > password_hasher.capacity and not rejected:
+        failures.append("no login was rejected although requests exceeded hasher capacity")
+    if missing_retry_after:
+        failures.append(f"{missing_retry_after} rejected logins had no Retry-After header")
+    if ok + rejected != args.login_requests:
+        failures.append(f"unexpected login statuses: {statuses}")
+
+    return {
+        "hasher_capacity": password_hasher.capacity,
+        "hasher_workers": password_hasher.workers,
+        "login_requests": args.login_requests,
+        "elapsed_s": round(elapsed, 2),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "login_latency_ms": {
+            "p50": round(percentile(login_latencies, 0.50), 3),
+            "p95": round(percentile(login_latencies, 0.95), 3),
+        },
+        "probe": probe.name,
+        "probe_latency_ms": {
+            "baseline_p50": round(percentile(baseline, 0.50), 3),
+            "baseline_p95": round(baseline_p95, 3),
+            "saturated_p50": round(percentile(saturated, 0.50), 3),
+            "saturated_p95": round(saturated_p95, 3),
+            "saturated_requests": len(saturated),
+            "budget_p95": round(budget, 3),
+        },
+        "event_loop_lag_ms": {
+            "baseline_p99": round(baseline_lag_p99, 3),
+            "saturated_p99": round(lag_p99, 3),
+            "saturated_max": round(max(loop_lag, default=0.0), 3),
+        },
+        "failures": failures,
+    }
+
+
+def print_login_saturation(scenario: dict) -> None:
+    probe, lag = scenario["probe_latency_ms"], scenario["event_loop_lag_ms"]
+    print(
+        f"\n{LOGIN_ROUTE} x{scenario['login_requests']} "
+        f"(hasher capacity {scenario['hasher_capacity']}): statuses {scenario['statuses']}, "
+        f"{scenario['elapsed_s']}s"
+    )
+    print(
+        f"  {scenario['probe']} p95 baseline {probe['baseline_p95']:.2f}ms -> "
+        f"saturated {probe['saturated_p95']:.2f}ms (budget {probe['budget_p95']:.2f}ms, "
+        f"{probe['saturated_requests']} requests)"
+    )
+    print(
+        f"  event loop lag p99 baseline {lag['baseline_p99']:.2f}ms -> "
+        f"saturated {lag['saturated_p99']:.2f}ms (max {lag['saturated_max']:.2f}ms)"
+    )
+    for line in scenario["failures"]:
+        print(f"FAILED {line}")
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """返回退化超过阈值的路由说明"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        old_p95, new_p95 = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if old_p95 and new_p95 > old_p95 * (1 + threshold):
+            regressions.append(f"{name}: p95 {old_p95:.2f}ms -> {new_p95:.2f}ms")
+        old_rps, new_rps = previous["throughput"], current["throughput"]
+        if old_rps and new_rps < old_rps * (1 - threshold):
+            regressions.append(f"{name}: throughput {old_rps:.1f} -> {new_rps:.1f} req/s")
+        old_queries = previous["queries_per_request"]["mean"]
+        new_queries = current["queries_per_request"]["mean"]
+        if new_queries > old_queries:
+            regressions.append(f"{name}: queries/request {old_queries} -> {new_queries}")
+    return regressions
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    header = f"{'route':<36}{'req/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, item in results.items():
+        latency = item["latency_ms"]
+        print(
+            f"{name:<36}{item['throughput']:>10.1f}{latency['p50']:>9.2f}{latency['p95']:>9.2f}"
+            f"{latency['p99']:>9.2f}{item['queries_per_request']['mean']:>9.2f}{item['errors']:>8}"
+        )
+
+
+async def run(args) -> int:
+    import httpx
+
+    from app.db import AsyncSessionLocal, Base, engine
+    from app.main import app
+    from benchmarks.seed import SeedScale, seed
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    scale = SeedScale(args.teams, args.players_per_team, args.seasons, args.seed)
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        summary = await seed(session, scale)
+    print(f"seeded {summary.to_dict()} in {time.perf_counter() - started:.1f}s")
+
+    install_query_counter(engine)
+    rng = random.Random(args.seed)
+    all_routes = build_routes(summary)
+    routes = [
+        route for route in all_routes
+        if args.routes is None or args.routes in route.name
+    ]
+    run_login = args.routes is None or args.routes in LOGIN_ROUTE
+
+    results = {}
+    scenarios = {}
+    await app.router.startup()
+    try:
+        if run_login:
+            await create_login_user()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for route in routes:
+                results[route.name] = (await run_route(client, route, args, rng)).to_dict()
+            if run_login:
+                probe = next(route for route in all_routes if route.name == LOGIN_PROBE_ROUTE)
+                scenarios["login_saturation"] = await run_login_saturation(
+                    client, probe, args, rng
+                )
+    finally:
+        await app.router.shutdown()
+        # 未释放的 aiosqlite 连接线程会使进程无法退出
+        await engine.dispose()
+
+    if results:
+        print_table(results)
+    if run_login:
+        print_login_saturation(scenarios["login_saturation"])
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "database": args.database_url.split("://", 1)[0],
+        "scale": summary.to_dict(),
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "routes": results,
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        print(f"results written to {args.output}")
+
+    if run_login and scenarios["login_saturation"]["failures"]:
+        return 1
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)["routes"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # 配置在导入 app 时读取，必须先设置环境变量；缓存使用进程内实现，关闭逐请求日志
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("REDIS_URL", "")
+    os.environ.setdefault("REQUEST_LOG", "false")
+    # httpx 按请求输出 INFO 日志，会计入被测延迟
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.database_url == _DEFAULT_URL and os.path.exists(_DEFAULT_DB):
+        os.remove(_DEFAULT_DB)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
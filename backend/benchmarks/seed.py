@@ -0,0 +1,234 @@
+"""基准测试数据生成
+
+按规模生成球队、球员和若干赛季的联赛：赛程由 fixtures 服务编排，每场比赛带
+首发出场、进球和黄牌事件；每支球队另有若干次训练及全队的训练记录。最后用
+standings / player_stats / analytics / training 服务重建积分榜、球员赛季统计、
+球队赛果时间线和训练每日汇总。随机数种子固定，同样的参数得到同样的数据。
+"""
+import json
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Competition,
+    MatchEvent,
+    MatchRecord,
+    Player,
+    Schedule,
+    Team,
+    TrainingPlan,
+    TrainingRecord,
+)
+from app.services import analytics as analytics_service
+from app.services import fixtures as fixtures_service
+from app.services import player_stats as player_stats_service
+from app.services import standings as standings_service
+from app.services import training as training_service
+from app.services.match_events import to_row
+from app.services.standings import MATCH_STATUS_FINISHED
+
+POSITIONS = ("门将", "后卫", "后卫", "后卫", "后卫", "中场", "中场", "中场", "前锋", "前锋", "前锋")
+NATIONALITIES = ("中国", "巴西", "阿根廷", "西班牙", "韩国", "日本", "德国")
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何林高罗"
+GIVEN_NAMES = "伟强磊洋勇军杰涛明超刚平辉鹏华飞鑫波斌宇浩凯健俊帆"
+TRAINING_CATEGORIES = ("体能", "技术", "战术", "恢复")
+ATTENDANCE = ("出席",) * 8 + ("迟到", "缺席")
+# 训练从首个赛季开赛起每 3 天一次
+TRAINING_START = date(2020, 3, 1)
+TRAINING_INTERVAL_DAYS = 3
+
+
+@dataclass
+class SeedScale:
+    teams: int = 20
+    players_per_team: int = 25
+    seasons: int = 2
+    training_sessions: int = 30  # 每支球队的训练次数
+    seed: int = 42
+
+
+@dataclass
+class SeedSummary:
+    team_ids: List[int]
+    player_ids: List[int]
+    competition_ids: List[int]
+    match_ids: List[int]
+
+    def to_dict(self) -> dict:
+        return {
+            "teams": len(self.team_ids),
+            "players": len(self.player_ids),
+            "competitions": len(self.competition_ids),
+            "matches": len(self.match_ids),
+        }
+
+
+def _player_name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choice(GIVEN_NAMES) for _ in range(rng.randint(1, 2)))
+
+
+def _match_events(
+    rng: random.Random,
+    home_id: int,
+    away_id: int,
+    squads: Dict[int, List[int]],
+    home_goals: int,
+    away_goals: int,
+) -> List[dict]:
+    events = []
+    for team_id, goals in ((home_id, home_goals), (away_id, away_goals)):
+        starters = squads[team_id][:11]
+        for player_id in starters:
+            events.append({"type": "appearance", "player_id": player_id, "team_id": team_id, "minutes": 90})
+        for _ in range(goals):
+            scorer, assistant = rng.sample(starters[1:], 2)
+            events.append({
+                "type": "goal",
+                "minute": rng.randint(1, 90),
+                "player_id": scorer,
+                "team_id": team_id,
+                "assist_player_id": assistant,
+            })
+        if rng.random() < 0.6:
+            events.append({
+                "type": "yellow_card",
+                "minute": rng.randint(1, 90),
+                "player_id": rng.choice(starters),
+                "team_id": team_id,
+            })
+    events.sort(key=lambda event: event.get("minute") or 0)
+    return events
+
+
+async def seed(db: AsyncSession, scale: SeedScale) -> SeedSummary:
+    """写入基准数据并提交"""
+    rng = random.Random(scale.seed)
+
+    await db.execute(insert(Team), [
+        {
+            "name": f"球队{i:03d}",
+            "home_ground": f"体育场{i:03d}",
+            "founded_year": rng.randint(1950, 2015),
+            "description": f"第{i}支参赛球队",
+        }
+        for i in range(1, scale.teams + 1)
+    ])
+    team_ids = list((await db.execute(select(Team.id).order_by(Team.id))).scalars().all())
+
+    await db.execute(insert(Player), [
+        {
+            "name": _player_name(rng),
+            "team_id": team_id,
+            "position": POSITIONS[number % len(POSITIONS)],
+            "jersey_number": number + 1,
+            "height": round(rng.uniform(168, 195), 1),
+            "weight": round(rng.uniform(62, 90), 1),
+            "birth_date": date(1990, 1, 1) + timedelta(days=rng.randint(0, 5000)),
+            "nationality": rng.choice(NATIONALITIES),
+            "biography": "职业足球运动员",
+        }
+        for team_id in team_ids
+        for number in range(scale.players_per_team)
+    ])
+    result = await db.execute(select(Player.id, Player.team_id).order_by(Player.id))
+    squads: Dict[int, List[int]] = {}
+    player_ids = []
+    for row in result.all():
+        squads.setdefault(row.team_id, []).append(row.id)
+        player_ids.append(row.id)
+
+    competition_ids = []
+    for offset in range(scale.seasons):
+        year = 2020 + offset
+        competition = Competition(
+            name=f"基准联赛 {year}",
+            competition_type="联赛",
+            season=str(year),
+            start_date=date(year, 3, 1),
+            end_date=date(year, 12, 31),
+        )
+        db.add(competition)
+        await db.flush()
+        competition_ids.append(competition.id)
+        await fixtures_service.generate_schedule(
+            db, competition, team_ids, competition.start_date, interval_days=5
+        )
+
+    schedules = await db.execute(
+        select(Schedule.id, Schedule.home_team_id, Schedule.away_team_id).order_by(Schedule.id)
+    )
+    rows = []
+    for schedule in schedules.all():
+        home_goals, away_goals = rng.choice((0, 0, 1, 1, 1, 2, 2, 3)), rng.choice((0, 0, 1, 1, 2, 2, 3))
+        events = _match_events(
+            rng, schedule.home_team_id, schedule.away_team_id, squads, home_goals, away_goals
+        )
+        rows.append({
+            "schedule_id": schedule.id,
+            "home_team_id": schedule.home_team_id,
+            "away_team_id": schedule.away_team_id,
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "status": MATCH_STATUS_FINISHED,
+            "event_details": json.dumps(events, ensure_ascii=False),
+        })
+    await db.execute(insert(MatchRecord), rows)
+
+    result = await db.execute(select(MatchRecord.id, MatchRecord.event_details).order_by(MatchRecord.id))
+    matches = result.all()
+    event_rows = [
+        to_row(match.id, event)
+        for match in matches
+        for event in player_stats_service.parse_events(match.event_details)
+    ]
+    if event_rows:
+        await db.execute(insert(MatchEvent), event_rows)
+
+    await db.execute(insert(TrainingPlan), [
+        {
+            "team_id": team_id,
+            "title": f"第{number + 1}次训练",
+            "topic": "常规训练",
+            "scheduled_date": TRAINING_START + timedelta(days=number * TRAINING_INTERVAL_DAYS),
+            "duration": 90,
+            "category": TRAINING_CATEGORIES[number % len(TRAINING_CATEGORIES)],
+            "status": "已完成",
+        }
+        for team_id in team_ids
+        for number in range(scale.training_sessions)
+    ])
+    plans = await db.execute(select(TrainingPlan.id, TrainingPlan.team_id).order_by(TrainingPlan.id))
+    training_rows = []
+    for plan in plans.all():
+        for player_id in squads[plan.team_id]:
+            attendance = rng.choice(ATTENDANCE)
+            present = attendance != "缺席"
+            training_rows.append({
+                "training_plan_id": plan.id,
+                "player_id": player_id,
+                "attendance": attendance,
+                "completion_rate": rng.randint(50, 100) if present else None,
+                "performance_score": rng.randint(4, 10) if present else None,
+            })
+    if training_rows:
+        await db.execute(insert(TrainingRecord), training_rows)
+
+    for competition_id in competition_ids:
+        await standings_service.rebuild_standings(db, competition_id)
+    for offset in range(scale.seasons):
+        await player_stats_service.rebuild_season(db, str(2020 + offset))
+    await analytics_service.rebuild_timeline(db)
+    await training_service.rebuild_summary(db)
+    await db.commit()
+
+    return SeedSummary(
+        team_ids=team_ids,
+        player_ids=player_ids,
+        competition_ids=competition_ids,
+        match_ids=[match.id for match in matches],
+    )
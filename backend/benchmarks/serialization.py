@@ -0,0 +1,115 @@
+"""响应序列化微基准
+
+比较 1000 名球员（每人两条赛季统计）的几种序列化方式，单位为毫秒：
+
+- fastapi: 返回 ORM 对象，由 FastAPI 按 response_model 校验、jsonable_encoder
+  转换后用标准 JSONResponse 编码（改造前的路径）
+- fastapi+orjson: 同上，但用 FastJSONResponse 编码（默认响应类）
+- model_response: 按 schema 校验一次，由 pydantic 直接编码为 JSON
+
+用法（在 backend 目录下）：
+    python -m benchmarks.serialization [--players 1000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import FastJSONResponse, model_response
+from app.schemas import Player as PlayerSchema
+
+
+def make_players(count: int) -> list:
+    """构造与 ORM 对象属性一致的球员数据"""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    players = []
+    for i in range(1, count + 1):
+        statistics_rows = [
+            SimpleNamespace(
+                id=i * 10 + season,
+                player_id=i,
+                season=f"202{season}",
+                appearance=30,
+                goals=i % 20,
+                assists=i % 11,
+                yellow_cards=i % 5,
+                red_cards=0,
+                minutes_played=2700,
+            )
+            for season in (3, 4)
+        ]
+        players.append(
+            SimpleNamespace(
+                id=i,
+                name=f"球员{i}",
+                team_id=i % 20 + 1,
+                position="中场",
+                jersey_number=i % 99,
+                height=180.5,
+                weight=75.0,
+                birth_date=date(1995, 1, 1),
+                nationality="中国",
+                biography="职业足球运动员",
+                photo=None,
+                created_at=now,
+                statistics=statistics_rows,
+                health_records=[],
+            )
+        )
+    return players
+
+
+def measure(func, repeat: int) -> float:
+    """多次运行取中位数（毫秒）"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    players = make_players(args.players)
+    field = create_response_field(name="Response", type_=List[PlayerSchema])
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path(response_class):
+        def run():
+            content = loop.run_until_complete(
+                serialize_response(field=field, response_content=players)
+            )
+            return response_class(content).body
+        return run
+
+    cases = {
+        "fastapi": fastapi_path(JSONResponse),
+        "fastapi+orjson": fastapi_path(FastJSONResponse),
+        "model_response": lambda: model_response(List[PlayerSchema], players).body,
+    }
+
+    baseline = None
+    scale = 1000 / args.players
+    print(f"{'case':<16}{'ms/1000 players':>18}{'speedup':>10}")
+    for name, func in cases.items():
+        elapsed = measure(func, args.repeat) * scale
+        baseline = baseline or elapsed
+        print(f"{name:<16}{elapsed:>18.2f}{baseline / elapsed:>9.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Gunicorn 配置
+
+在 backend 目录下执行 gunicorn app.main:app 时自动读取。设置
+PROMETHEUS_MULTIPROC_DIR 后各 worker 共享 Prometheus 指标，worker 退出时在
+child_exit 中清理其指标文件。
+"""
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
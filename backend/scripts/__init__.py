@@ -0,0 +1 @@
+"""运维脚本"""
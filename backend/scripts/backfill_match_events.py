@@ -0,0 +1,19 @@
+"""把 match_record.event_details 中的事件回填到 match_event 表
+
+用法（在 backend 目录下）：
+    python -m scripts.backfill_match_events
+"""
+import asyncio
+
+from app.db import AsyncSessionLocal
+from app.services.match_events import backfill
+
+
+async def main():
+    async with AsyncSessionLocal() as session:
+        processed = await backfill(session)
+    print(f"backfilled {processed} matches")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,218 @@
+"""对热点查询执行 EXPLAIN，出现全表扫描时以非零状态退出
+
+查询与接口和服务中的写法一致（参数取样例值）。支持 MySQL（EXPLAIN，type 为 ALL
+即全表扫描）和 SQLite（EXPLAIN QUERY PLAN，不经索引的 SCAN 即全表扫描）。
+MySQL 在表很小时可能放弃索引，应在有真实规模数据的库上运行，或用 --seed 先向
+空库写入基准数据。
+
+用法（在 backend 目录下，先执行 alembic upgrade head）：
+    python -m scripts.explain_queries
+    python -m scripts.explain_queries --seed
+"""
+import argparse
+import asyncio
+import re
+import sys
+from typing import List, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.sql import Select
+
+from app.db import AsyncSessionLocal, engine
+from app.models import (
+    HealthRecord,
+    MatchEvent,
+    MatchRecord,
+    Player,
+    PlayerStatistics,
+    Schedule,
+    Standing,
+    Team,
+    TeamResult,
+    TrainingDailySummary,
+    TrainingPlan,
+    TrainingRecord,
+    User,
+)
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\S+)(?: AS \S+)?$")
+
+
+def hot_queries() -> List[Tuple[str, Select]]:
+    return [
+        ("user by username", select(User).where(User.username == "admin")),
+        ("team by name", select(Team).where(Team.name == "球队001")),
+        ("players by team", select(Player).where(Player.team_id == 1)),
+        (
+            "players by name prefix",
+            select(Player.id, Player.name)
+            .where(Player.name.startswith("球", autoescape=True))
+            .order_by(Player.name, Player.id)
+            .limit(20),
+        ),
+        (
+            "teams by name prefix",
+            select(Team.id, Team.name)
+            .where(Team.name.startswith("球", autoescape=True))
+            .order_by(Team.name, Team.id)
+            .limit(20),
+        ),
+        (
+            "players by team and position",
+            select(Player).where(Player.team_id == 1, Player.position == "中场"),
+        ),
+        (
+            "player statistics by players",
+            select(PlayerStatistics).where(PlayerStatistics.player_id.in_([1, 2, 3])),
+        ),
+        (
+            "player statistics by player and season",
+            select(PlayerStatistics).where(
+                PlayerStatistics.player_id == 1, PlayerStatistics.season == "2021"
+            ),
+        ),
+        (
+            "health records by players",
+            select(HealthRecord).where(HealthRecord.player_id.in_([1, 2, 3])),
+        ),
+        (
+            "health records by player and status",
+            select(HealthRecord).where(
+                HealthRecord.player_id == 1, HealthRecord.status == "进行中"
+            ),
+        ),
+        (
+            "schedules by competition and round",
+            select(Schedule)
+            .where(Schedule.competition_id == 1, Schedule.round_number == 1)
+            .order_by(Schedule.round_number, Schedule.id),
+        ),
+        (
+            "standings by competition",
+            select(Standing)
+            .where(Standing.competition_id == 1)
+            .order_by(Standing.rank, Standing.team_id),
+        ),
+        (
+            "match record by schedule",
+            select(MatchRecord.id).where(MatchRecord.schedule_id == 1),
+        ),
+        (
+            "match events by match",
+            select(MatchEvent).where(MatchEvent.match_id == 1).order_by(MatchEvent.minute),
+        ),
+        (
+            "match events by player",
+            select(MatchEvent).where(MatchEvent.player_id == 1, MatchEvent.event_type == "goal"),
+        ),
+        (
+            "team results by team",
+            select(TeamResult)
+            .where(TeamResult.team_id == 1)
+            .order_by(TeamResult.match_date.desc(), TeamResult.match_id.desc()),
+        ),
+        (
+            "team results by team and opponent",
+            select(TeamResult).where(TeamResult.team_id == 1, TeamResult.opponent_id == 2),
+        ),
+        (
+            "team results by competition and team",
+            select(TeamResult).where(TeamResult.competition_id == 1, TeamResult.team_id == 1),
+        ),
+        (
+            "training plans by team and date",
+            select(TrainingPlan)
+            .where(TrainingPlan.team_id == 1, TrainingPlan.scheduled_date >= "2020-03-01")
+            .order_by(TrainingPlan.scheduled_date.desc(), TrainingPlan.id.desc()),
+        ),
+        (
+            "training summary by team and date",
+            select(TrainingDailySummary.summary_date, func.sum(TrainingDailySummary.sessions))
+            .where(
+                TrainingDailySummary.team_id == 1,
+                TrainingDailySummary.summary_date.between("2020-03-01", "2020-05-29"),
+            )
+            .group_by(TrainingDailySummary.summary_date),
+        ),
+        (
+            "training summary by player and date",
+            select(TrainingDailySummary.summary_date, func.sum(TrainingDailySummary.sessions))
+            .where(
+                TrainingDailySummary.player_id == 1,
+                TrainingDailySummary.summary_date.between("2020-03-01", "2020-05-29"),
+            )
+            .group_by(TrainingDailySummary.summary_date),
+        ),
+        (
+            "training records by plan",
+            select(TrainingRecord).where(TrainingRecord.training_plan_id == 1),
+        ),
+        (
+            "training record by plan and player",
+            select(TrainingRecord).where(
+                TrainingRecord.training_plan_id == 1, TrainingRecord.player_id == 1
+            ),
+        ),
+    ]
+
+
+def full_scans(dialect: str, plan: List[dict]) -> List[str]:
+    """返回执行计划中做全表扫描的表"""
+    if dialect == "mysql":
+        return [row["table"] for row in plan if row.get("type") == "ALL"]
+    tables = []
+    for row in plan:
+        match = _SQLITE_FULL_SCAN.match(row["detail"])
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+def format_plan(dialect: str, plan: List[dict]) -> str:
+    if dialect == "mysql":
+        return "; ".join(
+            f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}"
+            for row in plan
+        )
+    return "; ".join(row["detail"] for row in plan)
+
+
+async def explain_all() -> int:
+    dialect = engine.dialect.name
+    if dialect not in ("mysql", "sqlite"):
+        print(f"unsupported database: {dialect}")
+        return 2
+    prefix = "EXPLAIN" if dialect == "mysql" else "EXPLAIN QUERY PLAN"
+
+    failures = 0
+    async with engine.connect() as conn:
+        for name, query in hot_queries():
+            sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            result = await conn.execute(text(f"{prefix} {sql}"))
+            plan = [dict(row) for row in result.mappings().all()]
+            scans = full_scans(dialect, plan)
+            status = "FULL SCAN " + ", ".join(scans) if scans else "ok"
+            print(f"{name:<40}{status}")
+            print(f"    {format_plan(dialect, plan)}")
+            failures += bool(scans)
+    return 1 if failures else 0
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN hot queries")
+    parser.add_argument("--seed", action="store_true", help="先向空库写入基准数据")
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        from benchmarks.seed import SeedScale, seed
+
+        async with AsyncSessionLocal() as session:
+            await seed(session, SeedScale())
+    try:
+        return await explain_all()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
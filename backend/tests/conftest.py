@@ -0,0 +1,71 @@
+"""测试环境：使用临时 SQLite 数据库和进程内缓存，不依赖 MySQL 和 Redis"""
+import os
+import tempfile
+
+# 必须在导入 app 之前设置，settings 在导入时读取环境变量
+_db_dir = tempfile.mkdtemp(prefix="football-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ["REDIS_URL"] = ""
+os.environ["REQUEST_LOG"] = "false"
+os.environ["JOBS_EAGER"] = "true"
+os.environ["JOB_RESULT_DIR"] = os.path.join(_db_dir, "job_results")
+
+import asyncio  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+
+from app.api.dependencies import get_current_user  # noqa: E402
+from app.core.cache import Cache, InMemoryRedis, get_cache  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.principals import Principal  # noqa: E402
+from app.db import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.seed import SeedScale, seed  # noqa: E402
+
+ADMIN = Principal(id=1, username="admin", is_active=True, is_superuser=True)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # 数据库引擎和连接池在整个测试会话中共用一个事件循环
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def seeded():
+    """建表并写入一份小规模的测试数据"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        summary = await seed(session, SeedScale(teams=6, players_per_team=8, seasons=2))
+    yield summary
+    await engine.dispose()
+
+
+@pytest.fixture
+def test_cache():
+    """每个测试使用独立的进程内缓存"""
+    instance = Cache(
+        InMemoryRedis(),
+        prefix=settings.CACHE_KEY_PREFIX,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        ttls=settings.CACHE_TTLS,
+    )
+    app.dependency_overrides[get_cache] = lambda: instance
+    yield instance
+    app.dependency_overrides.pop(get_cache, None)
+
+
+@pytest_asyncio.fixture
+async def client(seeded, test_cache):
+    """以超级管理员身份访问应用的 HTTP 客户端"""
+    app.dependency_overrides[get_current_user] = lambda: ADMIN
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http_client:
+        yield http_client
+    app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,134 @@
+"""球队近况、交锋和赛前数据：SQL 汇总与逐行计算一致，最近 N 场用 LIMIT 读取"""
+import re
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db import AsyncSessionLocal, engine
+from app.models import Schedule, TeamResult
+from app.services.analytics import compute_streaks
+
+
+async def _timeline(team_id: int, opponent_id=None) -> list:
+    query = select(TeamResult).where(TeamResult.team_id == team_id)
+    if opponent_id is not None:
+        query = query.where(TeamResult.opponent_id == opponent_id)
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            query.order_by(TeamResult.match_date.desc(), TeamResult.match_id.desc())
+        )
+        return list(result.scalars())
+
+
+def _expected_record(rows) -> dict:
+    won = sum(row.outcome == "W" for row in rows)
+    drawn = sum(row.outcome == "D" for row in rows)
+    goals_for = sum(row.goals_for for row in rows)
+    goals_against = sum(row.goals_against for row in rows)
+    return {
+        "played": len(rows),
+        "won": won,
+        "drawn": drawn,
+        "lost": len(rows) - won - drawn,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+        "points": won * 3 + drawn,
+    }
+
+
+def _query_count(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+class _Statements:
+    """记录测试期间执行的 SQL"""
+
+    def __init__(self):
+        self.seen = []
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.seen.append(statement)
+
+
+@pytest.mark.asyncio
+async def test_team_form_matches_timeline(client, seeded):
+    team_id = seeded.team_ids[0]
+    rows = await _timeline(team_id)
+    assert len(rows) > 3
+
+    with _Statements() as statements:
+        response = await client.get(f"/api/v1/analytics/teams/{team_id}/form?last=3")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["overall"] == _expected_record(rows)
+    assert data["home"] == _expected_record([row for row in rows if row.is_home])
+    assert data["away"] == _expected_record([row for row in rows if not row.is_home])
+    assert data["form"] == "".join(row.outcome for row in rows[:3])
+    assert [item["match_id"] for item in data["last_matches"]] == [row.match_id for row in rows[:3]]
+    assert data["streaks"] == compute_streaks([row.outcome for row in rows])
+
+    # 完整赛果行只按最近 N 场读取
+    full_rows = [s for s in statements.seen if "team_result.goals_for" in s and "sum(" not in s]
+    assert full_rows and all("LIMIT" in s for s in full_rows)
+
+
+@pytest.mark.asyncio
+async def test_head_to_head_matches_timeline(client, seeded):
+    team_id, opponent_id = seeded.team_ids[:2]
+    rows = await _timeline(team_id, opponent_id)
+
+    response = await client.get(
+        "/api/v1/analytics/head-to-head",
+        params={"team_id": team_id, "opponent_id": opponent_id, "last": 1},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    overall = _expected_record(rows)
+    assert (data["played"], data["team_wins"], data["draws"], data["opponent_wins"]) == (
+        overall["played"],
+        overall["won"],
+        overall["drawn"],
+        overall["lost"],
+    )
+    assert data["team_home"] == _expected_record([row for row in rows if row.is_home])
+    assert [item["match_id"] for item in data["last_meetings"]] == [row.match_id for row in rows[:1]]
+
+
+@pytest.mark.asyncio
+async def test_match_preview_served_from_cache_without_queries(client, seeded):
+    async with AsyncSessionLocal() as session:
+        schedule = (await session.execute(select(Schedule).limit(1))).scalar_one()
+
+    url = f"/api/v1/analytics/schedules/{schedule.id}/preview"
+    first = await client.get(url)
+    assert first.status_code == 200
+    data = first.json()
+    assert data["home"]["team_id"] == schedule.home_team_id
+    assert data["away"]["team_id"] == schedule.away_team_id
+    assert data["head_to_head"]["opponent_id"] == schedule.away_team_id
+
+    second = await client.get(url)
+    assert second.json() == data
+    assert _query_count(second) == 0
+
+    # 只统计本赛事时结果单独缓存
+    scoped = await client.get(url, params={"competition_only": "true"})
+    assert scoped.status_code == 200
+    assert _query_count(scoped) > 0
+    assert scoped.json()["home"]["competition_id"] == schedule.competition_id
+
+
+@pytest.mark.asyncio
+async def test_match_preview_unknown_schedule(client, seeded):
+    response = await client.get("/api/v1/analytics/schedules/999999/preview")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Schedule not found"
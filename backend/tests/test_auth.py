@@ -0,0 +1,46 @@
+"""登录与密码哈希工作池"""
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.hashing import password_hasher
+from app.core.security import hash_password
+from app.db import AsyncSessionLocal
+from app.models import User
+
+
+@pytest.mark.asyncio
+async def test_login_overflow_rejected_with_retry_after(client, monkeypatch):
+    username = f"login-{uuid.uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as session:
+        session.add(
+            User(
+                username=username,
+                email=f"{username}@example.com",
+                password=hash_password("secret-password"),
+                is_active=True,
+            )
+        )
+        await session.commit()
+
+    # 工作池容量为 1：同时到达的其余登录请求应立即被拒绝
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    monkeypatch.setattr(password_hasher, "queue_size", 0)
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                "/api/v1/auth/login",
+                json={"username": username, "password": "secret-password"},
+            )
+            for _ in range(5)
+        )
+    )
+
+    codes = sorted(response.status_code for response in responses)
+    assert codes[0] == 200
+    assert 503 in codes
+    assert set(codes) <= {200, 503}
+    for response in responses:
+        if response.status_code == 503:
+            assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,96 @@
+"""读穿缓存（InMemoryRedis）"""
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import Cache, InMemoryRedis
+
+
+@pytest.fixture
+def cache():
+    return Cache(InMemoryRedis(), prefix="test", default_ttl=60, ttls={"standings": 30})
+
+
+class Loader:
+    """记录调用次数的 loader"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit(cache):
+    loader = Loader({"id": 1, "name": "A"})
+
+    assert await cache.get_or_set("teams", "detail:1", loader) == {"id": 1, "name": "A"}
+    assert await cache.get_or_set("teams", "detail:1", loader) == {"id": 1, "name": "A"}
+    assert loader.calls == 1
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_resource_version(cache):
+    loader = Loader([1, 2])
+    await cache.get_or_set("teams", "list", loader)
+    other = Loader([3])
+    await cache.get_or_set("competitions", "list", other)
+
+    await cache.invalidate("teams")
+    await cache.get_or_set("teams", "list", loader)
+    await cache.get_or_set("competitions", "list", other)
+
+    assert loader.calls == 2
+    assert other.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_scope_only_affects_that_scope(cache):
+    first = Loader(["c1"])
+    second = Loader(["c2"])
+    await cache.get_or_set("standings", "list", first, scope="1")
+    await cache.get_or_set("standings", "list", second, scope="2")
+
+    await cache.invalidate("standings", scope="1")
+    await cache.get_or_set("standings", "list", first, scope="1")
+    await cache.get_or_set("standings", "list", second, scope="2")
+    assert (first.calls, second.calls) == (2, 1)
+
+    # 失效整个资源时所有 scope 都失效
+    await cache.invalidate("standings")
+    await cache.get_or_set("standings", "list", first, scope="1")
+    await cache.get_or_set("standings", "list", second, scope="2")
+    assert (first.calls, second.calls) == (3, 2)
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_resource_ttl(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    loader = Loader("value")
+
+    await cache.get_or_set("standings", "list", loader)
+    now[0] += 29
+    await cache.get_or_set("standings", "list", loader)
+    assert loader.calls == 1
+
+    now[0] += 2
+    await cache.get_or_set("standings", "list", loader)
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_loader_result_returned_when_client_fails(cache):
+    class BrokenRedis(InMemoryRedis):
+        async def mget(self, *keys):
+            raise ConnectionError("redis down")
+
+    broken = Cache(BrokenRedis(), prefix="test", default_ttl=60, ttls={})
+    loader = Loader("fresh")
+
+    assert await broken.get_or_set("teams", "list", loader) == "fresh"
+    assert await broken.get_or_set("teams", "list", loader) == "fresh"
+    assert loader.calls == 2
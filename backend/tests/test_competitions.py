@@ -0,0 +1,64 @@
+"""赛事接口的类型化响应"""
+import json
+
+import pytest
+
+from app.api.responses import model_response
+from app.main import app
+from app.models import Competition
+from app.schemas import Competition as CompetitionSchema, CompetitionSummary
+
+
+@pytest.mark.asyncio
+async def test_list_and_detail_follow_schemas(client, seeded):
+    response = await client.get("/api/v1/competitions")
+    assert response.status_code == 200
+    items = response.json()
+    assert items
+    assert all(set(item) == set(CompetitionSummary.model_fields) for item in items)
+
+    competition_id = seeded.competition_ids[0]
+    response = await client.get(f"/api/v1/competitions/{competition_id}")
+    detail = response.json()
+    assert set(detail) == set(CompetitionSchema.model_fields)
+    assert CompetitionSchema.model_validate(detail).id == competition_id
+
+
+@pytest.mark.asyncio
+async def test_create_validates_input_and_returns_typed_body(client, seeded):
+    response = await client.post("/api/v1/competitions", json={"season": "2030"})
+    assert response.status_code == 422
+
+    payload = {
+        "name": "类型化响应测试杯",
+        "competition_type": "杯赛",
+        "season": "2030",
+        "start_date": "2030-03-01",
+        "end_date": "2030-06-30",
+        "rules": "单败淘汰",
+    }
+    response = await client.post("/api/v1/competitions", json=payload)
+    assert response.status_code == 200
+    body = response.json()
+    assert {key: body[key] for key in payload} == payload
+    assert body["description"] is None
+
+    listed = await client.get("/api/v1/competitions", params={"limit": 1000})
+    assert body["id"] in {item["id"] for item in listed.json()}
+
+
+def test_openapi_documents_competition_schemas():
+    paths = app.openapi()["paths"]
+    detail = paths["/api/v1/competitions/{competition_id}"]["get"]["responses"]["200"]
+    assert detail["content"]["application/json"]["schema"]["$ref"].endswith("/Competition")
+    listing = paths["/api/v1/competitions"]["get"]["responses"]["200"]
+    items = listing["content"]["application/json"]["schema"]["items"]
+    assert items["$ref"].endswith("/CompetitionSummary")
+
+
+def test_model_response_matches_pydantic_encoding():
+    competition = Competition(id=7, name="编码", season="2030", rules=None)
+    response = model_response(CompetitionSchema, competition)
+    assert response.media_type == "application/json"
+    expected = CompetitionSchema.model_validate(competition).model_dump(mode="json")
+    assert json.loads(response.body) == expected
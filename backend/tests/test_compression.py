@@ -0,0 +1,109 @@
+"""响应压缩：编码协商、跳过条件、流式压缩、缓存接口的压缩结果复用和 304 响应头"""
+import gzip
+
+import brotli
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api import compression
+from app.core.config import settings
+from app.services import exports as exports_service
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("*;q=0.2", "br"),
+        ("*, br;q=0", "gzip"),
+        ("GZIP ; q=0.8", "gzip"),
+        ("gzip;q=abc", None),
+    ],
+)
+def test_choose_encoding_follows_q_values(accept, expected):
+    assert compression.choose_encoding(accept) == expected
+
+
+async def _raw(client, url, **kwargs):
+    async with client.stream("GET", url, **kwargs) as response:
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, body
+
+
+def _hits(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "compressed_body_cache_requests_total", {"result": result}
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_small_and_binary_responses_not_compressed(client, seeded, monkeypatch):
+    response, _ = await _raw(client, "/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    # 类型不在列表中的响应（XLSX 本身已压缩）原样返回
+    response, body = await _raw(
+        client,
+        "/api/v1/exports/players",
+        params={"format": "xlsx", "team_id": seeded.team_ids[0]},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert "content-encoding" not in response.headers
+    assert body.startswith(b"PK")
+
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 10**9)
+    response, _ = await _raw(client, "/api/v1/teams", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_export_compressed_incrementally(client, seeded, monkeypatch):
+    monkeypatch.setattr(exports_service, "STREAM_BATCH_SIZE", 3)
+    params = {"format": "csv", "team_id": seeded.team_ids[0]}
+    _, plain = await _raw(
+        client, "/api/v1/exports/players", params=params, headers={"Accept-Encoding": "identity"}
+    )
+
+    response, body = await _raw(
+        client, "/api/v1/exports/players", params=params, headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert gzip.decompress(body) == plain
+
+
+@pytest.mark.asyncio
+async def test_cached_response_reuses_precompressed_body(client, seeded):
+    compression.compressed_bodies.clear()
+    _, plain = await _raw(client, "/api/v1/teams", headers={"Accept-Encoding": "identity"})
+    assert len(plain) >= settings.COMPRESSION_MIN_SIZE
+
+    misses, hits = _hits("miss"), _hits("hit")
+    first, first_body = await _raw(client, "/api/v1/teams", headers={"Accept-Encoding": "br"})
+    second, second_body = await _raw(client, "/api/v1/teams", headers={"Accept-Encoding": "br"})
+    assert (_hits("miss"), _hits("hit")) == (misses + 1, hits + 1)
+
+    assert first.headers["content-encoding"] == "br"
+    assert first.headers["content-length"] == str(len(first_body))
+    assert second_body == first_body
+    assert brotli.decompress(first_body) == plain
+
+
+@pytest.mark.asyncio
+async def test_not_modified_keeps_etag_and_vary(client, seeded):
+    url = f"/api/v1/teams/{seeded.team_ids[0]}"
+    etag = (await client.get(url)).headers["etag"]
+
+    response = await client.get(url, headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert "content-encoding" not in response.headers
+    assert response.content == b""
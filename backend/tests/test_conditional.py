@@ -0,0 +1,81 @@
+"""条件请求（ETag / Last-Modified）"""
+import re
+
+import pytest
+
+from app.db import AsyncSessionLocal
+from app.models import Honor
+
+
+@pytest.mark.asyncio
+async def test_etag_follows_returned_data(client, seeded):
+    team_id = seeded.team_ids[0]
+    url = f"/api/v1/teams/{team_id}"
+    response = await client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    response = await client.put(url, json={"description": "etag test"})
+    assert response.status_code == 200
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_player_list_not_modified(client, seeded):
+    url = "/api/v1/players"
+    params = {"team_id": seeded.team_ids[0]}
+    etag = (await client.get(url, params=params)).headers["etag"]
+    response = await client.get(url, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def _query_count(response) -> int:
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+@pytest.mark.asyncio
+async def test_not_modified_answered_before_loading_rows(client, seeded):
+    url = "/api/v1/players"
+    params = {"team_id": seeded.team_ids[1], "expand": "statistics,health_records"}
+    first = await client.get(url, params=params)
+    assert first.headers["last-modified"]
+
+    response = await client.get(url, params=params, headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
+    assert response.content == b""
+    # 只执行一条版本聚合查询
+    assert _query_count(response) == 1
+    assert "accept-encoding" in response.headers["vary"].lower()
+
+    response = await client.get(
+        url, params=params, headers={"If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_expanded_relation_change_updates_etag(client, seeded):
+    team_id = seeded.team_ids[1]
+    url = f"/api/v1/teams/{team_id}"
+    etag = (await client.get(url)).headers["etag"]
+    collapsed_etag = (await client.get(url, params={"expand": "none"})).headers["etag"]
+
+    # 直接写库（不经接口、不失效缓存），只有数据版本能发现变化
+    async with AsyncSessionLocal() as session:
+        session.add(Honor(team_id=team_id, title="条件请求测试", year=2030))
+        await session.commit()
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    response = await client.get(
+        url, params={"expand": "none"}, headers={"If-None-Match": collapsed_etag}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,51 @@
+"""报表流式导出：各格式内容与数据库一致，跨批次不丢行"""
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import select
+
+from app.db import AsyncSessionLocal
+from app.models import Player
+from app.services import exports as exports_service
+
+
+async def _players(team_id: int) -> list:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Player.id, Player.name).where(Player.team_id == team_id).order_by(Player.id)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+def _rows(fmt: str, body: bytes) -> list:
+    if fmt == "csv":
+        assert body.startswith("﻿".encode("utf-8"))
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        return [(int(row["id"]), row["name"]) for row in reader]
+    if fmt == "ndjson":
+        items = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+        return [(item["id"], item["name"]) for item in items]
+    sheet = load_workbook(io.BytesIO(body), read_only=True).active
+    rows = sheet.iter_rows(values_only=True)
+    columns = list(next(rows))
+    return [(row[columns.index("id")], row[columns.index("name")]) for row in rows]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "xlsx"])
+async def test_player_export_matches_database(client, seeded, monkeypatch, fmt):
+    # 每批 3 行，8 名球员跨越多个批次
+    monkeypatch.setattr(exports_service, "STREAM_BATCH_SIZE", 3)
+    team_id = seeded.team_ids[0]
+    response = await client.get(
+        "/api/v1/exports/players", params={"format": fmt, "team_id": team_id}
+    )
+    assert response.status_code == 200
+    media_type, extension = exports_service.FORMATS[fmt]
+    assert response.headers["content-type"].split(";")[0] == media_type
+    assert response.headers["content-type"].count("charset") <= 1
+    assert f'filename="players.{extension}"' in response.headers["content-disposition"]
+    assert _rows(fmt, response.content) == await _players(team_id)
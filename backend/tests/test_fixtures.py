@@ -0,0 +1,53 @@
+"""赛程编排"""
+from datetime import date
+
+import pytest
+
+from app.db import AsyncSessionLocal
+from app.models import Competition
+from app.services.fixtures import resolve_venue_conflicts, round_robin_pairings
+
+
+def _venue_clashes(rounds, venues):
+    clashes = 0
+    for pairs in rounds:
+        home_venues = [venues[home] for home, _ in pairs if venues.get(home)]
+        clashes += len(home_venues) - len(set(home_venues))
+    return clashes
+
+
+def test_double_round_has_no_shared_ground_clash_in_either_leg():
+    teams = list(range(1, 9))
+    # 两两共用主场
+    venues = {team: f"ground-{(team + 1) // 2}" for team in teams}
+    first_leg = resolve_venue_conflicts(round_robin_pairings(teams), venues, mirrored=True)
+    second_leg = [[(away, home) for home, away in pairs] for pairs in first_leg]
+
+    assert _venue_clashes(first_leg, venues) == 0
+    assert _venue_clashes(second_leg, venues) == 0
+
+
+@pytest.mark.asyncio
+async def test_generating_twice_without_replace_conflicts(client, seeded):
+    async with AsyncSessionLocal() as session:
+        competition = Competition(
+            name="fixtures-regenerate",
+            competition_type="联赛",
+            season="2030",
+            start_date=date(2030, 1, 1),
+        )
+        session.add(competition)
+        await session.commit()
+        competition_id = competition.id
+
+    payload = {"team_ids": seeded.team_ids[:4], "start_date": "2030-01-05"}
+    url = f"/api/v1/competitions/{competition_id}/schedules/generate"
+    response = await client.post(url, json=payload)
+    assert response.status_code == 200
+    assert response.json()["fixtures"] == 12
+
+    response = await client.post(url, json=payload)
+    assert response.status_code == 409
+
+    response = await client.post(url, json={**payload, "replace_existing": True})
+    assert response.status_code == 200
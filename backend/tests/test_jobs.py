@@ -0,0 +1,129 @@
+"""后台任务：run_job 的状态流转和 JOBS_EAGER 下的接口提交"""
+import asyncio
+import uuid
+
+import pytest
+from pydantic import BaseModel
+
+from app.db import AsyncSessionLocal
+from app.db.base import AppSession
+from app.models import Job
+from app.services import jobs as jobs_service
+
+
+class _NoParams(BaseModel):
+    pass
+
+
+async def _create_job(name: str, params: dict) -> str:
+    async with AsyncSessionLocal() as session:
+        job = Job(id=uuid.uuid4().hex, name=name, status=jobs_service.JOB_PENDING, params=params)
+        session.add(job)
+        await session.commit()
+        return job.id
+
+
+async def _load(job_id: str) -> Job:
+    async with AsyncSessionLocal() as session:
+        return await session.get(Job, job_id)
+
+
+async def _wait_finished(client, location: str) -> dict:
+    for _ in range(200):
+        job = (await client.get(location)).json()
+        if job["status"] in jobs_service.FINISHED_STATUSES:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_result(seeded, test_cache):
+    job_id = await _create_job("statistics.rebuild", {"season": "2020"})
+
+    await jobs_service.run_job(job_id, AsyncSessionLocal, test_cache)
+
+    job = await _load(job_id)
+    assert job.status == jobs_service.JOB_SUCCEEDED
+    assert job.progress == 100
+    assert job.result["players"] > 0
+    finished_at = job.finished_at
+
+    # 重复投递时已结束的任务直接跳过
+    await jobs_service.run_job(job_id, AsyncSessionLocal, test_cache)
+    assert (await _load(job_id)).finished_at == finished_at
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_failure(seeded, test_cache, monkeypatch):
+    async def fail(ctx, params):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(
+        jobs_service.JOB_TYPES, "test.fail", jobs_service.JobType("test.fail", _NoParams, fail)
+    )
+    job_id = await _create_job("test.fail", {})
+
+    await jobs_service.run_job(job_id, AsyncSessionLocal, test_cache)
+
+    job = await _load(job_id)
+    assert job.status == jobs_service.JOB_FAILED
+    assert job.error == "boom"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name, params, error",
+    [
+        ("no.such.job", {}, "unknown job type: no.such.job"),
+        ("statistics.rebuild", {"season": 2020}, "validation error"),
+    ],
+)
+async def test_run_job_fails_on_invalid_definition(seeded, test_cache, name, params, error):
+    job_id = await _create_job(name, params)
+
+    await jobs_service.run_job(job_id, AsyncSessionLocal, test_cache)
+
+    job = await _load(job_id)
+    assert job.status == jobs_service.JOB_FAILED
+    assert error in job.error
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_uses_app_session_configuration(seeded, monkeypatch):
+    factories = []
+    run_job = jobs_service.run_job
+
+    async def spy(job_id, session_factory, cache):
+        factories.append(session_factory)
+        await run_job(job_id, session_factory, cache)
+
+    monkeypatch.setattr(jobs_service, "run_job", spy)
+    job_id = await _create_job("statistics.rebuild", {"season": "2020"})
+
+    await jobs_service._run_in_worker(job_id)
+
+    assert issubclass(factories[0].class_, AppSession)
+    assert factories[0].kw["autoflush"] is False
+    assert (await _load(job_id)).status == jobs_service.JOB_SUCCEEDED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/competitions/{competition_id}/standings/rebuild",
+        "/api/v1/players/statistics/rebuild?season=2020",
+        "/api/v1/analytics/timeline/rebuild?competition_id={competition_id}",
+        "/api/v1/training/summary/rebuild",
+    ],
+)
+async def test_rebuild_endpoints_run_as_jobs(client, seeded, path):
+    response = await client.post(path.format(competition_id=seeded.competition_ids[0]))
+    assert response.status_code == 202
+    assert response.json()["status"] == jobs_service.JOB_PENDING
+
+    # JOBS_EAGER 下任务在当前事件循环中执行
+    job = await _wait_finished(client, response.headers["location"])
+    assert job["status"] == jobs_service.JOB_SUCCEEDED, job["error"]
@@ -0,0 +1,63 @@
+"""比赛实时推送"""
+import json
+import time
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.main import app
+from app.services.live import LiveHub, live_hub
+from app.services.standings import MATCH_STATUS_FINISHED
+
+
+@pytest.mark.asyncio
+async def test_last_message_dropped_when_unused():
+    hub = LiveHub(use_redis=False)
+    await hub.publish(1, {"match_id": 1, "status": "进行中"})
+    assert hub.last_message == {}
+
+    subscriber = hub.subscribe(1)
+    await hub.publish(1, {"match_id": 1, "status": "进行中"})
+    assert 1 in hub.last_message
+    hub.unsubscribe(1, subscriber)
+    assert hub.last_message == {}
+
+    subscriber = hub.subscribe(1)
+    await hub.publish(1, {"match_id": 1, "status": MATCH_STATUS_FINISHED})
+    assert hub.last_message == {}
+    assert await subscriber.next(timeout=0) is not None
+
+
+def test_websocket_close_releases_subscription():
+    with TestClient(app).websocket_connect("/ws/matches/987654"):
+        deadline = time.monotonic() + 5
+        while 987654 not in live_hub.subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert 987654 in live_hub.subscribers
+
+    # 客户端关闭后由接收循环立即发现，不必等到下一次心跳
+    deadline = time.monotonic() + 5
+    while 987654 in live_hub.subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert 987654 not in live_hub.subscribers
+
+
+@pytest.mark.asyncio
+async def test_first_subscriber_receives_current_state(seeded):
+    hub = LiveHub(use_redis=False)
+    match_id = seeded.match_ids[0]
+    subscriber = hub.subscribe(match_id)
+    await hub.send_current_state(match_id, subscriber)
+    state = json.loads(await subscriber.next(timeout=0))
+    assert state["match_id"] == match_id
+    assert {"home_goals", "away_goals", "status"} <= set(state)
+
+    # 已有更新的订阅者不会被数据库中的旧状态覆盖
+    newer = hub.subscribe(match_id)
+    await hub.publish(match_id, {"match_id": match_id, "status": "进行中", "home_goals": 9})
+    await hub.send_current_state(match_id, newer)
+    assert json.loads(await newer.next(timeout=0))["home_goals"] == 9
+
+    missing = hub.subscribe(987655)
+    await hub.send_current_state(987655, missing)
+    assert await missing.next(timeout=0) is None
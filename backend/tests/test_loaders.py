@@ -0,0 +1,36 @@
+"""关系预加载：未展开的字段不输出，查询条数不随行数增长"""
+import re
+
+import pytest
+
+
+def _query_count(response) -> int:
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+@pytest.mark.asyncio
+async def test_collapsed_relations_are_omitted(client, seeded):
+    response = await client.get("/api/v1/players", params={"expand": "statistics"})
+    assert response.status_code == 200
+    player = response.json()[0]
+    assert "statistics" in player
+    assert "health_records" not in player
+
+    response = await client.get(f"/api/v1/players/{seeded.player_ids[0]}", params={"expand": "none"})
+    player = response.json()
+    assert "statistics" not in player and "health_records" not in player
+
+    response = await client.get(f"/api/v1/teams/{seeded.team_ids[0]}", params={"expand": "none"})
+    assert "honors" not in response.json()
+    response = await client.get(f"/api/v1/teams/{seeded.team_ids[0]}")
+    assert "honors" in response.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/players", "/api/v1/teams"])
+async def test_list_query_count_does_not_grow_with_rows(client, seeded, path):
+    small = await client.get(path, params={"limit": 2})
+    large = await client.get(path, params={"limit": 40})
+    assert len(large.json()) > len(small.json())
+    assert _query_count(small) == _query_count(large)
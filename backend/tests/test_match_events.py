@@ -0,0 +1,43 @@
+"""比赛事件的校验"""
+import json
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_invalid_event_details_rejected(client, seeded):
+    match_id = seeded.match_ids[0]
+    url = f"/api/v1/matches/{match_id}"
+    bad = [{"type": "appearance", "player_id": seeded.player_ids[0], "minutes": "ninety"}]
+    response = await client.put(url, json={"event_details": json.dumps(bad)})
+    assert response.status_code == 422
+
+    response = await client.put(url, json={"event_details": "not json"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_unknown_player_rejected(client, seeded):
+    match_id = seeded.match_ids[0]
+    events = [{"type": "goal", "minute": 10, "player_id": max(seeded.player_ids) + 1000}]
+    response = await client.put(
+        f"/api/v1/matches/{match_id}", json={"event_details": json.dumps(events)}
+    )
+    assert response.status_code == 422
+    assert "Players not found" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_append_rejects_unknown_references(client, seeded):
+    match_id = seeded.match_ids[0]
+    url = f"/api/v1/matches/{match_id}/events"
+    unknown_player = max(seeded.player_ids) + 1000
+    response = await client.post(url, json=[{"type": "yellow_card", "player_id": unknown_player}])
+    assert response.status_code == 422
+
+    unknown_team = max(seeded.team_ids) + 1000
+    response = await client.post(url, json=[{"type": "yellow_card", "team_id": unknown_team}])
+    assert response.status_code == 422
+
+    response = await client.post(url, json=[{"type": "yellow_card", "minute": "late"}])
+    assert response.status_code == 422
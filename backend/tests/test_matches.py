@@ -0,0 +1,58 @@
+"""比赛记录的校验与积分榜增量"""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.db import AsyncSessionLocal
+from app.models import Schedule, Standing
+
+
+async def _new_schedule(competition_id: int, home: int, away: int) -> int:
+    async with AsyncSessionLocal() as session:
+        schedule = Schedule(
+            competition_id=competition_id,
+            round_number=99,
+            match_date=date(2031, 6, 1),
+            home_team_id=home,
+            away_team_id=away,
+        )
+        session.add(schedule)
+        await session.commit()
+        return schedule.id
+
+
+async def _points(competition_id: int, team_id: int) -> int:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Standing.points).where(
+                Standing.competition_id == competition_id, Standing.team_id == team_id
+            )
+        )
+        return result.scalar_one_or_none() or 0
+
+
+@pytest.mark.asyncio
+async def test_match_teams_must_match_schedule(client, seeded):
+    competition_id = seeded.competition_ids[0]
+    home, away, other = seeded.team_ids[:3]
+    schedule_id = await _new_schedule(competition_id, home, away)
+    payload = {"schedule_id": schedule_id, "home_team_id": home, "away_team_id": other}
+
+    response = await client.post("/api/v1/matches", json=payload)
+    assert response.status_code == 400
+
+    before = await _points(competition_id, home)
+    response = await client.post(
+        "/api/v1/matches",
+        json={**payload, "away_team_id": away, "home_goals": 2, "status": "已完成"},
+    )
+    assert response.status_code == 200
+    assert await _points(competition_id, home) == before + 3
+
+
+@pytest.mark.asyncio
+async def test_goals_cannot_be_cleared(client, seeded):
+    url = f"/api/v1/matches/{seeded.match_ids[0]}"
+    assert (await client.put(url, json={"home_goals": None})).status_code == 422
+    assert (await client.put(url, json={"away_goals": -1})).status_code == 422
@@ -0,0 +1,46 @@
+"""请求指标按路由模板打标签"""
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.core.metrics import UNMATCHED_ROUTE
+
+
+def _requests(route: str, status: str, method: str = "GET") -> float:
+    value = REGISTRY.get_sample_value(
+        "http_requests_total", {"method": method, "route": route, "status": status}
+    )
+    return value or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_labelled_by_route_template(client, seeded):
+    route = "/api/v1/matches/{match_id}"
+    before = _requests(route, "200")
+    for match_id in seeded.match_ids[:3]:
+        assert (await client.get(f"/api/v1/matches/{match_id}")).status_code == 200
+    assert _requests(route, "200") == before + 3
+    # 具体路径不会成为标签值
+    assert _requests(f"/api/v1/matches/{seeded.match_ids[0]}", "200") == 0
+
+    before = _requests(route, "404")
+    assert (await client.get("/api/v1/matches/999999")).status_code == 404
+    assert _requests(route, "404") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_unmatched_paths_share_one_label(client):
+    before = _requests(UNMATCHED_ROUTE, "404")
+    for path in ("/no/such/path", "/api/v1/unknown/1", "/api/v1/unknown/2"):
+        assert (await client.get(path)).status_code == 404
+    assert _requests(UNMATCHED_ROUTE, "404") == before + 3
+    assert _requests("/no/such/path", "404") == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_not_counted(client):
+    before = _requests(settings.METRICS_PATH, "200")
+    response = await client.get(settings.METRICS_PATH)
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+    assert _requests(settings.METRICS_PATH, "200") == before == 0
@@ -0,0 +1,98 @@
+"""迁移脚本与模型一致，唯一约束在数据库和接口层生效"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy.exc import IntegrityError
+
+from app.db import AsyncSessionLocal, Base
+from app.models import PlayerStatistics
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _alembic(db_path: Path, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db_path}")
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def _include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # FULLTEXT 索引只在 MySQL 上创建
+    if type_ == "index" and obj.dialect_options["mysql"].get("prefix") == "FULLTEXT":
+        return False
+    return True
+
+
+def test_migrations_match_models(tmp_path):
+    db_path = tmp_path / "migrated.db"
+    result = _alembic(db_path, "upgrade", "head")
+    assert result.returncode == 0, result.stderr
+
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"compare_type": True, "include_object": _include_object}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+
+        inspector = sa.inspect(conn)
+        unique = {
+            table: {c["name"] for c in inspector.get_unique_constraints(table)}
+            for table in ("player_statistics", "training_record", "match_record")
+        }
+    engine.dispose()
+    assert "uq_player_statistics_player_season" in unique["player_statistics"]
+    assert "uq_training_record_plan_player" in unique["training_record"]
+    assert "uq_match_record_schedule" in unique["match_record"]
+
+
+def test_unique_constraints_migration_refuses_duplicates(tmp_path):
+    db_path = tmp_path / "duplicates.db"
+    assert _alembic(db_path, "upgrade", "0002").returncode == 0
+
+    engine = sa.create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        conn.execute(sa.text("INSERT INTO player_statistics (player_id, season) VALUES (1, '2024')"))
+        conn.execute(sa.text("INSERT INTO player_statistics (player_id, season) VALUES (1, '2024')"))
+    engine.dispose()
+
+    result = _alembic(db_path, "upgrade", "head")
+    assert result.returncode != 0
+    assert "player_statistics(player_id, season): 1 duplicated keys" in result.stderr
+
+
+@pytest.mark.asyncio
+async def test_duplicate_player_season_rejected(seeded):
+    async with AsyncSessionLocal() as session:
+        existing = (await session.execute(sa.select(PlayerStatistics).limit(1))).scalar_one()
+        session.add(PlayerStatistics(player_id=existing.player_id, season=existing.season))
+        with pytest.raises(IntegrityError):
+            await session.flush()
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_second_match_record_for_schedule_rejected(client, seeded):
+    match = (await client.get(f"/api/v1/matches/{seeded.match_ids[0]}")).json()
+    response = await client.post(
+        "/api/v1/matches",
+        json={
+            "schedule_id": match["schedule_id"],
+            "home_team_id": match["home_team_id"],
+            "away_team_id": match["away_team_id"],
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Match record already exists for this schedule"
@@ -0,0 +1,70 @@
+"""游标分页"""
+import base64
+import json
+
+import pytest
+from sqlalchemy import select, update
+
+from app.api.pagination import keyset_query, split_page
+from app.db import AsyncSessionLocal
+from app.models import Player
+
+
+async def _walk(session, sort: str, limit: int) -> list:
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        result = await session.execute(keyset_query(select(Player), Player, sort, cursor, limit))
+        items, cursor = split_page(result.scalars().all(), sort, limit)
+        seen.extend(player.id for player in items)
+    return seen
+
+
+@pytest.mark.asyncio
+async def test_name_cursor_reaches_rows_after_null_names(seeded):
+    async with AsyncSessionLocal() as session:
+        players = (await session.execute(select(Player).order_by(Player.id))).scalars().all()
+        names = {player.id: player.name for player in players}
+        unnamed = [player.id for player in players[:5]]
+        await session.execute(update(Player).where(Player.id.in_(unnamed)).values(name=None))
+        await session.commit()
+
+        try:
+            seen = await _walk(session, "name", limit=3)
+            assert len(seen) == len(set(seen))
+            assert sorted(seen) == sorted(names)
+            # NULL 在升序中排在最前，按 id 排列
+            assert seen[:5] == unnamed
+        finally:
+            for player_id in unnamed:
+                await session.execute(
+                    update(Player).where(Player.id == player_id).values(name=names[player_id])
+                )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_id_cursor_pages_cover_all_rows(seeded):
+    async with AsyncSessionLocal() as session:
+        ids = (await session.execute(select(Player.id).order_by(Player.id))).scalars().all()
+        assert await _walk(session, "id", limit=7) == list(ids)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "sort, payload",
+    [
+        ("id", ["id", 5]),
+        ("id", ["id", ["5"]]),
+        ("id", ["id", [1, 2]]),
+        ("name", ["name", [1]]),
+        ("name", ["name", [[1], 2]]),
+        ("name", ["name", ["a", None]]),
+        ("id", [["id"], [1]]),
+    ],
+)
+async def test_malformed_cursor_is_rejected(client, seeded, sort, payload):
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+    response = await client.get("/api/v1/players", params={"cursor": cursor, "sort": sort})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,93 @@
+"""球员批量导入：文件校验、逐行解码错误和上传大小限制"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, func, select
+
+from app.core.config import settings
+from app.db import AsyncSessionLocal
+from app.models import Player
+
+NAME_PREFIX = "Imported"
+
+
+async def _imported_count() -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            select(func.count(Player.id)).where(Player.name.startswith(NAME_PREFIX))
+        )
+
+
+@pytest_asyncio.fixture
+async def cleanup():
+    yield
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Player).where(Player.name.startswith(NAME_PREFIX)))
+        await session.commit()
+
+
+def _upload(filename: str, content: bytes) -> dict:
+    return {"file": (filename, content, "application/octet-stream")}
+
+
+@pytest.mark.asyncio
+async def test_undecodable_csv_header_is_rejected_before_import(client, seeded, cleanup):
+    content = (
+        "name,team_id,position,nationalité\n"
+        f"{NAME_PREFIX}1,{seeded.team_ids[0]},FW,France\n"
+    ).encode("latin-1")
+    response = await client.post("/api/v1/players/bulk", files=_upload("p.csv", content))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "CSV file must be UTF-8 encoded"
+    assert await _imported_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_undecodable_csv_row_is_reported_per_row(client, seeded, cleanup):
+    team_id = seeded.team_ids[0]
+    content = (
+        f"name,team_id,position,nationality\n{NAME_PREFIX}1,{team_id},FW,中国\n".encode("utf-8")
+        + f"{NAME_PREFIX}2,{team_id},FW,España\n".encode("latin-1")
+        + f"{NAME_PREFIX}3,{team_id},DF,\n".encode("utf-8")
+    )
+    response = await client.post("/api/v1/players/bulk", files=_upload("p.csv", content))
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["total"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 3
+    assert await _imported_count() == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/players/bulk", "/api/v1/players/bulk/jobs"])
+async def test_invalid_workbook_is_rejected(client, seeded, cleanup, tmp_path, monkeypatch, path):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+    response = await client.post(path, files=_upload("p.xlsx", b"name,team_id\nnot a zip\n"))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Not a valid XLSX workbook"
+    # 任务接口已保存的上传文件被删除
+    assert not list(tmp_path.glob("imports/*"))
+
+
+@pytest.mark.asyncio
+async def test_upload_size_limit_by_content_length(client, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1024)
+    response = await client.post("/api/v1/players/bulk", files=_upload("p.csv", b"x" * 2048))
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_upload_size_limit_while_streaming(client, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1024)
+
+    async def body():
+        yield b"--boundary\r\nContent-Disposition: form-data; name=\"file\"; filename=\"p.csv\"\r\n\r\n"
+        for _ in range(4):
+            yield b"x" * 512
+
+    # 分块传输，没有 Content-Length
+    response = await client.post(
+        "/api/v1/players/bulk",
+        content=body(),
+        headers={"content-type": "multipart/form-data; boundary=boundary"},
+    )
+    assert response.status_code == 413
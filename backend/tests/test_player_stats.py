@@ -0,0 +1,132 @@
+"""球员赛季统计：比赛写入时的增量汇总与按赛季重建"""
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import select, update
+
+from app.db import AsyncSessionLocal
+from app.models import Competition, Player, PlayerStatistics, Schedule
+from app.services import player_stats as player_stats_service
+from app.services.standings import MATCH_STATUS_FINISHED
+
+
+async def _setup(seeded):
+    """新建一场赛程和两名没有统计行的球员"""
+    competition_id = seeded.competition_ids[0]
+    home, away = seeded.team_ids[2], seeded.team_ids[3]
+    async with AsyncSessionLocal() as session:
+        season = await session.scalar(
+            select(Competition.season).where(Competition.id == competition_id)
+        )
+        schedule = Schedule(
+            competition_id=competition_id,
+            round_number=98,
+            match_date=date(2031, 5, 1),
+            home_team_id=home,
+            away_team_id=away,
+        )
+        scorer = Player(name="统计测试前锋", team_id=home, position="FW")
+        assistant = Player(name="统计测试中场", team_id=home, position="MF")
+        session.add_all([schedule, scorer, assistant])
+        await session.commit()
+        return season, schedule.id, home, away, scorer.id, assistant.id
+
+
+async def _stats(season: str, player_id: int) -> dict:
+    async with AsyncSessionLocal() as session:
+        row = await session.scalar(
+            select(PlayerStatistics).where(
+                PlayerStatistics.season == season, PlayerStatistics.player_id == player_id
+            )
+        )
+        if row is None:
+            return {}
+        return {field: getattr(row, field) for field in player_stats_service.STAT_FIELDS}
+
+
+def _expected(**values) -> dict:
+    return {**dict.fromkeys(player_stats_service.STAT_FIELDS, 0), **values}
+
+
+@pytest.mark.asyncio
+async def test_match_events_roll_up_incrementally(client, seeded):
+    season, schedule_id, home, away, scorer, assistant = await _setup(seeded)
+    events = [
+        {"type": "appearance", "player_id": scorer, "team_id": home, "minutes": 90},
+        {"type": "appearance", "player_id": assistant, "team_id": home, "minutes": 75},
+        {"type": "goal", "minute": 10, "player_id": scorer, "team_id": home, "assist_player_id": assistant},
+        {"type": "yellow_card", "minute": 30, "player_id": scorer, "team_id": home},
+    ]
+    response = await client.post(
+        "/api/v1/matches",
+        json={
+            "schedule_id": schedule_id,
+            "home_team_id": home,
+            "away_team_id": away,
+            "home_goals": 1,
+            "status": MATCH_STATUS_FINISHED,
+            "event_details": json.dumps(events),
+        },
+    )
+    assert response.status_code == 200
+    match_id = response.json()["id"]
+    assert await _stats(season, scorer) == _expected(
+        appearance=1, goals=1, yellow_cards=1, minutes_played=90
+    )
+    assert await _stats(season, assistant) == _expected(
+        appearance=1, assists=1, minutes_played=75
+    )
+
+    # 改为无进球：只回退差值
+    response = await client.put(
+        f"/api/v1/matches/{match_id}",
+        json={"home_goals": 0, "event_details": json.dumps(events[:2] + events[3:])},
+    )
+    assert response.status_code == 200
+    assert await _stats(season, scorer) == _expected(appearance=1, yellow_cards=1, minutes_played=90)
+    assert await _stats(season, assistant) == _expected(appearance=1, minutes_played=75)
+
+    response = await client.post(
+        f"/api/v1/matches/{match_id}/events",
+        json=[{"type": "red_card", "minute": 80, "player_id": assistant, "team_id": home}],
+    )
+    assert response.status_code == 200
+    assert await _stats(season, assistant) == _expected(
+        appearance=1, red_cards=1, minutes_played=75
+    )
+
+    # 只改比分不改事件，统计不变
+    await client.put(f"/api/v1/matches/{match_id}", json={"away_goals": 1})
+    assert await _stats(season, scorer) == _expected(appearance=1, yellow_cards=1, minutes_played=90)
+
+    # 批量重建与增量结果一致，并修正被改坏的统计行
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(PlayerStatistics)
+            .where(PlayerStatistics.season == season, PlayerStatistics.player_id == scorer)
+            .values(goals=99)
+        )
+        await session.commit()
+        await player_stats_service.rebuild_season(session, season)
+        await session.commit()
+    assert await _stats(season, scorer) == _expected(appearance=1, yellow_cards=1, minutes_played=90)
+    assert await _stats(season, assistant) == _expected(
+        appearance=1, red_cards=1, minutes_played=75
+    )
+
+
+def test_aggregate_season_skips_malformed_events():
+    details = [
+        json.dumps([
+            {"type": "appearance", "player_id": 1, "minutes": 90},
+            {"type": "goal", "player_id": 1, "assist_player_id": 2},
+            {"type": "goal", "player_id": "x"},
+        ]),
+        "not json",
+        None,
+        json.dumps([{"type": "appearance", "player_id": 1, "minutes": "abc"}]),
+    ]
+    table = player_stats_service.aggregate_season(details)
+    assert table.loc[1].to_dict() == _expected(appearance=1, goals=1, minutes_played=90)
+    assert table.loc[2].to_dict() == _expected(assists=1)
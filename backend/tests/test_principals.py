@@ -0,0 +1,60 @@
+"""认证用户缓存的失效"""
+import uuid
+
+import pytest
+
+from app.core.cache import cache
+from app.core.principals import Principal, principal_cache
+from app.db import AsyncSessionLocal
+from app.models import Role, User
+
+
+@pytest.fixture
+def redis_principals(monkeypatch):
+    """启用 Redis 层（测试中为 InMemoryRedis），每次清空本地缓存以强制读 Redis"""
+    monkeypatch.setattr(principal_cache, "use_redis", True)
+    yield principal_cache
+    principal_cache.drop_local()
+
+
+async def _create_user(session) -> User:
+    name = uuid.uuid4().hex[:12]
+    user = User(username=name, email=f"{name}@example.com", password="x", is_active=True)
+    session.add(user)
+    await session.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_user_change_removed_from_redis_when_commit_returns(seeded, redis_principals):
+    async with AsyncSessionLocal() as session:
+        user = await _create_user(session)
+        await redis_principals.get(user.id)
+        await redis_principals.set(Principal(user.id, user.username, True, False))
+        redis_principals.drop_local()
+        assert await redis_principals.get(user.id) is not None
+
+        user.is_active = False
+        await session.commit()
+
+        # commit() 返回时 Redis 中的条目已删除，无需等待后台任务
+        assert await cache.client.get(redis_principals._redis_key(user.id)) is None
+        assert await redis_principals.get(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_all_redis_entries(seeded, redis_principals):
+    async with AsyncSessionLocal() as session:
+        user = await _create_user(session)
+        await redis_principals.get(user.id)
+        await redis_principals.set(Principal(user.id, user.username, True, False, ("coach",)))
+        redis_principals.drop_local()
+        assert await redis_principals.get(user.id) is not None
+
+        role = Role(name=f"role-{uuid.uuid4().hex[:8]}")
+        session.add(role)
+        await session.commit()
+        role.description = "changed"
+        await session.commit()
+
+        assert await redis_principals.get(user.id) is None
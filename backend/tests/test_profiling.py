@@ -0,0 +1,67 @@
+"""按请求的 SQL 统计：Server-Timing、慢查询日志和请求日志"""
+import logging
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db import AsyncSessionLocal
+from app.db.profiling import normalize_sql, redact_parameters
+
+
+def _timing(response) -> tuple:
+    header = response.headers["server-timing"]
+    match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)', header)
+    assert match, header
+    return float(match.group(1)), int(match.group(2)), float(match.group(3))
+
+
+def test_normalize_sql_strips_literals_and_in_lists():
+    sql = "SELECT *  FROM player\nWHERE name = 'O''Neil' AND id IN (?, ?, ?) AND age > 30"
+    assert normalize_sql(sql) == "SELECT * FROM player WHERE name = ? AND id IN (...) AND age > ?"
+    assert redact_parameters(("secret", 3)) == ["str", "int"]
+    assert redact_parameters({"name": "secret"}) == {"name": "str"}
+    assert redact_parameters([(1,), (2,)], executemany=True) == {"rows": 2, "row": ["int"]}
+
+
+@pytest.mark.asyncio
+async def test_server_timing_counts_request_queries(client, seeded):
+    # 条件请求的版本查询 + 加载比赛记录
+    response = await client.get(f"/api/v1/matches/{seeded.match_ids[0]}")
+    db_ms, count, total_ms = _timing(response)
+    assert count == 2
+    assert 0 <= db_ms <= total_ms
+
+    response = await client.get("/health")
+    assert _timing(response)[1] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_logged_without_parameter_values(client, seeded, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "REQUEST_LOG", True)
+    caplog.set_level(logging.INFO)
+    await client.get("/api/v1/players", params={"position": "秘密位置"})
+
+    slow = [record for record in caplog.records if record.name == "app.sql"]
+    assert slow
+    for record in slow:
+        assert "秘密位置" not in record.statement
+        assert "秘密位置" not in repr(record.parameters)
+        assert record.path == "/api/v1/players"
+
+    requests = [record for record in caplog.records if record.name == "app.request"]
+    assert len(requests) == 1
+    assert requests[0].db_queries == len(slow)
+    assert requests[0].status == 200
+
+
+@pytest.mark.asyncio
+async def test_failed_statement_keeps_original_error(seeded):
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(OperationalError):
+            await session.execute(text("SELECT * FROM no_such_table"))
+        await session.rollback()
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
@@ -0,0 +1,97 @@
+"""只读副本路由和写后读固定到主库"""
+import time
+
+import pytest
+from sqlalchemy import func, select
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db import AsyncSessionLocal, replicas
+from app.db.replicas import (
+    PIN_COOKIE,
+    Replica,
+    ReplicaRouter,
+    get_read_db,
+    is_pinned_to_primary,
+    is_principal_pinned,
+    pin_principal,
+    token_subject,
+)
+from app.models import Player
+
+# 目录不存在，连接时报 OperationalError
+UNREACHABLE_URL = "sqlite+aiosqlite:////nonexistent-replica-dir/replica.db"
+
+
+def _request(authorization=None, cookie=None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    if cookie:
+        headers.append((b"cookie", cookie.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_token_subject_reads_bearer_token():
+    token = create_access_token({"sub": "42"})
+    assert token_subject(f"Bearer {token}") == "42"
+    assert token_subject("Bearer invalid") is None
+    assert token_subject(f"Basic {token}") is None
+    assert token_subject(None) is None
+
+
+@pytest.mark.asyncio
+async def test_bearer_client_pinned_after_write():
+    token = create_access_token({"sub": "4242"})
+    request = _request(f"Bearer {token}")
+    assert not await is_principal_pinned(request)
+
+    await pin_principal("4242")
+
+    assert await is_principal_pinned(request)
+    assert not await is_principal_pinned(_request())
+
+
+def test_pin_cookie_only_trusted_within_window():
+    now = time.time()
+    assert is_pinned_to_primary(_request(cookie=f"{PIN_COOKIE}={now + 2:.0f}"))
+    assert not is_pinned_to_primary(_request(cookie=f"{PIN_COOKIE}={now - 1:.0f}"))
+    # 客户端伪造的远期时间戳不能让它长期占用主库
+    assert not is_pinned_to_primary(_request(cookie=f"{PIN_COOKIE}={now + 86400:.0f}"))
+
+
+@pytest.mark.asyncio
+async def test_connection_error_retries_on_primary(seeded, monkeypatch):
+    async with AsyncSessionLocal() as primary:
+        expected = await primary.scalar(select(func.count(Player.id)))
+    router = ReplicaRouter([UNREACHABLE_URL])
+    monkeypatch.setattr(replicas, "replica_router", router)
+    dependency = get_read_db(_request())
+    session = await dependency.__anext__()
+    try:
+        assert await session.scalar(select(func.count(Player.id))) == expected
+        assert not router.replicas[0].healthy
+        # 副本不可用期间直接使用主库
+        assert router.choose() is None
+    finally:
+        await dependency.aclose()
+        await router.dispose()
+
+
+@pytest.mark.asyncio
+async def test_probe_brings_replica_back_after_cooldown(seeded):
+    replica = Replica("replica-test", settings.DATABASE_URL)
+    broken = Replica("replica-broken", UNREACHABLE_URL)
+    try:
+        for item in (replica, broken):
+            item.mark_down()
+            # 冷却期内不探测
+            assert not await item.probe()
+            item.down_until = 0.0
+
+        assert await replica.probe()
+        assert replica.healthy
+        assert not await broken.probe()
+        assert broken.down_until > time.monotonic()
+    finally:
+        await replica.engine.dispose()
+        await broken.engine.dispose()
@@ -0,0 +1,21 @@
+"""搜索的回退路径（非 MySQL 或查询词过短）"""
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_fallback_matches_name_prefix_only(client, seeded):
+    response = await client.get("/api/v1/search", params={"q": "球队00"})
+    assert response.status_code == 200
+    names = [team["name"] for team in response.json()["teams"]]
+    assert names and all(name.startswith("球队00") for name in names)
+
+    # 名称中间的片段不再按 %x% 匹配
+    response = await client.get("/api/v1/search", params={"q": "队00"})
+    assert response.json()["teams"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{"skip": -1}, {"limit": 0}, {"limit": 101}])
+async def test_paging_parameters_are_validated(client, seeded, params):
+    response = await client.get("/api/v1/search", params={"q": "球队", **params})
+    assert response.status_code == 422
@@ -0,0 +1,39 @@
+"""积分榜缓存按赛事失效"""
+import pytest
+from sqlalchemy import select
+
+from app.db import AsyncSessionLocal
+from app.models import MatchRecord, Schedule
+
+
+async def _match_in(competition_id: int) -> MatchRecord:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(MatchRecord)
+            .join(Schedule, MatchRecord.schedule_id == Schedule.id)
+            .where(Schedule.competition_id == competition_id)
+            .limit(1)
+        )
+        return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_score_change_only_invalidates_its_competition(client, seeded, test_cache):
+    first, second = seeded.competition_ids[:2]
+    for competition_id in (first, second):
+        response = await client.get(f"/api/v1/competitions/{competition_id}/standings")
+        assert response.status_code == 200
+    misses = test_cache.misses
+
+    match = await _match_in(first)
+    response = await client.put(
+        f"/api/v1/matches/{match.id}",
+        json={"home_goals": (match.home_goals or 0) + 1, "status": "已完成"},
+    )
+    assert response.status_code == 200
+
+    hits = test_cache.hits
+    await client.get(f"/api/v1/competitions/{second}/standings")
+    assert test_cache.hits == hits + 1
+    await client.get(f"/api/v1/competitions/{first}/standings")
+    assert test_cache.misses == misses + 1
@@ -0,0 +1,99 @@
+"""训练每日汇总的增量写入"""
+from dataclasses import replace
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.db import AsyncSessionLocal
+from app.models import TrainingDailySummary, TrainingRecord
+from app.services import training as training_service
+from app.services.training import RecordSnapshot
+
+
+async def _apply(before, after) -> None:
+    async with AsyncSessionLocal() as session:
+        await training_service.apply_changes(session, before, after)
+        await session.commit()
+
+
+async def _summary(team_id, summary_date, player_id):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(TrainingDailySummary).where(
+                TrainingDailySummary.team_id == team_id,
+                TrainingDailySummary.summary_date == summary_date,
+                TrainingDailySummary.player_id == player_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_accumulates_in_database(seeded):
+    team_id, player_id, day = seeded.team_ids[0], seeded.player_ids[0], date(2031, 1, 1)
+    record = RecordSnapshot(team_id, day, player_id, training_service.ATTENDANCE_PRESENT, 80, 7)
+
+    # 同一天两条记录分别在各自的事务中写入
+    await _apply([], [record])
+    await _apply([], [record])
+    row = await _summary(team_id, day, player_id)
+    assert (row.sessions, row.attended, row.completion_total, row.score_count) == (2, 2, 160, 2)
+
+    absent = replace(record, attendance=training_service.ATTENDANCE_ABSENT)
+    await _apply([record], [absent])
+    row = await _summary(team_id, day, player_id)
+    assert (row.sessions, row.attended, row.absent) == (2, 1, 1)
+
+    await _apply([record, absent], [])
+    assert await _summary(team_id, day, player_id) is None
+
+
+@pytest.mark.asyncio
+async def test_removing_missing_row_leaves_nothing(seeded):
+    team_id, player_id, day = seeded.team_ids[0], seeded.player_ids[0], date(2031, 2, 1)
+    record = RecordSnapshot(team_id, day, player_id, training_service.ATTENDANCE_LATE, None, None)
+
+    await _apply([record], [])
+
+    assert await _summary(team_id, day, player_id) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_record_insert_returns_conflict(client, seeded, monkeypatch):
+    team_id, player_id = seeded.team_ids[0], seeded.player_ids[0]
+    response = await client.post(
+        "/api/v1/training/plans",
+        json={"team_id": team_id, "title": "conflict", "scheduled_date": "2031-02-01"},
+    )
+    plan_id = response.json()["id"]
+    apply_changes = training_service.apply_changes
+
+    async def insert_first(db, before, after):
+        # 模拟另一个请求在本请求读取已有记录之后先提交了同一球员的记录
+        async with AsyncSessionLocal() as other:
+            other.add(
+                TrainingRecord(
+                    training_plan_id=plan_id,
+                    player_id=player_id,
+                    attendance=training_service.ATTENDANCE_PRESENT,
+                )
+            )
+            await other.commit()
+        return await apply_changes(db, before, after)
+
+    monkeypatch.setattr(training_service, "apply_changes", insert_first)
+    response = await client.post(
+        f"/api/v1/training/plans/{plan_id}/records",
+        json=[
+            {
+                "player_id": player_id,
+                "attendance": training_service.ATTENDANCE_PRESENT,
+                "completion_rate": 90,
+            }
+        ],
+    )
+    assert response.status_code == 409
+
+    # 本请求的汇总增量随事务回滚
+    assert await _summary(team_id, date(2031, 2, 1), player_id) is None